@@ -11,11 +11,41 @@ import urllib.parse
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     from bs4 import BeautifulSoup
     HAS_DEPS = True
 except ImportError:
     HAS_DEPS = False
 
+MAX_BODY_BYTES = 2 * 1024 * 1024  # Larger pages are cut off instead of downloaded
+
+def create_session():
+    """Pooled session; module-level so warm invocations reuse its keep-alive connections"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        'Accept-Encoding': 'gzip, deflate',
+    })
+    return session
+
+SESSION = create_session() if HAS_DEPS else None
+
+def fetch_capped(url, timeout=10):
+    """GET url and return at most MAX_BODY_BYTES of its (decoded) body"""
+    with SESSION.get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= MAX_BODY_BYTES:
+                break
+    return b''.join(chunks)[:MAX_BODY_BYTES]
+
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
         """Handle GET requests"""
@@ -119,14 +149,7 @@ class handler(BaseHTTPRequestHandler):
             base_url = "https://en.wikipedia.org"
             search_url = f"{base_url}/w/index.php?search={urllib.parse.quote(query)}"
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(search_url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(fetch_capped(search_url), 'html.parser')
             results = []
             
             # Find search results
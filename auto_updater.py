@@ -3,37 +3,55 @@ Auto-Updater - Continuously updates data without manual intervention
 """
 
 import time
-import schedule
 import threading
 from datetime import datetime
 from universal_aggregator import UniversalAggregator
-from generic_config import GLOBAL_CATEGORIES, SCRAPER_SETTINGS
-from youtube_scraper import YouTubeScraper
-from wikipedia_scraper import WikipediaScraper
-from google_search_scraper import GoogleSearchScraper
+from generic_config import GLOBAL_CATEGORIES, SCRAPER_SETTINGS, REFRESH_SETTINGS
+from export_manager import ExportManager
+from refresh_scheduler import RefreshScheduler
+from work_queue import run_jobs
+from instrumentation import pause, write_report
+from profiler import category_boundary
 import os
 
 class AutoUpdater:
     def __init__(self):
-        self.aggregator = UniversalAggregator()
+        self.export_manager = ExportManager(
+            UniversalAggregator(),
+            SCRAPER_SETTINGS.get('snapshot_dir') if SCRAPER_SETTINGS.get('delta_snapshots') else None
+        )
+        self.scheduler = RefreshScheduler()
         self.running = False
         self.update_history = []
         self.last_update_time = None
         
-    def load_existing_data(self, filename='scraped_data.json'):
-        """Load existing scraped data to avoid duplicates"""
+    @property
+    def aggregator(self):
+        return self.export_manager.aggregator
+    
+    @aggregator.setter
+    def aggregator(self, aggregator):
+        # Callers may hand over their own aggregator; none of its records are saved yet
+        self.export_manager.aggregator = aggregator
+        self.export_manager.exported_count = 0
+        self.export_manager.snapshot_count = 0
+    
+    def load_existing_data(self, base_filename='auto_updated_data'):
+        """Load the last full save plus any records journaled after it"""
+        filename = f"{base_filename}.json"
         if os.path.exists(filename):
             try:
-                import json
-                with open(filename, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if 'data' in data:
-                        self.aggregator.all_data = data['data']
-                        print(f"✓ Loaded {len(self.aggregator.all_data)} existing records")
-                        return True
+                count = self.aggregator.load_json(filename)
+                self.export_manager.mark_exported()
+                print(f"✓ Loaded {count} existing records")
             except Exception as e:
                 print(f"Could not load existing data: {e}")
-        return False
+                return False
+        try:
+            self.export_manager.replay_journal(base_filename, filename)
+        except Exception as e:
+            print(f"Could not replay the save journal: {e}")
+        return len(self.aggregator.all_data) > 0
     
     def update_category(self, category_key, category_config):
         """Update a single category"""
@@ -44,19 +62,22 @@ class AutoUpdater:
             category_type = category_config.get('type', 'general')
             max_results = SCRAPER_SETTINGS.get('max_results_per_category', 100) // len(platforms)
             
-            records_found = 0
+            found = []
             
             for platform in platforms:
                 try:
                     records = []
                     if platform == 'youtube':
+                        from youtube_scraper import YouTubeScraper
                         scraper = YouTubeScraper(headless=SCRAPER_SETTINGS['headless'])
                         records = scraper.search_videos(query, max_results=max_results)
                         scraper.close()
                     elif platform == 'wikipedia':
+                        from wikipedia_scraper import WikipediaScraper
                         scraper = WikipediaScraper()
                         records = scraper.search_articles(query, max_results=max_results)
                     elif platform == 'google':
+                        from google_search_scraper import GoogleSearchScraper
                         scraper = GoogleSearchScraper(headless=SCRAPER_SETTINGS['headless'])
                         records = scraper.search(query, search_type='all', max_results=max_results)
                         scraper.close()
@@ -64,37 +85,45 @@ class AutoUpdater:
                     for record in records:
                         record['category'] = category_key
                         record['type'] = category_type
-                        self.aggregator.add_record(record)
                     
-                    records_found += len(records)
-                    time.sleep(SCRAPER_SETTINGS['delay_between_requests'])
+                    found.extend(records)
+                    pause(SCRAPER_SETTINGS['delay_between_requests'])
                     
                 except Exception as e:
                     print(f"  Error on {platform}: {e}")
                     continue
             
-            self.update_history.append({
-                'category': category_key,
-                'records_found': records_found,
-                'timestamp': datetime.now().isoformat()
-            })
-            
-            print(f"✓ Updated {category_key}: {records_found} new records")
-            return records_found
+            return self.add_category_records(category_key, found)
             
         except Exception as e:
             print(f"✗ Error updating {category_key}: {e}")
+            self.scheduler.record_failure(category_key)
             return 0
     
-    def save_data(self, base_filename='auto_updated_data'):
-        """Save data to all formats"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{base_filename}_{timestamp}"
-        
-        files = self.aggregator.export_all_formats(filename)
-        
-        # Also save with standard name (latest)
-        self.aggregator.export_all_formats(base_filename)
+    def add_category_records(self, category_key, records):
+        """Store a category's freshly scraped records and reschedule it"""
+        for record in records:
+            self.aggregator.add_record(record)
+        
+        self.update_history.append({
+            'category': category_key,
+            'records_found': len(records),
+            'timestamp': datetime.now().isoformat()
+        })
+        
+        # Reschedule based on how much this category's records changed
+        self.scheduler.record_refresh(category_key, records)
+        
+        print(f"✓ Updated {category_key}: {len(records)} new records")
+        category_boundary(category_key)
+        return len(records)
+    
+    def save_data(self, base_filename='auto_updated_data', full=True):
+        """Save data to all formats (or, for periodic saves, only journal and snapshot new records)"""
+        if full:
+            files = self.export_manager.export(base_filename)
+        else:
+            files = self.export_manager.checkpoint(base_filename)
         
         self.last_update_time = datetime.now()
         return files
@@ -112,23 +141,29 @@ class AutoUpdater:
         
         total_new_records = 0
         
-        for category_key in categories_to_update:
-            if not self.running:
-                break
-            
-            category_config = GLOBAL_CATEGORIES[category_key]
-            records = self.update_category(category_key, category_config)
-            total_new_records += records
-            
-            # Save periodically (every 5 categories)
-            if categories_to_update.index(category_key) % 5 == 4:
-                print("\n[SAVE] Periodic save...")
-                self.save_data()
-                time.sleep(2)
+        if SCRAPER_SETTINGS.get('worker_processes', 1) > 1:
+            # Every (category, platform) job of the cycle goes to the worker processes
+            for category_key, records in run_jobs(categories_to_update).items():
+                total_new_records += self.add_category_records(category_key, records)
+        
+        else:
+            for index, category_key in enumerate(categories_to_update):
+                if not self.running:
+                    break
+                
+                category_config = GLOBAL_CATEGORIES[category_key]
+                records = self.update_category(category_key, category_config)
+                total_new_records += records
+                
+                # Save periodically (every 5 categories); only new records are written
+                if index % 5 == 4:
+                    print("\n[SAVE] Periodic save...")
+                    self.save_data(full=False)
+                    pause(2)
         
-        # Final save
-        print("\n[SAVE] Final save...")
-        files = self.save_data()
+        # Only this cycle's records are saved; full exports wait for an explicit or final save
+        print("\n[SAVE] Cycle save (new records only)...")
+        files = self.save_data(full=False)
         
         print(f"\n{'='*70}")
         print(f"✅ UPDATE CYCLE COMPLETE")
@@ -137,6 +172,9 @@ class AutoUpdater:
         print(f"Files saved: {', '.join(files.keys())}")
         print(f"{'='*70}\n")
         
+        # Metrics accumulate across cycles in continuous mode
+        write_report(SCRAPER_SETTINGS['metrics_report'])
+        
         return total_new_records
     
     def start_continuous_mode(self, update_interval_hours=24, categories=None):
@@ -158,23 +196,33 @@ class AutoUpdater:
         if categories is None:
             categories = list(GLOBAL_CATEGORIES.keys())
         
-        # Schedule updates
-        schedule.every(update_interval_hours).hours.do(
-            lambda: self.run_update_cycle(categories)
-        )
-        
-        # Run first update immediately
-        self.run_update_cycle(categories)
+        # Each category gets its own interval, adapted to how often its data changes
+        for category_key in categories:
+            self.scheduler.add_category(category_key, GLOBAL_CATEGORIES[category_key]['platforms'],
+                                        update_interval_hours)
         
-        # Keep running
+        # Keep running: each cycle re-scrapes the most overdue categories within the budget
         try:
             while self.running:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                due = self.scheduler.due_categories(REFRESH_SETTINGS['cycle_budget'])
+                if due:
+                    self.run_update_cycle(due)
+                
+                # After a cycle, wait at least cycle_minutes; otherwise until the next one is due
+                wait = self.scheduler.seconds_until_due()
+                if due or wait is None:
+                    wait = max(wait or 0, REFRESH_SETTINGS['cycle_minutes'] * 60)
+                deadline = time.time() + wait
+                while self.running and time.time() < deadline:
+                    pause(min(60, max(0, deadline - time.time())), 'idle')  # Check every minute
                 
         except KeyboardInterrupt:
             print("\n\n⚠️ Stopping auto-updater...")
             self.stop()
+        finally:
+            if self.aggregator.all_data:
+                print("\n[SAVE] Final save (all formats)...")
+                self.save_data()
     
     def start_background_mode(self, update_interval_hours=24, categories=None):
         """Start auto-update in background thread"""
@@ -188,7 +236,6 @@ class AutoUpdater:
     def stop(self):
         """Stop the auto-updater"""
         self.running = False
-        schedule.clear()
         print("✓ Auto-updater stopped")
     
     def get_status(self):
@@ -0,0 +1,570 @@
+"""
+Benchmarks for the scraping, aggregation and export code paths
+Usage: python benchmark.py <name> [--records N]
+       python benchmark.py offline [--save-baseline | --baseline FILE] [--tolerance 0.2]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+PLATFORMS = ['youtube', 'wikipedia', 'google']
+CATEGORIES = [f'category_{i}' for i in range(20)]
+
+def iter_records(count, seed=42):
+    """Yield synthetic scraped records shaped like the real scrapers' output"""
+    rng = random.Random(seed)
+    for i in range(count):
+        views = rng.randint(0, 50_000_000)
+        yield {
+            'title': f'Record {i}',
+            'name': f'Record {i}',
+            'category': rng.choice(CATEGORIES),
+            'type': 'music',
+            'platform': rng.choice(PLATFORMS),
+            'source': 'youtube',
+            'url': f'https://example.org/watch?v={i}',
+            'description': 'Lorem ipsum dolor sit amet ' * 4,
+            'views': views if i % 3 else f'{views / 1_000_000:.1f}M',
+            'likes': rng.randint(0, 100_000),
+            'rating': f'{rng.uniform(1, 5):.1f}',
+            'scraped_date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+
+def make_records(count, seed=42):
+    """Build a list of synthetic scraped records"""
+    return list(iter_records(count, seed))
+
+def timed(label, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    print(f"  {label:<45}{time.perf_counter() - start:>10.3f}s")
+    return result
+
+def legacy_top_records(records, limit=100):
+    """The previous get_top_records: copy, parse, full sort, strip temp key, slice"""
+    from metric_parser import parse_metric
+    sortable = []
+    for record in records:
+        record_copy = record.copy()
+        record_copy['_sort_views'] = parse_metric(record.get('views'))
+        sortable.append(record_copy)
+    sorted_data = sorted(sortable, key=lambda x: x['_sort_views'], reverse=True)
+    for record in sorted_data:
+        record.pop('_sort_views', None)
+    return sorted_data[:limit]
+
+def bench_ranking(count):
+    """Top-K ranking: legacy full sort vs RankingIndex"""
+    from ranking_index import RankingIndex
+
+    print(f"\nRanking benchmark ({count:,} records)")
+    records = timed("generate records", make_records, count)
+
+    index = RankingIndex()
+    timed("build index (amortized over inserts)", index.sync, records)
+
+    legacy = timed("legacy top 100 by views", legacy_top_records, records, 100)
+    top = timed("indexed top 100 by views", index.top_positions, 'views', 100)
+    timed("indexed top 100 by views in one category", index.top_positions, 'views', 100, CATEGORIES[0])
+    timed("indexed top 100 by rating on one platform", index.top_positions, 'rating', 100, None, PLATFORMS[0])
+
+    same = [r['url'] for r in legacy] == [records[i]['url'] for i in top]
+    print(f"  ✓ Results match legacy ranking: {same}")
+
+def make_hospital_rows(count, seed=42):
+    """Build synthetic merged hospital records like main.py exports"""
+    from config import CITIES
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        rows.append({
+            'name': f'Hospital {i}',
+            'category': 'hospital',
+            'address': f'{rng.randint(1, 500)} Main Road, {rng.choice(CITIES)}, Pakistan',
+            'review_count': rng.choice(['0', 'N/A', f'{rng.randint(0, 20000):,}']),
+            'social_media_followers': f'Facebook: {rng.randint(0, 90000)}, Instagram: {rng.randint(0, 9000)}',
+        })
+        if i % 3 == 0:
+            # Newer records also carry numeric per-platform fields, which take precedence
+            rows[-1]['facebook_followers'] = rng.randint(0, 90000)
+    return rows
+
+def bench_rescore(count):
+    """Traffic/city re-scoring: per-record loop vs DataFrame batch"""
+    import pandas as pd
+    from data_aggregator import DataAggregator
+
+    print(f"\nRe-scoring benchmark ({count:,} records)")
+    rows = timed("generate records", make_hospital_rows, count)
+    aggregator = DataAggregator()
+
+    def per_record():
+        return [(aggregator.extract_city(row['address']), aggregator.estimate_traffic(row)) for row in rows]
+
+    expected = timed("per-record extract_city + estimate_traffic", per_record)
+    df = pd.DataFrame(rows)
+    rescored = timed("rescore_dataframe", aggregator.rescore_dataframe, df)
+
+    same = expected == list(zip(rescored['city'], rescored['traffic_estimate']))
+    print(f"  ✓ Results match per-record scoring: {same}")
+
+def measure_memory(build):
+    """Traced memory (MB) still held after building a structure, plus the structure"""
+    import gc
+    import tracemalloc
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / 1024 / 1024, result
+
+def bench_memory(count):
+    """Record storage: list of dicts vs column-oriented RecordStore"""
+    from record_store import RecordStore
+
+    print(f"\nMemory benchmark ({count:,} records)")
+    dict_mb, records = measure_memory(lambda: list(iter_records(count)))
+    print(f"  {'list of dicts':<45}{dict_mb:>9.1f}MB")
+    del records
+
+    store_mb, store = measure_memory(lambda: RecordStore(iter_records(count)))
+    print(f"  {'RecordStore':<45}{store_mb:>9.1f}MB")
+    print(f"  ✓ RecordStore uses {store_mb / dict_mb:.0%} of the list-of-dicts memory")
+    timed("RecordStore.to_dataframe", store.to_dataframe)
+
+def bench_excel(count):
+    """Multi-sheet Excel export: per-sheet DataFrame filters vs streaming writer"""
+    import os
+    import tempfile
+    from universal_aggregator import UniversalAggregator
+
+    print(f"\nExcel export benchmark ({count:,} records)")
+    aggregator = UniversalAggregator()
+    aggregator.replace_records(timed("generate records", make_records, count))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, streaming in (("DataFrame export", False), ("streaming export", True)):
+            filename = os.path.join(tmp, f'{streaming}.xlsx')
+            timed(label, aggregator.export_to_excel, filename, streaming=streaming)
+            # Traced separately: tracemalloc slows the export down too much to time it
+            peak_mb = measure_peak_memory(lambda: aggregator.export_to_excel(filename, streaming=streaming))
+            print(f"  {label + ' peak memory':<45}{peak_mb:>9.1f}MB")
+
+def measure_peak_memory(run):
+    """Peak traced memory (MB) while running a function"""
+    import gc
+    import tracemalloc
+    gc.collect()
+    tracemalloc.start()
+    run()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+def bench_pdf(count):
+    """Per-category PDF reports: serial export_category_pdf vs process pool"""
+    import os
+    import tempfile
+    from collections import defaultdict
+    from generic_config import SCRAPER_SETTINGS
+    from pdf_exporter import PDFExporter
+
+    categories = 100
+    print(f"\nPDF benchmark ({categories} categories x {count:,} records)")
+    records = timed("generate records", make_records, categories * count)
+    for i, record in enumerate(records):
+        record['category'] = f'category_{i % categories}'
+
+    exporter = PDFExporter()
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            def serial():
+                by_category = defaultdict(list)
+                for record in records:
+                    by_category[record['category']].append(record)
+                for category, category_records in by_category.items():
+                    exporter.export_category_pdf(category_records, category, exporter.category_filename(category))
+
+            timed("serial export_category_pdf", serial)
+            workers = max(2, min(SCRAPER_SETTINGS.get('pdf_workers', 1), os.cpu_count() or 1))
+            timed(f"export_category_pdfs ({workers} workers)", exporter.export_category_pdfs, records, workers)
+        finally:
+            os.chdir(cwd)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_fixtures')
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# URL path prefix -> recorded page; any host is served from the fixtures
+FIXTURE_ROUTES = [
+    ('/w/index.php', 'wikipedia_search.html'),
+    ('/wiki/', 'wikipedia_article.html'),
+    ('/search', 'google_search.html'),
+    ('/results', 'youtube_search.html'),
+    ('/watch', 'youtube_watch.html'),
+    ('/maps/', 'maps_search.html'),
+    ('/site/', 'hospital_website.html'),
+    ('/about', 'hospital_contact.html'),
+    ('/contact', 'hospital_contact.html'),
+]
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    # Keep-alive, with headers and body sent in one write like a real server
+    protocol_version = 'HTTP/1.1'
+    wbufsize = 64 * 1024
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        for prefix, fixture in FIXTURE_ROUTES:
+            if path.startswith(prefix):
+                with open(os.path.join(FIXTURE_DIR, fixture), 'rb') as f:
+                    body = f.read()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+        self.send_error(404)
+
+    def log_message(self, format, *args):
+        pass
+
+class FixtureServer:
+    """Serves the recorded pages on localhost for the duration of a benchmark"""
+    def __init__(self):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def local(self, url):
+        """Point an absolute URL (e.g. https://www.youtube.com/results?...) at this server"""
+        parsed = urlparse(url)
+        return self.url + parsed.path + (f"?{parsed.query}" if parsed.query else '')
+
+class LocalDriver:
+    """WebDriver wrapper that loads every URL from the fixture server"""
+    def __init__(self, driver, server):
+        self.driver = driver
+        self.server = server
+
+    def get(self, url):
+        return self.driver.get(self.server.local(url))
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+def start_local_chrome(server):
+    """Headless Chrome for the Selenium scrapers, or None if Chrome is not available"""
+    try:
+        from selenium import webdriver
+        options = webdriver.ChromeOptions()
+        options.add_argument('--headless=new')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        return LocalDriver(webdriver.Chrome(options=options), server)
+    except Exception as e:
+        print(f"  ✗ Headless Chrome unavailable, skipping Selenium scrapers: {str(e).splitlines()[0]}")
+        return None
+
+def peak_rss_mb():
+    """Peak resident memory of this process and of finished children (Chrome), in MB (None if unknown)"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        resource = None
+    if resource:
+        # ru_maxrss is in bytes on macOS and kilobytes on Linux
+        unit = 1024 * 1024 if sys.platform == 'darwin' else 1024
+        own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        return own / unit, children / unit
+
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil:
+        # peak_wset is the Windows peak working set; other platforms only report current RSS
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 1024 / 1024, None
+
+    import tracemalloc
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024, None
+    return None, None
+
+def measure_stage(results, stage, run):
+    """Run a stage and record pages/sec and records/sec (pages from the instrumentation counters)"""
+    from instrumentation import METRICS
+    pages_before = METRICS.snapshot()['counters'].get('pages', 0)
+    start = time.perf_counter()
+    records = run()
+    elapsed = time.perf_counter() - start
+    pages = METRICS.snapshot()['counters'].get('pages', 0) - pages_before
+    results[stage] = {
+        'pages_per_sec': pages / elapsed if elapsed else 0,
+        'records_per_sec': len(records) / elapsed if elapsed else 0,
+    }
+    print(f"  {stage:<28}{elapsed:>8.2f}s{pages:>7} pages{results[stage]['pages_per_sec']:>9.1f}/s"
+          f"{len(records):>8} records{results[stage]['records_per_sec']:>9.1f}/s")
+    return records
+
+def bench_offline(count):
+    """Every scraper, the aggregators and PDFExporter against recorded pages on localhost"""
+    import tempfile
+    import tracemalloc
+    import config
+    import generic_config
+    from instrumentation import set_sleep_scale
+
+    # Without resource or psutil, peak memory falls back to traced Python allocations
+    traced = peak_rss_mb()[0] is None
+    if traced:
+        tracemalloc.start()
+
+    # Measure the scrapers' own work, not their politeness delays
+    set_sleep_scale(0)
+    config.SCRAPER_SETTINGS['delay_between_requests'] = 0
+    generic_config.SCRAPER_SETTINGS['delay_between_requests'] = 0
+
+    from wikipedia_scraper import WikipediaScraper
+    from website_scraper import WebsiteScraper
+
+    print(f"\nOffline scraper benchmark ({count} pages per scraper)")
+    results = {}
+    universal_records = []
+    listings = []
+    with FixtureServer() as server:
+        wikipedia = WikipediaScraper()
+        wikipedia.base_url = server.url
+
+        def wikipedia_search():
+            records = []
+            for i in range(count):
+                records.extend(wikipedia.search_articles(f"sample {i}", max_results=20))
+            return records
+
+        def wikipedia_articles():
+            return [wikipedia.get_article_content(f"{server.url}/wiki/Sample_topic_{i}") for i in range(count)]
+
+        universal_records += measure_stage(results, 'wikipedia search', wikipedia_search)
+        universal_records += measure_stage(results, 'wikipedia articles', wikipedia_articles)
+
+        website = WebsiteScraper()
+        hospital_sites = measure_stage(results, 'hospital websites',
+                                       lambda: [website.scrape_website(f"{server.url}/site/{i}") for i in range(count)])
+        website.close()
+
+        driver = start_local_chrome(server)
+        if driver:
+            from youtube_scraper import YouTubeScraper
+            from google_search_scraper import GoogleSearchScraper
+            from google_maps_scraper import GoogleMapsScraper
+            try:
+                youtube = YouTubeScraper()
+                youtube.driver = driver
+                searches = max(1, count // 20)
+                universal_records += measure_stage(results, 'youtube (chrome)', lambda: [
+                    video for i in range(searches) for video in youtube.search_videos(f"sample {i}", max_results=20)
+                ])
+
+                google = GoogleSearchScraper()
+                google.driver = driver
+                universal_records += measure_stage(results, 'google search (chrome)', lambda: [
+                    result for i in range(count) for result in google.search(f"sample {i}", max_results=10)
+                ])
+
+                maps = GoogleMapsScraper()
+                maps.driver = driver
+                searches = max(1, count // 10)
+                listings = measure_stage(results, 'google maps (chrome)', lambda: [
+                    listing for i in range(searches)
+                    for listing in maps.scrape_category(f"sample {i}", f"hospital {i}")
+                ])
+            finally:
+                driver.quit()
+
+    from universal_aggregator import UniversalAggregator
+    from data_aggregator import DataAggregator
+    from pdf_exporter import PDFExporter
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            for i, record in enumerate(universal_records):
+                record['category'] = CATEGORIES[i % len(CATEGORIES)]
+
+            def universal_exports():
+                aggregator = UniversalAggregator()
+                aggregator.add_records(universal_records)
+                aggregator.export_to_csv('offline.csv')
+                aggregator.export_to_excel('offline.xlsx')
+                aggregator.export_to_json('offline.json')
+                return aggregator.all_data
+
+            def hospital_exports():
+                aggregator = DataAggregator()
+                for i, site in enumerate(hospital_sites):
+                    listing = listings[i] if i < len(listings) else {
+                        'name': f'Sample Hospital {i}', 'address': 'Sample Road, Karachi',
+                        'category': 'Hospital', 'website': site.get('website'),
+                    }
+                    aggregator.add_record(aggregator.merge_data(listing, site, {}))
+                aggregator.export_to_csv('hospitals.csv')
+                aggregator.export_to_excel('hospitals.xlsx')
+                return aggregator.all_data
+
+            def pdf_reports():
+                exporter = PDFExporter()
+                exporter.export_data_to_pdf(universal_records, {'total_records': len(universal_records)}, 'offline.pdf')
+                return universal_records
+
+            measure_stage(results, 'universal aggregator', universal_exports)
+            measure_stage(results, 'hospital aggregator', hospital_exports)
+            measure_stage(results, 'pdf report', pdf_reports)
+        finally:
+            os.chdir(cwd)
+
+    own_mb, children_mb = peak_rss_mb()
+    if traced:
+        tracemalloc.stop()
+    results['peak_rss'] = {'own_mb': own_mb}
+    if children_mb is None:
+        label = 'peak traced memory' if traced else 'peak RSS'
+        print(f"  {label:<28}{own_mb:>8.1f}MB")
+    else:
+        results['peak_rss']['children_mb'] = children_mb
+        print(f"  {'peak RSS':<28}{own_mb:>8.1f}MB (Chrome/children: {children_mb:.1f}MB)")
+    return results
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Print regressions beyond tolerance; returns True if there were any"""
+    regressions = []
+    for stage, metrics in results.items():
+        for metric, value in metrics.items():
+            previous = baseline.get(stage, {}).get(metric)
+            if not previous:
+                continue
+            change = value / previous - 1
+            # Throughput should not drop; memory should not grow
+            worse = change < -tolerance if metric.endswith('_per_sec') else change > tolerance
+            if worse:
+                regressions.append(f"{stage} {metric}: {previous:.1f} -> {value:.1f} ({change:+.0%})")
+
+    if regressions:
+        print(f"\n✗ {len(regressions)} regression(s) beyond {tolerance:.0%} of the baseline:")
+        for regression in regressions:
+            print(f"   - {regression}")
+    else:
+        print(f"\n✓ No regressions beyond {tolerance:.0%} of the baseline")
+    return bool(regressions)
+
+# Third-party packages the interactive menus should not load before they are needed
+HEAVY_MODULES = ['pandas', 'numpy', 'selenium', 'undetected_chromedriver', 'fake_useragent',
+                 'reportlab', 'openpyxl', 'bs4', 'requests']
+
+STARTUP_TARGETS = [
+    ('import smart_scraper', "import smart_scraper"),
+    ('smart_scraper view_statistics', "import smart_scraper; smart_scraper.view_statistics()"),
+    ('import universal_main', "import universal_main"),
+    ('import auto_updater', "import auto_updater"),
+]
+
+def bench_startup(runs):
+    """Interpreter start + import time of the CLI entry points, and which heavy packages they load"""
+    import subprocess
+    import sys
+    import tempfile
+    from json_records import write_records
+
+    print(f"\nStartup benchmark (best of {runs} runs)")
+    root = os.path.dirname(os.path.abspath(__file__))
+    report = "; import sys; print('heavy=' + ','.join(m for m in %r if m in sys.modules))" % HEAVY_MODULES
+    with tempfile.TemporaryDirectory() as tmp:
+        # Something for view_statistics to read
+        write_records(os.path.join(tmp, 'universal_scraped_data.json'),
+                      {'total_records': 1000, 'statistics': {}}, make_records(1000))
+        env = {**os.environ, 'PYTHONPATH': root}
+
+        for label, code in STARTUP_TARGETS:
+            best = None
+            for _ in range(runs):
+                start = time.perf_counter()
+                result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code + report],
+                                        cwd=tmp, env=env, capture_output=True, text=True)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            loaded = [line[6:] for line in result.stdout.splitlines() if line.startswith('heavy=')]
+            loaded = loaded[-1] if loaded else 'not reported (failed?)'
+            print(f"  {label:<45}{best:>10.3f}s  heavy: {loaded or 'none'}")
+
+            # Slowest top-level imports, from -X importtime (cumulative microseconds)
+            imports = []
+            for line in result.stderr.splitlines():
+                parts = line.split('|')
+                if line.startswith('import time:') and len(parts) == 3 and parts[1].strip().isdigit():
+                    name = parts[2].rstrip()
+                    if not name.startswith('  ') and name.strip() != 'package':
+                        imports.append((int(parts[1]), name.strip()))
+            for cumulative, name in sorted(imports, reverse=True)[:3]:
+                print(f"      {name:<41}{cumulative / 1e6:>10.3f}s")
+
+BENCHMARKS = {
+    'ranking': (bench_ranking, 1_000_000),
+    'rescore': (bench_rescore, 100_000),
+    'memory': (bench_memory, 1_000_000),
+    'excel': (bench_excel, 20_000),
+    'pdf': (bench_pdf, 1_000),
+    'offline': (bench_offline, 50),
+    'startup': (bench_startup, 5),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Run scraper benchmarks")
+    parser.add_argument('name', nargs='?', default='all', choices=['all'] + list(BENCHMARKS))
+    parser.add_argument('--records', type=int, help="Number of synthetic records (pages per scraper for 'offline')")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="Baseline file for the offline benchmark")
+    parser.add_argument('--save-baseline', action='store_true', help="Store the offline results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed slowdown before reporting a regression")
+    args = parser.parse_args()
+
+    names = list(BENCHMARKS) if args.name == 'all' else [args.name]
+    regressed = False
+    for name in names:
+        func, default_count = BENCHMARKS[name]
+        results = func(args.records or default_count)
+        if name != 'offline':
+            continue
+        if args.save_baseline:
+            with open(args.baseline, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            print(f"\n✓ Baseline saved to {args.baseline}")
+        elif os.path.exists(args.baseline):
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                regressed = compare_to_baseline(results, json.load(f), args.tolerance)
+        else:
+            print("\nNo baseline yet; run with --save-baseline to store one")
+
+    if regressed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Checkpoint Store - Persist crawl progress so interrupted runs can resume
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+# Bumped when the tables change; older checkpoints cannot be resumed
+SCHEMA_VERSION = 2
+
+def remove_database(filename):
+    """Delete a SQLite database with its WAL files, so a stale WAL cannot be replayed into a new one"""
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(filename + suffix):
+            os.remove(filename + suffix)
+
+class CheckpointStore:
+    def __init__(self, filename='scraper_checkpoint.db', resume=False):
+        self.filename = filename
+        self.lock = threading.Lock()
+
+        if resume and os.path.exists(filename):
+            conn = sqlite3.connect(filename)
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            conn.close()
+            if version != SCHEMA_VERSION:
+                print("⚠ Checkpoint was written by an older version and cannot be resumed; starting over")
+                resume = False
+
+        # Start from a clean slate unless we are resuming a previous run
+        if not resume:
+            remove_database(filename)
+
+        self.conn = sqlite3.connect(filename, check_same_thread=False)
+        self.conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS queries (
+                query TEXT PRIMARY KEY,
+                completed_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS listings (
+                query TEXT,
+                listing_key TEXT,
+                position INTEGER,
+                data TEXT,
+                PRIMARY KEY (query, listing_key)
+            );
+            CREATE TABLE IF NOT EXISTS steps (
+                listing_key TEXT,
+                step TEXT,
+                data TEXT,
+                completed_at TEXT,
+                PRIMARY KEY (listing_key, step)
+            );
+        """)
+        self.conn.commit()
+
+    def listing_key(self, listing):
+        """Build a stable key for a Google Maps listing"""
+        url = listing.get('google_maps_url')
+        if url and url != "N/A":
+            # Drop the volatile viewport/data suffix Maps appends to place URLs
+            return url.split('/data=')[0].split('/@')[0]
+        return f"{listing.get('name', '')}|{listing.get('address', '')}".lower()
+
+    def is_query_done(self, query):
+        """Check whether a Maps search query was fully scraped"""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT completed_at FROM queries WHERE query = ?', (query,)
+            ).fetchone()
+        return bool(row and row[0])
+
+    def mark_query_done(self, query):
+        """Mark a Maps search query as fully scraped"""
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO queries (query, completed_at) VALUES (?, ?)',
+                (query, datetime.now().isoformat())
+            )
+            self.conn.commit()
+
+    def save_listing(self, query, listing):
+        """Record a single Maps listing as soon as it is extracted
+        A business found by several queries is recorded once per query, so each resumes whole.
+        """
+        key = self.listing_key(listing)
+        with self.lock:
+            position = self.conn.execute('SELECT COUNT(*) FROM listings').fetchone()[0]
+            self.conn.execute(
+                'INSERT OR IGNORE INTO listings (query, listing_key, position, data) VALUES (?, ?, ?, ?)',
+                (query, key, position, json.dumps(listing, ensure_ascii=False))
+            )
+            self.conn.commit()
+        return key
+
+    def get_listings(self, query=None):
+        """Return recorded listings, optionally only those from one query"""
+        with self.lock:
+            if query is None:
+                # Once per business, as first found
+                rows = self.conn.execute(
+                    'SELECT data, MIN(position) FROM listings GROUP BY listing_key ORDER BY MIN(position)'
+                ).fetchall()
+            else:
+                rows = self.conn.execute(
+                    'SELECT data FROM listings WHERE query = ? ORDER BY position', (query,)
+                ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def has_step(self, listing_key, step):
+        """Check whether an enrichment step already finished for a listing"""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT 1 FROM steps WHERE listing_key = ? AND step = ?', (listing_key, step)
+            ).fetchone()
+        return row is not None
+
+    def get_step(self, listing_key, step):
+        """Return the stored result of an enrichment step, or None"""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT data FROM steps WHERE listing_key = ? AND step = ?', (listing_key, step)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_step(self, listing_key, step, data):
+        """Record the result of an enrichment step for a listing"""
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO steps (listing_key, step, data, completed_at) VALUES (?, ?, ?, ?)',
+                (listing_key, step, json.dumps(data or {}, ensure_ascii=False), datetime.now().isoformat())
+            )
+            self.conn.commit()
+
+    def get_statistics(self):
+        """Get counts of recorded queries, listings and steps"""
+        with self.lock:
+            queries = self.conn.execute('SELECT COUNT(*) FROM queries').fetchone()[0]
+            listings = self.conn.execute('SELECT COUNT(DISTINCT listing_key) FROM listings').fetchone()[0]
+            steps = dict(self.conn.execute('SELECT step, COUNT(*) FROM steps GROUP BY step').fetchall())
+        return {
+            'completed_queries': queries,
+            'listings': listings,
+            'steps': steps
+        }
+
+    def close(self):
+        """Close the underlying database"""
+        with self.lock:
+            self.conn.close()
@@ -48,6 +48,54 @@ SCRAPER_SETTINGS = {
     "delay_between_requests": 2,  # seconds
     "max_results_per_category": 100,
     "headless": True,
-    "timeout": 30
+    "timeout": 30,
+    "checkpoint_file": "scraper_checkpoint.db",  # Progress journal used by --resume
+    "compact_records": False,  # Column-oriented record storage for very large runs
+    "metrics_report": "scraper_metrics"  # Timing/counter report written after each run (.json/.prom)
 }
 
+
+# Pipelined enrichment settings (main.py --pipeline)
+PIPELINE_SETTINGS = {
+    "website_workers": 4,  # Concurrent HTTP website enrichers
+    "social_workers": 2,  # Concurrent browsers for social media lookups
+    "queue_size": 20,  # Max listings waiting between two stages
+    "report_interval": 30  # seconds between queue depth reports
+}
+
+# Website enrichment settings
+WEBSITE_SETTINGS = {
+    "max_body_bytes": 2 * 1024 * 1024,  # Larger pages are cut off instead of downloaded
+    "max_read_seconds": 15,  # Stop reading a slow page after this long
+    # Stop reading an extra (contact/about) page once emails, phones and established year are
+    # found; such a page then adds no description or services. The homepage is always read in full.
+    "stop_when_found": True,
+    "crawl_pages": 4,  # Extra same-site pages (contact, about, ...) read per website; 0 = homepage only
+    "crawl_seconds": 20,  # Time budget for those extra pages, per website
+    "crawl_workers": 3,  # Extra pages fetched at once
+    "respect_robots": True,  # Skip extra pages that robots.txt disallows
+    # Words in a link's text or URL that suggest contact details; higher scores are read first
+    "crawl_keywords": {
+        "contact": 10,
+        "get in touch": 8,
+        "reach us": 8,
+        "find us": 6,
+        "about": 5,
+        "location": 4,
+        "branch": 3,
+        "appointment": 3,
+        "help": 1
+    }
+}
+
+# Social media lookup settings
+SOCIAL_SETTINGS = {
+    "concurrent": False,  # Look up Facebook, Instagram and TikTok in parallel (one browser each)
+    "combined_discovery": True,  # One Google search per business finds every profile URL
+    "discovery_cache_file": "social_discovery_cache.jsonl",  # Reused across runs (append-only)
+    "platform_timeouts": {  # seconds allowed per platform in concurrent mode
+        "facebook": 60,
+        "instagram": 45,
+        "tiktok": 45
+    }
+}
@@ -3,13 +3,25 @@ Data Aggregator to combine and export scraped data
 """
 
 import pandas as pd
+import numpy as np
 import re
 from datetime import datetime
-from config import DATA_FIELDS
+from config import DATA_FIELDS, CITIES, SCRAPER_SETTINGS
+from metric_parser import parse_metric, parse_metrics, parse_follower_summary, parse_follower_summaries
+from record_store import RecordStore, records_to_dataframe
+from instrumentation import count, timer
+
+# One compiled alternation for all cities; CITY_PRIORITY keeps the CITIES order as tie-breaker
+CITY_PATTERN = re.compile('|'.join(re.escape(city.lower()) for city in CITIES))
+CITY_PRIORITY = {city.lower(): (i, city) for i, city in enumerate(CITIES)}
+FOLLOWER_FIELDS = ['facebook_followers', 'instagram_followers', 'tiktok_followers']
 
 class DataAggregator:
-    def __init__(self):
-        self.all_data = []
+    def __init__(self, compact=None):
+        if compact is None:
+            compact = SCRAPER_SETTINGS.get('compact_records', False)
+        # Column-oriented storage keeps memory flat for millions of records
+        self.all_data = RecordStore() if compact else []
     
     def merge_data(self, google_data, website_data, social_data):
         """Merge data from all sources into a single record"""
@@ -95,16 +107,13 @@ class DataAggregator:
     
     def extract_city(self, address):
         """Extract city name from address"""
-        from config import CITIES
         if not address or address == "N/A":
             return "N/A"
         
-        address_lower = address.lower()
-        for city in CITIES:
-            if city.lower() in address_lower:
-                return city
-        
-        return "N/A"
+        matches = CITY_PATTERN.findall(address.lower())
+        if not matches:
+            return "N/A"
+        return min(CITY_PRIORITY[m] for m in matches)[1]
     
     def estimate_traffic(self, data):
         """Estimate traffic based on reviews and social media followers"""
@@ -112,49 +121,125 @@ class DataAggregator:
             traffic_score = 0
             
             # Reviews contribute to traffic
-            if data.get('review_count') and data['review_count'] != "0" and data['review_count'] != "N/A":
-                try:
-                    reviews = int(str(data['review_count']).replace(',', ''))
-                    # Rough estimate: 10-20% of people who visit leave reviews
-                    traffic_score += reviews * 10
-                except:
-                    pass
+            # Rough estimate: 10-20% of people who visit leave reviews
+            traffic_score += parse_metric(data.get('review_count')) * 10
             
-            # Social media followers contribute
-            if data.get('social_media_followers'):
-                followers_text = str(data['social_media_followers'])
-                follower_nums = re.findall(r'(\d+)', followers_text)
-                for num_str in follower_nums:
-                    try:
-                        traffic_score += int(num_str)
-                    except:
-                        pass
+            # Social media followers contribute (numeric since ingestion)
+            if any(field in data for field in FOLLOWER_FIELDS):
+                traffic_score += sum(parse_metric(data.get(field)) for field in FOLLOWER_FIELDS)
+            elif data.get('social_media_followers'):
+                traffic_score += sum(parse_follower_summary(data['social_media_followers']).values())
             
-            if traffic_score == 0:
-                return "Low (< 1K)"
-            elif traffic_score < 5000:
-                return f"Low-Medium ({traffic_score//1000}K-{traffic_score//500}K)"
-            elif traffic_score < 20000:
-                return f"Medium ({traffic_score//1000}K-{(traffic_score*2)//1000}K)"
-            elif traffic_score < 100000:
-                return f"Medium-High ({(traffic_score//1000)}K-{(traffic_score*2)//1000}K)"
-            else:
-                return f"High ({traffic_score//1000}K+)"
+            return self.traffic_band(traffic_score)
         
         except Exception as e:
             return "Unknown"
     
+    def traffic_band(self, traffic_score):
+        """Describe a numeric traffic score as a band"""
+        if traffic_score == 0:
+            return "Low (< 1K)"
+        elif traffic_score < 5000:
+            return f"Low-Medium ({traffic_score//1000}K-{traffic_score//500}K)"
+        elif traffic_score < 20000:
+            return f"Medium ({traffic_score//1000}K-{(traffic_score*2)//1000}K)"
+        elif traffic_score < 100000:
+            return f"Medium-High ({(traffic_score//1000)}K-{(traffic_score*2)//1000}K)"
+        else:
+            return f"High ({traffic_score//1000}K+)"
+    
+    def extract_cities(self, addresses):
+        """Vectorized extract_city over a Series of addresses"""
+        lower = addresses.astype(object).where(addresses.notna(), '').astype(str).str.lower()
+        first = lower.str.extract(f'({CITY_PATTERN.pattern})', expand=False)
+        cities = first.map(lambda m: CITY_PRIORITY[m][1], na_action='ignore').fillna("N/A").astype(object)
+        
+        # Addresses naming several cities resolve by CITIES order, as in extract_city
+        several = lower.str.count(CITY_PATTERN.pattern) > 1
+        if several.any():
+            cities[several] = [self.extract_city(a) for a in addresses[several]]
+        return cities
+    
+    def traffic_scores(self, df):
+        """Vectorized traffic score for every row of a DataFrame"""
+        scores = np.zeros(len(df), dtype='int64')
+        
+        if 'review_count' in df.columns:
+            scores += parse_metrics(df['review_count']) * 10
+        
+        # Per row, as in estimate_traffic: follower fields if the row has any, else the summary
+        follower_columns = [col for col in FOLLOWER_FIELDS if col in df.columns]
+        has_fields = np.zeros(len(df), dtype=bool)
+        for col in follower_columns:
+            has_fields |= df[col].notna().to_numpy()
+            scores += parse_metrics(df[col])
+        if 'social_media_followers' in df.columns and not has_fields.all():
+            summaries = df['social_media_followers'][~has_fields]
+            scores[~has_fields] += parse_follower_summaries(summaries)
+        
+        return scores
+    
+    def traffic_bands(self, scores):
+        """Vectorized traffic_band for an array of scores"""
+        scores = np.asarray(scores, dtype='int64')
+        bands = np.full(len(scores), "Low (< 1K)", dtype=object)
+        nonzero = scores != 0
+        
+        # A band's text depends only on score // 500 (every band edge is a multiple of 500),
+        # so each bucket is formatted once by traffic_band itself
+        buckets, inverse = np.unique(scores[nonzero] // 500, return_inverse=True)
+        labels = np.array([self.traffic_band(int(bucket) * 500 or 1) for bucket in buckets], dtype=object)
+        bands[nonzero] = labels[inverse.reshape(-1)]
+        return bands
+    
+    def rescore_dataframe(self, df):
+        """Recompute city and traffic_estimate for a whole DataFrame at once"""
+        df = df.copy()
+        
+        if 'address' in df.columns:
+            has_address = df['address'].notna() & (df['address'].astype(str) != '')
+            if 'city' in df.columns:
+                missing_city = df['city'].isna() | (df['city'].astype(str) == '')
+            else:
+                missing_city = pd.Series(True, index=df.index)
+                df['city'] = None
+            to_fill = has_address & missing_city
+            df.loc[to_fill, 'city'] = self.extract_cities(df.loc[to_fill, 'address'])
+        
+        df['traffic_estimate'] = self.traffic_bands(self.traffic_scores(df))
+        return df
+    
+    def rescore_file(self, filename, output_filename=None):
+        """Re-score an exported CSV or Excel file in bulk"""
+        if filename.endswith('.xlsx'):
+            df = pd.read_excel(filename)
+        else:
+            df = pd.read_csv(filename, encoding='utf-8-sig')
+        
+        df = self.rescore_dataframe(df)
+        
+        output_filename = output_filename or filename
+        if output_filename.endswith('.xlsx'):
+            df.to_excel(output_filename, index=False, sheet_name='Hospitals & Clinics')
+        else:
+            df.to_csv(output_filename, index=False, encoding='utf-8-sig')
+        
+        print(f"\n✓ Re-scored {len(df)} records into {output_filename}")
+        return output_filename
+    
     def add_record(self, record):
         """Add a merged record to the collection"""
         self.all_data.append(record)
+        count('records')
     
+    @timer('export.csv')
     def export_to_csv(self, filename='pakistan_hospitals_clinics_data.csv'):
         """Export data to CSV file"""
         if not self.all_data:
             print("No data to export!")
             return
         
-        df = pd.DataFrame(self.all_data)
+        df = records_to_dataframe(self.all_data)
         
         # Reorder columns to match DATA_FIELDS
         existing_columns = [col for col in DATA_FIELDS if col in df.columns]
@@ -166,13 +251,14 @@ class DataAggregator:
         print(f"Total records: {len(df)}")
         return filename
     
+    @timer('export.excel')
     def export_to_excel(self, filename='pakistan_hospitals_clinics_data.xlsx'):
         """Export data to Excel file"""
         if not self.all_data:
             print("No data to export!")
             return
         
-        df = pd.DataFrame(self.all_data)
+        df = records_to_dataframe(self.all_data)
         
         # Reorder columns
         existing_columns = [col for col in DATA_FIELDS if col in df.columns]
@@ -191,7 +277,7 @@ class DataAggregator:
         if not self.all_data:
             return {}
         
-        df = pd.DataFrame(self.all_data)
+        df = records_to_dataframe(self.all_data)
         
         stats = {
             'total_records': len(df),
@@ -0,0 +1,81 @@
+"""
+Discovery Cache - Remember which social profiles and websites belong to a business
+Stored as JSON lines, one per discovery, appended as they are found (later lines win).
+Empty discoveries are only remembered for the current run: a search that found nothing
+(e.g. a consent or captcha page) is tried again next time.
+"""
+
+import json
+import os
+import re
+import threading
+from config import CITIES
+
+class DiscoveryCache:
+    def __init__(self, filename='social_discovery_cache.jsonl'):
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.entries = {}
+        # Searches that failed this run; not saved, so the next run tries them again
+        self.failed = set()
+        self.load()
+
+    def load(self):
+        """Load cached discoveries from disk"""
+        if not os.path.exists(self.filename):
+            return
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # e.g. a line cut short by a crash
+                    if entry.get('discovery'):  # files from older versions persisted empty ones
+                        self.entries[entry['key']] = entry['discovery']
+        except Exception as e:
+            print(f"Could not load discovery cache: {e}")
+            self.entries = {}
+
+    def make_key(self, business_name, location=""):
+        """Build a cache key from the normalized business name and city"""
+        name = re.sub(r'[^a-z0-9]+', ' ', str(business_name).lower()).strip()
+        location_lower = str(location).lower()
+        city = next((c.lower() for c in CITIES if c.lower() in location_lower), '')
+        return f"{name}|{city}"
+
+    def get(self, business_name, location=""):
+        """Return the cached discovery for a business, or None"""
+        with self.lock:
+            return self.entries.get(self.make_key(business_name, location))
+
+    def put(self, business_name, location, discovery):
+        """Store a discovery (empty results only in memory, so a later run searches again)"""
+        key = self.make_key(business_name, location)
+        with self.lock:
+            self.entries[key] = discovery
+            self.failed.discard(key)
+            if not discovery:
+                return
+            with open(self.filename, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'key': key, 'discovery': discovery}, ensure_ascii=False) + "\n")
+
+    def has_failed(self, business_name, location=""):
+        """Whether the search for a business already failed in this run"""
+        with self.lock:
+            return self.make_key(business_name, location) in self.failed
+
+    def put_failure(self, business_name, location=""):
+        """Remember a failed search so other platforms of the same business do not repeat it"""
+        with self.lock:
+            self.failed.add(self.make_key(business_name, location))
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_discovery_cache(filename='social_discovery_cache.jsonl'):
+    """Get the process-wide cache for a file, shared by every scraper instance"""
+    with _caches_lock:
+        if filename not in _caches:
+            _caches[filename] = DiscoveryCache(filename)
+        return _caches[filename]
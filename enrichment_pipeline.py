@@ -0,0 +1,314 @@
+"""
+Enrichment Pipeline - Overlap Google Maps, website and social media stages
+Maps producer -> website enrichers (HTTP) -> social enrichers (browsers) -> aggregate sink
+"""
+
+import queue
+import threading
+import time
+from website_scraper import WebsiteScraper
+from social_media_scraper import SocialMediaScraper, SOCIAL_PLATFORMS
+from instrumentation import pause
+from config import SCRAPER_SETTINGS, PIPELINE_SETTINGS
+
+_STOP = object()
+
+def has_website(listing):
+    return listing.get('website') not in (None, '', 'N/A')
+
+def enrich_website(listing, website_scraper, checkpoint=None, step='website'):
+    """Scrape the listing's website, reusing a checkpointed result if present"""
+    key = checkpoint.listing_key(listing) if checkpoint else None
+    if checkpoint:
+        website_data = checkpoint.get_step(key, step)
+        if website_data is not None:
+            return website_data
+
+    website_data = {}
+    errors = website_scraper.error_count
+    if has_website(listing):
+        website_data = website_scraper.scrape_website(listing['website'])
+        pause(SCRAPER_SETTINGS['delay_between_requests'])
+
+    # A failed site is left unrecorded so --resume retries it
+    if checkpoint and website_scraper.error_count == errors:
+        checkpoint.save_step(key, step, website_data)
+    return website_data
+
+def enrich_discovered_website(listing, website_data, website_scraper, had_website, checkpoint=None):
+    """Scrape a website that social discovery filled in after the website step found none"""
+    if had_website or not has_website(listing):
+        return website_data
+    return enrich_website(listing, website_scraper, checkpoint, step='discovered_website')
+
+def enrich_social(listing, social_scraper, checkpoint=None):
+    """Scrape every social platform for the listing, one checkpointed step per platform"""
+    key = checkpoint.listing_key(listing) if checkpoint else None
+    business_name = listing.get('name', '')
+    location = listing.get('address', '')
+    social_data = listing  # Enriched in place, as scrape_all_social_media does
+
+    print(f"\nSearching social media for: {business_name}")
+    results = {}
+    pending = []
+    for platform in SOCIAL_PLATFORMS:
+        platform_data = checkpoint.get_step(key, platform) if checkpoint else None
+        if platform_data is None:
+            pending.append(platform)
+        else:
+            results[platform] = platform_data
+    
+    # Once every platform is checkpointed, only an earlier discovery is reused (no new search)
+    social_scraper.add_discovered_website(business_name, location, social_data, search=bool(pending))
+    if social_scraper.concurrent and pending:
+        scraped = social_scraper.scrape_platforms(pending, business_name, location, social_data)
+    else:
+        scraped = {}
+        for platform in pending:
+            scraped[platform] = social_scraper.scrape_platform(platform, business_name, location, social_data)
+            social_data.update(scraped[platform] or {})
+    
+    for platform in pending:
+        # A failed or timed-out platform is left unrecorded so --resume retries it
+        if checkpoint and scraped[platform] is not None:
+            checkpoint.save_step(key, platform, scraped[platform])
+        results[platform] = scraped[platform] or {}
+    
+    for platform in SOCIAL_PLATFORMS:
+        social_data.update(results[platform])
+    pause(SCRAPER_SETTINGS['delay_between_requests'])
+
+    return social_data
+
+class StageStats:
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.processed = 0
+        self.errors = 0
+        self.busy_time = 0.0
+        self.started = None
+        self.finished = None
+        self.max_queue_depth = 0
+        self.lock = threading.Lock()
+
+    def record(self, elapsed, error=False):
+        """Record one processed item"""
+        with self.lock:
+            self.processed += 1
+            self.busy_time += elapsed
+            if error:
+                self.errors += 1
+
+    def observe_queue(self, depth):
+        """Track the deepest the stage's input queue has been"""
+        with self.lock:
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def summary(self):
+        """Get throughput numbers for this stage"""
+        wall = (self.finished or time.time()) - (self.started or time.time())
+        return {
+            'stage': self.name,
+            'workers': self.workers,
+            'processed': self.processed,
+            'errors': self.errors,
+            'wall_time': wall,
+            'items_per_minute': self.processed / (wall / 60) if wall > 0 else 0,
+            'avg_item_time': self.busy_time / self.processed if self.processed else 0,
+            'max_queue_depth': self.max_queue_depth,
+        }
+
+class EnrichmentPipeline:
+    def __init__(self, google_scraper, aggregator, checkpoint=None,
+                 website_workers=None, social_workers=None, queue_size=None):
+        self.google_scraper = google_scraper
+        self.aggregator = aggregator
+        self.checkpoint = checkpoint
+        self.website_workers = website_workers or PIPELINE_SETTINGS['website_workers']
+        self.social_workers = social_workers or PIPELINE_SETTINGS['social_workers']
+        queue_size = queue_size or PIPELINE_SETTINGS['queue_size']
+
+        # Bounded queues give back-pressure: a slow stage pauses the one before it
+        self.website_queue = queue.Queue(maxsize=queue_size)
+        self.social_queue = queue.Queue(maxsize=queue_size)
+        self.sink_queue = queue.Queue(maxsize=queue_size)
+
+        self.stats = {
+            'maps': StageStats('maps', 1),
+            'website': StageStats('website', self.website_workers),
+            'social': StageStats('social', self.social_workers),
+            'sink': StageStats('sink', 1),
+        }
+        self.done = threading.Event()
+
+    def _produce(self):
+        """Stream Google Maps listings into the website stage"""
+        stats = self.stats['maps']
+        stats.started = time.time()
+        last = [time.time()]
+
+        def on_listing(listing):
+            now = time.time()
+            stats.record(now - last[0])
+            last[0] = now
+            self.website_queue.put(listing)
+            self._observe_queues()
+
+        try:
+            self.google_scraper.scrape_all(on_listing=on_listing)
+        except Exception as e:
+            print(f"Error in Maps stage: {e}")
+        finally:
+            stats.finished = time.time()
+
+    # Workers never die on an error: every item is passed on (with empty data if need be)
+    # and every worker keeps reading until _STOP, so the bounded queues always drain.
+
+    def _website_worker(self):
+        """Enrich listings from their websites over HTTP"""
+        stats = self.stats['website']
+        try:
+            scraper = WebsiteScraper()
+        except Exception as e:
+            print(f"Error starting website worker: {e}")
+            scraper = None
+        try:
+            while True:
+                listing = self.website_queue.get()
+                if listing is _STOP:
+                    break
+                start = time.time()
+                try:
+                    website_data = enrich_website(listing, scraper, self.checkpoint) if scraper else {}
+                    stats.record(time.time() - start, error=scraper is None)
+                except Exception as e:
+                    print(f"Error in website stage for {listing.get('name', 'Unknown')}: {e}")
+                    website_data = {}
+                    stats.record(time.time() - start, error=True)
+                self.social_queue.put((listing, website_data))
+        finally:
+            if scraper:
+                scraper.close()
+
+    def _social_worker(self):
+        """Enrich listings from social media, one browser per worker"""
+        stats = self.stats['social']
+        website_scraper = None  # only for websites found by discovery, created on first need
+        try:
+            scraper = SocialMediaScraper(headless=SCRAPER_SETTINGS['headless'])
+        except Exception as e:
+            print(f"Error starting social worker: {e}")
+            scraper = None
+        try:
+            while True:
+                item = self.social_queue.get()
+                if item is _STOP:
+                    break
+                listing, website_data = item
+                start = time.time()
+                try:
+                    had_website = has_website(listing)
+                    social_data = enrich_social(listing, scraper, self.checkpoint) if scraper else {}
+                    if not had_website and has_website(listing):
+                        # The website stage already passed this listing on, so scrape it here
+                        website_scraper = website_scraper or WebsiteScraper()
+                        website_data = enrich_discovered_website(listing, website_data, website_scraper,
+                                                                 had_website, self.checkpoint)
+                    stats.record(time.time() - start, error=scraper is None)
+                except Exception as e:
+                    print(f"Error in social stage for {listing.get('name', 'Unknown')}: {e}")
+                    social_data = {}
+                    stats.record(time.time() - start, error=True)
+                self.sink_queue.put((listing, website_data, social_data))
+        finally:
+            if scraper:
+                scraper.close()
+            if website_scraper:
+                website_scraper.close()
+
+    def _sink(self):
+        """Merge enriched listings into the aggregator (single writer)"""
+        stats = self.stats['sink']
+        while True:
+            item = self.sink_queue.get()
+            if item is _STOP:
+                break
+            listing, website_data, social_data = item
+            self._observe_queues()
+            start = time.time()
+            try:
+                merged_record = self.aggregator.merge_data(listing, website_data, social_data)
+                self.aggregator.add_record(merged_record)
+            except Exception as e:
+                print(f"Error saving {listing.get('name', 'Unknown')}: {e}")
+                stats.record(time.time() - start, error=True)
+                continue
+            stats.record(time.time() - start)
+            print(f"  ✓ Enriched: {merged_record.get('name', 'Unknown')} "
+                  f"({stats.processed} done)")
+
+    def _monitor(self):
+        """Periodically report queue depths"""
+        interval = PIPELINE_SETTINGS['report_interval']
+        while not self.done.wait(interval):
+            self._observe_queues()
+            print(f"\n  [Pipeline] queues: website={self.website_queue.qsize()} "
+                  f"social={self.social_queue.qsize()} sink={self.sink_queue.qsize()} | "
+                  f"done: maps={self.stats['maps'].processed} "
+                  f"website={self.stats['website'].processed} "
+                  f"social={self.stats['social'].processed} "
+                  f"sink={self.stats['sink'].processed}")
+
+    def _observe_queues(self):
+        self.stats['website'].observe_queue(self.website_queue.qsize())
+        self.stats['social'].observe_queue(self.social_queue.qsize())
+        self.stats['sink'].observe_queue(self.sink_queue.qsize())
+
+    def _start(self, target, count, name):
+        threads = []
+        for i in range(count):
+            thread = threading.Thread(target=target, name=f"{name}-{i+1}", daemon=True)
+            thread.start()
+            threads.append(thread)
+        return threads
+
+    def run(self):
+        """Run all stages concurrently and wait for the pipeline to drain"""
+        for stage in ('website', 'social', 'sink'):
+            self.stats[stage].started = time.time()
+
+        monitor = threading.Thread(target=self._monitor, daemon=True)
+        monitor.start()
+
+        sink = self._start(self._sink, 1, 'sink')
+        social = self._start(self._social_worker, self.social_workers, 'social')
+        website = self._start(self._website_worker, self.website_workers, 'website')
+
+        # Drain stage by stage: each stage stops once the one before it has finished
+        self._produce()
+        for stage_name, threads, next_queue in (
+            ('website', website, self.website_queue),
+            ('social', social, self.social_queue),
+            ('sink', sink, self.sink_queue),
+        ):
+            for _ in threads:
+                next_queue.put(_STOP)
+            for thread in threads:
+                thread.join()
+            self.stats[stage_name].finished = time.time()
+
+        self.done.set()
+        return self.aggregator.all_data
+
+    def get_statistics(self):
+        """Get per-stage throughput and queue depth statistics"""
+        return [self.stats[name].summary() for name in ('maps', 'website', 'social', 'sink')]
+
+    def print_statistics(self):
+        """Print a per-stage throughput table"""
+        print(f"\n{'Stage':<10}{'Workers':>8}{'Items':>8}{'Errors':>8}"
+              f"{'Items/min':>11}{'Avg s':>8}{'Max queue':>11}")
+        for row in self.get_statistics():
+            print(f"{row['stage']:<10}{row['workers']:>8}{row['processed']:>8}{row['errors']:>8}"
+                  f"{row['items_per_minute']:>11.1f}{row['avg_item_time']:>8.1f}{row['max_queue_depth']:>11}")
@@ -0,0 +1,95 @@
+"""
+Excel Exporter - Streaming multi-sheet workbook writer for large datasets
+Writes "All Data" plus per-category and per-platform sheets in a single pass over the
+records, using openpyxl's write-only mode so memory stays flat regardless of row count.
+"""
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Font, Border, Side, Alignment
+from record_store import RecordStore
+
+HEADER_FONT = Font(bold=True)
+HEADER_BORDER = Border(*(Side(style='thin'),) * 4)
+HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='top')
+
+def excel_value(value):
+    """Convert a record value into something a worksheet cell accepts"""
+    if value is None or isinstance(value, (int, float, bool)):
+        if isinstance(value, float) and value != value:  # NaN
+            return None
+        return value
+    if not isinstance(value, str):
+        value = str(value)
+    return ILLEGAL_CHARACTERS_RE.sub('', value)
+
+def sheet_title(name, used):
+    """Excel-safe, unique sheet title (max 31 chars)"""
+    title = ''.join('_' if c in '[]:*?/\\' else c for c in str(name))[:31] or 'Sheet'
+    candidate = title
+    suffix = 2
+    while candidate.lower() in used:
+        candidate = f"{title[:31 - len(str(suffix)) - 1]}_{suffix}"
+        suffix += 1
+    used.add(candidate.lower())
+    return candidate
+
+def stream_records_to_excel(records, filename, preferred_fields=None,
+                            max_category_sheets=20, max_platform_sheets=10):
+    """Write records to a multi-sheet workbook in one streaming pass"""
+    preferred_fields = preferred_fields or []
+
+    # Cheap pre-pass: only field names and group keys, no cell serialization
+    if isinstance(records, RecordStore):
+        fields = records.field_names()
+        categories = records.distinct('category')
+        platforms = records.distinct('platform')
+    else:
+        fields, categories, platforms = {}, {}, {}
+        for record in records:
+            fields.update(dict.fromkeys(record))
+            categories.setdefault(record.get('category'), None)
+            platforms.setdefault(record.get('platform'), None)
+        categories = [c for c in categories if c is not None]
+        platforms = [p for p in platforms if p is not None]
+
+    columns = [f for f in preferred_fields if f in fields] + [f for f in fields if f not in preferred_fields]
+
+    workbook = Workbook(write_only=True)
+    used_titles = set()
+
+    def new_sheet(name):
+        sheet = workbook.create_sheet(sheet_title(name, used_titles))
+        header = []
+        for column in columns:
+            cell = WriteOnlyCell(sheet, value=column)
+            cell.font = HEADER_FONT
+            cell.border = HEADER_BORDER
+            cell.alignment = HEADER_ALIGNMENT
+            header.append(cell)
+        sheet.append(header)
+        return sheet
+
+    all_sheet = new_sheet('All Data')
+    category_sheets = {c: new_sheet(c) for c in categories[:max_category_sheets]}
+    platform_sheets = {p: new_sheet(p) for p in platforms[:max_platform_sheets]}
+
+    if isinstance(records, RecordStore):
+        rows = records.iter_rows(columns)
+    else:
+        rows = (tuple(record.get(column) for column in columns) for record in records)
+    category_index = columns.index('category') if 'category' in columns else None
+    platform_index = columns.index('platform') if 'platform' in columns else None
+
+    # Single pass: each row is converted once and appended to every sheet it belongs to
+    for row in rows:
+        values = [excel_value(value) for value in row]
+        all_sheet.append(values)
+        if category_index is not None and row[category_index] in category_sheets:
+            category_sheets[row[category_index]].append(values)
+        if platform_index is not None and row[platform_index] in platform_sheets:
+            platform_sheets[row[platform_index]].append(values)
+
+    workbook.save(filename)
+    return filename
@@ -0,0 +1,160 @@
+"""
+Export Manager - Serialize each export format once and publish the "latest" aliases
+Full saves write one file per format and point the latest names at them (keeping history
+as delta snapshots, or as timestamped copies). Periodic and per-cycle saves only touch the
+records added since the previous save: they are appended to a line-delimited journal and,
+with snapshots on, hashed into a delta.
+"""
+
+import os
+import shutil
+from datetime import datetime
+from json_records import dumps, loads, read_metadata
+from snapshot_store import SnapshotStore
+
+# File name suffix of each format produced by UniversalAggregator.export_all_formats
+FORMAT_SUFFIXES = {
+    'csv': '.csv',
+    'excel': '.xlsx',
+    'json': '.json',
+    'pdf': '_report.pdf',
+}
+
+# First journal line: the full JSON export (by its metadata date) the entries come after
+JOURNAL_HEADER = 'journal_after'
+
+def publish_alias(source, alias):
+    """Point an alias at an exported file (hard link, or copy where links are unsupported)"""
+    temp_file = f"{alias}.tmp"
+    try:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        os.link(source, temp_file)
+    except OSError:
+        shutil.copy2(source, temp_file)
+    # Readers see either the old file or the new one, never a partial write
+    os.replace(temp_file, alias)
+    return alias
+
+class ExportManager:
+    def __init__(self, aggregator, snapshot_dir=None):
+        self.aggregator = aggregator
+        self.exported_count = 0  # records already covered by a full export or the journal
+        self.export_id = None  # metadata date of the last full JSON export
+        self.snapshot_count = 0  # records already hashed into a snapshot delta
+        # With snapshots, history is kept as deltas instead of timestamped full exports
+        self.snapshots = SnapshotStore(snapshot_dir) if snapshot_dir else None
+
+    def journal_filename(self, base_filename):
+        return f"{base_filename}_journal.jsonl"
+
+    def mark_exported(self):
+        """Treat every current record as saved (e.g. right after loading existing data)"""
+        self.exported_count = len(self.aggregator.all_data)
+        # A full export is always snapshotted too, so its records need no re-hashing
+        if self.snapshots and self.snapshots.snapshot_files():
+            self.snapshot_count = self.exported_count
+
+    def export(self, base_filename, formats=None):
+        """Full save: every format serialized once, then the latest aliases published"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        files = self.aggregator.export_all_formats(f"{base_filename}_{timestamp}", formats)
+
+        for export_format, path in list(files.items()):
+            alias = f"{base_filename}{FORMAT_SUFFIXES[export_format]}"
+            if self.snapshots:
+                os.replace(path, alias)
+                files[export_format] = alias
+            else:
+                publish_alias(path, alias)
+
+        if 'json' in files:
+            self.export_id = read_metadata(files['json']).get('scraped_date')
+
+        if self.snapshots:
+            snapshot = self.snapshot_new_records()
+            if snapshot:
+                files['snapshot'] = snapshot
+
+        # The full export covers everything the journal held
+        journal = self.journal_filename(base_filename)
+        if os.path.exists(journal):
+            os.remove(journal)
+        self.mark_exported()
+        return files
+
+    def snapshot_new_records(self):
+        """Delta-snapshot only the records added since the previous delta"""
+        records = self.aggregator.all_data
+        if self.snapshot_count > len(records):  # records were replaced
+            self.snapshot_count = 0
+        snapshot = self.snapshots.write_delta(records[self.snapshot_count:])
+        self.snapshot_count = len(records)
+        return snapshot
+
+    def checkpoint(self, base_filename):
+        """Cheap save: journal and snapshot the new records, leaving the full exports alone"""
+        files = {'journal': self.append_journal(base_filename)}
+        if self.snapshots:
+            snapshot = self.snapshot_new_records()
+            if snapshot:
+                files['snapshot'] = snapshot
+        return files
+
+    def append_journal(self, base_filename):
+        """Periodic save: append only the records added since the last save"""
+        records = self.aggregator.all_data
+        if self.exported_count > len(records):  # records were replaced
+            self.exported_count = 0
+
+        journal = self.journal_filename(base_filename)
+        new_records = records[self.exported_count:]
+        is_new = not os.path.exists(journal)
+        with open(journal, 'a', encoding='utf-8') as f:
+            if is_new:
+                f.write(dumps({JOURNAL_HEADER: self.export_id}) + "\n")
+            for record in new_records:
+                f.write(dumps(dict(record)) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.exported_count = len(records)
+        print(f"✓ Journaled {len(new_records)} new records to {journal}")
+        return journal
+
+    def replay_journal(self, base_filename, export_file=None):
+        """Re-add the records journaled after the loaded full export, then fold them into a new one"""
+        if export_file and os.path.exists(export_file):
+            self.export_id = read_metadata(export_file).get('scraped_date')
+
+        journal = self.journal_filename(base_filename)
+        if not os.path.exists(journal):
+            return 0
+
+        after = None
+        records = []
+        with open(journal, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = loads(line)
+                except ValueError:
+                    break  # the last save was interrupted mid-line
+                if JOURNAL_HEADER in entry:
+                    after = entry[JOURNAL_HEADER]
+                else:
+                    records.append(entry)
+
+        if after != self.export_id:
+            # The journal predates the export (crash between export and cleanup)
+            print(f"⚠ Discarding {journal}: already covered by the last full export")
+            os.remove(journal)
+            return 0
+
+        self.aggregator.add_records(records)
+        print(f"✓ Recovered {len(records)} records from {journal}")
+        if records:
+            # The full export removes the journal once the records are safely on disk
+            self.export(base_filename)
+        else:
+            os.remove(journal)
+        return len(records)
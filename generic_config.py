@@ -233,8 +233,27 @@ SCRAPER_SETTINGS = {
     "max_results_per_platform": 100,
     "headless": True,
     "timeout": 30,
-    "retry_attempts": 3,
+    "retry_attempts": 3,  # Retries of transient failures (timeouts, 429, 5xx) per request/page load
+    "retry_backoff_base": 1,  # seconds; doubled on each retry, with jitter
+    "retry_backoff_max": 30,
+    "circuit_breaker_threshold": 5,  # Consecutive failures before a host is skipped
+    "circuit_breaker_reset": 120,  # seconds before a skipped host is tried again
+    "user_agent_rotation": "request",  # "request" or "session"; Chrome drivers get one per browser
+    "http_pool_hosts": 20,  # Hosts with pooled keep-alive connections
+    "http_pool_per_host": 10,  # Connections kept per host
+    "http2": False,  # HTTP/2 for HTTPS requests (needs httpx[http2])
+    "http_max_body_bytes": 5 * 1024 * 1024,  # Larger pages are cut off instead of downloaded
     "concurrent_requests": 1,  # Set to 1 to avoid being blocked
+    "worker_processes": 1,  # >1 scrapes (category, platform) jobs in parallel processes
+    "work_queue_file": "work_queue.db",
+    "job_lease_seconds": 600,  # A lease not renewed for this long is handed to another worker
+    "job_max_attempts": 3,  # Claims (including expired leases) before a job is marked failed
+    "compact_records": False,  # Column-oriented record storage for very large runs
+    "streaming_excel": True,  # Write Excel sheets row by row instead of via DataFrames
+    "pdf_workers": 4,  # Processes rendering per-category PDF reports
+    "delta_snapshots": True,  # Keep auto-update history as deltas instead of timestamped exports
+    "snapshot_dir": "snapshots",
+    "metrics_report": "scraper_metrics",  # Timing/counter report written after each run (.json/.prom)
     "save_images": False,
     "save_videos": False,
     "output_format": ["csv", "json", "excel"],
@@ -244,6 +263,25 @@ SCRAPER_SETTINGS = {
     ]
 }
 
+# ============================================================================
+# REFRESH SCHEDULING (continuous mode)
+# ============================================================================
+
+REFRESH_SETTINGS = {
+    "cycle_minutes": 60,  # How often the scheduler checks for due categories
+    "cycle_budget": 10,  # Max categories re-scraped per cycle
+    "min_interval_hours": 1,
+    "max_interval_hours": 24 * 30,
+    # Starting interval relative to the update interval; volatile platforms refresh sooner
+    "platform_factors": {
+        "youtube": 0.25,
+        "tiktok": 0.25,
+        "google": 1,
+        "wikipedia": 7,
+    },
+    "state_file": "refresh_schedule.json",
+}
+
 # ============================================================================
 # COUNTRIES & LANGUAGES
 # ============================================================================
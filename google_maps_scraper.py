@@ -2,7 +2,6 @@
 Google Maps Scraper for Hospitals and Clinics in Pakistan
 """
 
-import time
 import re
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -12,16 +11,19 @@ from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 import undetected_chromedriver as uc
-from fake_useragent import UserAgent
+from user_agents import apply_browser_profile
 import pandas as pd
+from retry_engine import load_page
+from instrumentation import pause, timer
+from profiler import category_boundary
 from config import CATEGORIES, CITIES, DATA_FIELDS
 
 class GoogleMapsScraper:
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, checkpoint=None):
         self.headless = headless
         self.driver = None
-        self.ua = UserAgent()
         self.data = []
+        self.checkpoint = checkpoint
         
     def init_driver(self):
         """Initialize Chrome driver with anti-detection measures"""
@@ -31,7 +33,7 @@ class GoogleMapsScraper:
                 options.add_argument('--headless')
             options.add_argument('--no-sandbox')
             options.add_argument('--disable-dev-shm-usage')
-            options.add_argument(f'user-agent={self.ua.random}')
+            apply_browser_profile(options)
             options.add_argument('--disable-blink-features=AutomationControlled')
             options.add_experimental_option("excludeSwitches", ["enable-automation"])
             options.add_experimental_option('useAutomationExtension', False)
@@ -47,8 +49,8 @@ class GoogleMapsScraper:
         """Search for locations on Google Maps"""
         try:
             search_url = f"https://www.google.com/maps/search/{query.replace(' ', '+')}"
-            self.driver.get(search_url)
-            time.sleep(3)
+            load_page(self.driver, search_url)
+            pause(3)
             
             # Scroll to load more results
             scrollable_div = self.driver.find_element(By.CSS_SELECTOR, "div[role='feed']")
@@ -57,13 +59,14 @@ class GoogleMapsScraper:
                     'arguments[0].scrollTop = arguments[0].scrollHeight',
                     scrollable_div
                 )
-                time.sleep(2)
+                pause(2)
             
             return True
         except Exception as e:
             print(f"Error searching location: {e}")
             return False
     
+    @timer('extract')
     def extract_business_info(self, element):
         """Extract business information from a listing element"""
         try:
@@ -71,7 +74,7 @@ class GoogleMapsScraper:
             
             # Click on the listing to get details
             element.click()
-            time.sleep(2)
+            pause(2)
             
             # Extract name
             try:
@@ -128,7 +131,7 @@ class GoogleMapsScraper:
             try:
                 close_button = self.driver.find_element(By.CSS_SELECTOR, "button[aria-label='Close']")
                 close_button.click()
-                time.sleep(1)
+                pause(1)
             except:
                 pass
             
@@ -138,14 +141,26 @@ class GoogleMapsScraper:
             print(f"Error extracting business info: {e}")
             return None
     
-    def scrape_category(self, category_name, search_query):
-        """Scrape all listings for a specific category"""
+    def scrape_category(self, category_name, search_query, on_listing=None):
+        """Scrape all listings for a specific category
+        on_listing: optional callback invoked with each listing as soon as it is extracted
+        """
         print(f"\nScraping {category_name}...")
         
+        results = []
+        seen_keys = set()
+        if self.checkpoint:
+            # Listings saved before an interruption are skipped on resume
+            results = self.checkpoint.get_listings(search_query)
+            seen_keys = {self.checkpoint.listing_key(r) for r in results}
+            if on_listing:
+                for listing in results:
+                    on_listing(listing)
+        
         if not self.search_location(search_query):
-            return []
+            # Keep what earlier runs found; the query stays unfinished for the next --resume
+            return results
         
-        results = []
         try:
             # Find all listing elements
             listings = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/maps/place/']")
@@ -157,21 +172,32 @@ class GoogleMapsScraper:
                     url = listing.get_attribute('href')
                     if url and url not in seen_urls and '/maps/place/' in url:
                         seen_urls.add(url)
-                        unique_listings.append(listing)
+                        unique_listings.append((url, listing))
                 except:
                     continue
             
             print(f"Found {len(unique_listings)} listings for {category_name}")
             
             # Extract info from each listing
-            for i, listing in enumerate(unique_listings[:50]):  # Limit to 50 per category
+            for i, (url, listing) in enumerate(unique_listings[:50]):  # Limit to 50 per category
                 try:
+                    # Skip listings already checkpointed before clicking through to them
+                    if self.checkpoint and self.checkpoint.listing_key({'google_maps_url': url}) in seen_keys:
+                        continue
                     print(f"Processing {i+1}/{min(len(unique_listings), 50)}: {category_name}")
                     info = self.extract_business_info(listing)
                     if info:
                         info['category'] = category_name
+                        if self.checkpoint:
+                            key = self.checkpoint.listing_key(info)
+                            if key in seen_keys:
+                                continue
+                            seen_keys.add(key)
+                            self.checkpoint.save_listing(search_query, info)
                         results.append(info)
-                    time.sleep(2)
+                        if on_listing:
+                            on_listing(info)
+                    pause(2)
                 except Exception as e:
                     print(f"Error processing listing {i+1}: {e}")
                     continue
@@ -179,10 +205,15 @@ class GoogleMapsScraper:
         except Exception as e:
             print(f"Error scraping category {category_name}: {e}")
         
+        if self.checkpoint and results:
+            self.checkpoint.mark_query_done(search_query)
+        category_boundary(f"{category_name}: {search_query}")
         return results
     
-    def scrape_all(self):
-        """Scrape all categories"""
+    def scrape_all(self, on_listing=None):
+        """Scrape all categories
+        on_listing: optional callback invoked with each listing as soon as it is extracted
+        """
         if not self.init_driver():
             return []
         
@@ -192,9 +223,18 @@ class GoogleMapsScraper:
             for category_key, search_query in CATEGORIES.items():
                 for city in CITIES[:3]:  # Limit to first 3 cities for now
                     query = f"{search_query} {city}"
-                    results = self.scrape_category(category_key, query)
+                    if self.checkpoint and self.checkpoint.is_query_done(query):
+                        results = self.checkpoint.get_listings(query)
+                        print(f"✓ Resumed {len(results)} listings for {query} from checkpoint")
+                        all_results.extend(results)
+                        if on_listing:
+                            for listing in results:
+                                on_listing(listing)
+                        continue
+                    
+                    results = self.scrape_category(category_key, query, on_listing)
                     all_results.extend(results)
-                    time.sleep(5)  # Delay between cities
+                    pause(5)  # Delay between cities
         except Exception as e:
             print(f"Error in scrape_all: {e}")
         finally:
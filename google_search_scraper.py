@@ -10,14 +10,15 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import undetected_chromedriver as uc
-from fake_useragent import UserAgent
+from user_agents import apply_browser_profile
 from generic_config import SCRAPER_SETTINGS, CONTENT_FILTER
+from retry_engine import load_page
+from instrumentation import pause, timer
 
 class GoogleSearchScraper:
     def __init__(self, headless=True):
         self.headless = headless
         self.driver = None
-        self.ua = UserAgent()
         
     def init_driver(self):
         """Initialize Chrome driver"""
@@ -27,7 +28,7 @@ class GoogleSearchScraper:
                 options.add_argument('--headless')
             options.add_argument('--no-sandbox')
             options.add_argument('--disable-dev-shm-usage')
-            options.add_argument(f'user-agent={self.ua.random}')
+            apply_browser_profile(options)
             options.add_argument('--disable-blink-features=AutomationControlled')
             
             self.driver = uc.Chrome(options=options, version_main=None)
@@ -37,6 +38,7 @@ class GoogleSearchScraper:
             print(f"Error initializing driver: {e}")
             return False
     
+    @timer('filter')
     def should_block_content(self, title, description):
         """Check if content should be blocked"""
         if not CONTENT_FILTER.get("enabled"):
@@ -76,8 +78,8 @@ class GoogleSearchScraper:
             else:
                 search_url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
             
-            self.driver.get(search_url)
-            time.sleep(3)
+            load_page(self.driver, search_url)
+            pause(3)
             
             results = []
             
@@ -96,6 +98,7 @@ class GoogleSearchScraper:
             print(f"Error searching Google: {e}")
             return []
     
+    @timer('extract')
     def scrape_web_results(self, max_results=50):
         """Scrape regular web search results"""
         results = []
@@ -152,6 +155,7 @@ class GoogleSearchScraper:
         
         return results
     
+    @timer('extract')
     def scrape_images(self, max_results=50):
         """Scrape image search results"""
         results = []
@@ -159,7 +163,7 @@ class GoogleSearchScraper:
             # Scroll to load more images
             for _ in range(3):
                 self.driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight);")
-                time.sleep(2)
+                pause(2)
             
             image_elements = self.driver.find_elements(By.CSS_SELECTOR, "img[data-src], img[src]")
             
@@ -190,6 +194,7 @@ class GoogleSearchScraper:
         
         return results
     
+    @timer('extract')
     def scrape_videos(self, max_results=50):
         """Scrape video search results"""
         results = []
@@ -246,6 +251,7 @@ class GoogleSearchScraper:
         
         return results
     
+    @timer('extract')
     def scrape_news(self, max_results=50):
         """Scrape news search results"""
         results = []
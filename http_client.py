@@ -0,0 +1,263 @@
+"""
+HTTP Client - Shared, pooled HTTP session for the requests-based scrapers
+One RetrySession per process keeps connections alive across scraper instances, with pools
+sized for many requests to the same host (e.g. Wikipedia). fetch() streams bodies and stops
+at a size cap so an oversized page cannot stall enrichment; iter_capped() lets callers
+stop reading even earlier. With "http2" enabled and
+httpx[http2] installed, HTTPS requests go over HTTP/2 (proxied requests stay on HTTP/1.1).
+"""
+
+import codecs
+import os
+import re
+import ssl
+import threading
+import time
+from http.client import HTTPMessage
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.cookies import extract_cookies_to_jar
+from requests.structures import CaseInsensitiveDict
+from requests.utils import DEFAULT_CA_BUNDLE_PATH, get_encoding_from_headers, select_proxy
+from generic_config import SCRAPER_SETTINGS
+from instrumentation import count
+from retry_engine import RetrySession
+
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+CHUNK_SIZE = 64 * 1024
+
+HTML_TYPES = ('text/html', 'application/xhtml+xml')
+# Types servers send when they do not know better; the first bytes decide for these
+GENERIC_TYPES = ('', 'text/plain', 'application/octet-stream')
+HTML_MARKERS = (b'<!doctype html', b'<html', b'<head', b'<body', b'<meta', b'<title')
+META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_.:-]+)', re.I)
+
+def accept_encoding():
+    """Encodings this process can decode (brotli only if a brotli package is installed)"""
+    encodings = ['gzip', 'deflate']
+    try:
+        import brotli  # noqa: F401
+        encodings.append('br')
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            encodings.append('br')
+        except ImportError:
+            pass
+    return ', '.join(encodings)
+
+def ssl_context(verify, cert):
+    """SSL context for requests' verify (bool or CA bundle/directory) and cert (file or (cert, key))"""
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    elif isinstance(verify, str):
+        context = ssl.create_default_context(**{'capath' if os.path.isdir(verify) else 'cafile': verify})
+    else:
+        context = ssl.create_default_context(cafile=DEFAULT_CA_BUNDLE_PATH)
+    if cert:
+        context.load_cert_chain(*cert) if isinstance(cert, tuple) else context.load_cert_chain(cert)
+    return context
+
+class NoCookiePolicy(DefaultCookiePolicy):
+    """Keeps httpx from storing cookies; the requests session's jar owns them"""
+    def set_ok(self, cookie, request):
+        return False
+
+class HTTPXOriginalResponse:
+    """Stand-in for the http.client response requests reads Set-Cookie headers from"""
+    def __init__(self, headers):
+        self.msg = HTTPMessage()
+        for name, value in headers.multi_items():
+            self.msg[name] = value
+
+class HTTPXBody:
+    """The parts of urllib3's raw response that requests uses, over a streamed httpx response"""
+    def __init__(self, response):
+        self.response = response
+        self._original_response = HTTPXOriginalResponse(response.headers)
+
+    def stream(self, chunk_size, decode_content=True):
+        try:
+            yield from self.response.iter_bytes(chunk_size)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(e)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e)
+
+    def read(self, amt=None, decode_content=True):
+        return self.response.read()
+
+    def close(self):
+        self.response.close()
+
+    def release_conn(self):
+        self.response.close()
+
+class HTTPXAdapter(BaseAdapter):
+    """requests transport adapter sending through an HTTP/2-capable httpx client"""
+    def __init__(self, max_connections, max_keepalive, fallback=None):
+        super().__init__()
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive)
+        self.clients = {}  # (verify, cert) -> httpx.Client
+        self.lock = threading.Lock()
+        # Proxied requests go through the HTTP/1.1 adapter, which handles requests' proxy settings
+        self.fallback = fallback or HTTPAdapter(max_retries=0)
+
+    def get_client(self, verify, cert):
+        """One pooled client per TLS configuration (normally just the default one)"""
+        key = (verify, cert)
+        with self.lock:
+            if key not in self.clients:
+                self.clients[key] = httpx.Client(
+                    http2=True,
+                    verify=ssl_context(verify, cert),
+                    follow_redirects=False,  # requests handles redirects itself
+                    cookies=CookieJar(NoCookiePolicy()),
+                    limits=self.limits,
+                )
+            return self.clients[key]
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if proxies and select_proxy(request.url, proxies):
+            return self.fallback.send(request, stream=stream, timeout=timeout, verify=verify,
+                                      cert=cert, proxies=proxies)
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        try:
+            client = self.get_client(verify, cert)
+            httpx_request = client.build_request(
+                request.method, request.url, headers=dict(request.headers), content=request.body,
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            )
+            httpx_response = client.send(httpx_request, stream=True)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=request)
+
+        response = requests.Response()
+        response.status_code = httpx_response.status_code
+        response.headers = CaseInsensitiveDict(httpx_response.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = httpx_response.reason_phrase
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.raw = HTTPXBody(httpx_response)
+        extract_cookies_to_jar(response.cookies, request, response.raw)
+        return response
+
+    def close(self):
+        with self.lock:
+            for client in self.clients.values():
+                client.close()
+            self.clients = {}
+        self.fallback.close()
+
+def create_session(http2=None):
+    """A RetrySession with tuned connection pools (and HTTP/2 for HTTPS if enabled)"""
+    session = RetrySession()
+    hosts = SCRAPER_SETTINGS.get('http_pool_hosts', 20)
+    per_host = SCRAPER_SETTINGS.get('http_pool_per_host', 10)
+    # Retries are done by RetrySession, not by urllib3
+    adapter = HTTPAdapter(pool_connections=hosts, pool_maxsize=per_host, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    http2 = SCRAPER_SETTINGS.get('http2', False) if http2 is None else http2
+    if http2:
+        try:
+            if not HAS_HTTPX:
+                raise ImportError("httpx is not installed")
+            session.mount('https://', HTTPXAdapter(hosts * per_host, per_host, fallback=adapter))
+        except ImportError as e:
+            print(f"HTTP/2 unavailable ({e}; pip install 'httpx[http2]'), using HTTP/1.1")
+
+    session.headers['Accept-Encoding'] = accept_encoding()
+    return session
+
+_session = None
+_session_lock = threading.Lock()
+
+def shared_session():
+    """The process-wide session; connections are reused across scraper instances"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+    return _session
+
+def iter_capped(response, max_bytes, max_seconds=None, chunk_size=CHUNK_SIZE):
+    """Yield a streamed response's (decoded) body, stopping after max_bytes or max_seconds
+    Sets response.truncated when the body was cut off; the response is closed when done.
+    """
+    deadline = time.monotonic() + max_seconds if max_seconds else None
+    size = 0
+    response.truncated = False
+    try:
+        for chunk in response.iter_content(chunk_size):
+            if size + len(chunk) > max_bytes:
+                response.truncated = True
+                yield chunk[:max_bytes - size]
+                break
+            size += len(chunk)
+            yield chunk
+            if deadline and time.monotonic() > deadline:
+                response.truncated = True
+                break
+    finally:
+        # A partly read body cannot go back to the pool; closing discards that connection
+        response.close()
+
+def read_capped(response, max_bytes):
+    """Read a streamed response's (decoded) body, stopping after max_bytes
+    Sets response.truncated; the body is then available as response.content/text as usual.
+    """
+    response._content = b''.join(iter_capped(response, max_bytes))
+    response._content_consumed = True
+    return response
+
+def sniff_html(content_type, head):
+    """Whether a body is HTML, by its Content-Type or, if that is missing or generic, its first bytes"""
+    mime = (content_type or '').split(';')[0].strip().lower()
+    if mime in HTML_TYPES:
+        return True
+    if mime not in GENERIC_TYPES or b'\x00' in head[:1024]:
+        return False
+    start = head[:1024].lstrip(b'\xef\xbb\xbf \t\r\n').lower()
+    return any(marker in start for marker in HTML_MARKERS)
+
+def html_encoding(response, head):
+    """Charset from the Content-Type header, else from a <meta> tag in the first bytes, else UTF-8"""
+    encoding = None
+    if 'charset=' in response.headers.get('Content-Type', '').lower():
+        encoding = response.encoding
+    else:
+        match = META_CHARSET.search(head[:4096])
+        if match:
+            encoding = match.group(1).decode('ascii')
+    try:
+        return codecs.lookup(encoding).name if encoding else 'utf-8'
+    except LookupError:
+        return 'utf-8'
+
+def fetch(url, session=None, max_bytes=None, **kwargs):
+    """GET url with the shared session, reading at most max_bytes of the body"""
+    session = session or shared_session()
+    max_bytes = max_bytes or SCRAPER_SETTINGS.get('http_max_body_bytes', 5 * 1024 * 1024)
+    kwargs.setdefault('timeout', SCRAPER_SETTINGS['timeout'])
+    response = session.get(url, stream=True, **kwargs)
+    read_capped(response, max_bytes)
+    count('bytes', len(response.content))
+    if response.truncated:
+        count('truncated_bodies')
+        print(f"  ⚠ Body of {url} cut off at {max_bytes // 1024} KB")
+    return response
@@ -0,0 +1,172 @@
+"""
+Instrumentation - Lightweight timers, counters and histograms for scraper runs
+Timers wrap page loads, sleeps, parsing, extraction, filtering and exports; at the end of a
+run write_report() prints a summary table and writes JSON and Prometheus-text files, so it
+is clear whether Chrome, sleeps or parsing dominate.
+"""
+
+import json
+import re
+import threading
+import time
+from contextlib import ContextDecorator
+
+# Upper bounds (seconds) of the duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60)
+
+# Multiplier for pause(); benchmarks set it to 0 to measure work rather than politeness delays
+_sleep_scale = 1.0
+
+class Histogram:
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+                break
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'mean': self.total / self.count if self.count else 0,
+            'min': self.min,
+            'max': self.max,
+            'buckets': dict(zip(map(str, self.buckets), self.bucket_counts)),
+        }
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.counters = {}
+            self.histograms = {}
+            self.started = time.time()
+
+    def count(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, value):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(value)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'wall_time': time.time() - self.started,
+                'counters': dict(self.counters),
+                'timers': {name: h.to_dict() for name, h in self.histograms.items()},
+            }
+
+    def summary_table(self):
+        data = self.snapshot()
+        wall = data['wall_time']
+        lines = [f"{'Timer':<28}{'Count':>8}{'Total s':>11}{'Avg ms':>10}{'Max ms':>10}{'% wall':>8}"]
+        for name, timer_data in sorted(data['timers'].items(), key=lambda x: x[1]['sum'], reverse=True):
+            lines.append(
+                f"{name:<28}{timer_data['count']:>8}{timer_data['sum']:>11.2f}"
+                f"{timer_data['mean'] * 1000:>10.1f}{(timer_data['max'] or 0) * 1000:>10.1f}"
+                f"{(timer_data['sum'] / wall * 100 if wall else 0):>7.1f}%"
+            )
+        if data['counters']:
+            lines.append("")
+            lines.append(f"{'Counter':<28}{'Value':>12}")
+            for name, value in sorted(data['counters'].items()):
+                lines.append(f"{name:<28}{value:>12}")
+        lines.append(f"\nWall time: {wall:.1f}s (timers can overlap across threads)")
+        return "\n".join(lines)
+
+    def to_prometheus(self, prefix='scraper'):
+        data = self.snapshot()
+        lines = []
+        for name, value in sorted(data['counters'].items()):
+            metric = f"{prefix}_{metric_name(name)}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, timer_data in sorted(data['timers'].items()):
+            metric = f"{prefix}_{metric_name(name)}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, bucket_count in timer_data['buckets'].items():
+                cumulative += bucket_count
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {timer_data["count"]}')
+            lines.append(f"{metric}_sum {timer_data['sum']}")
+            lines.append(f"{metric}_count {timer_data['count']}")
+        return "\n".join(lines) + "\n"
+
+def metric_name(name):
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+METRICS = Metrics()
+
+def count(name, value=1):
+    """Increment a counter (pages, records, bytes, errors, ...)"""
+    METRICS.count(name, value)
+
+def observe(name, value):
+    """Add a value (seconds) to a histogram"""
+    METRICS.observe(name, value)
+
+class timer(ContextDecorator):
+    """Time a block (`with timer('parse'):`) or a function (`@timer('extract')`)"""
+    def __init__(self, name):
+        self.name = name
+        self.local = threading.local()
+
+    def __enter__(self):
+        # Per-thread start times so one decorated function can run in several threads
+        starts = getattr(self.local, 'starts', None)
+        if starts is None:
+            starts = self.local.starts = []
+        starts.append(time.perf_counter())
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.name, time.perf_counter() - self.local.starts.pop())
+        if exc_type is not None:
+            count(f"{self.name}.errors")
+        return False
+
+def pause(seconds, name='sleep'):
+    """time.sleep that is accounted for in the timings"""
+    with timer(name):
+        time.sleep(seconds * _sleep_scale)
+
+def set_sleep_scale(scale):
+    """Scale every pause() (0 disables them, e.g. for offline benchmarks)"""
+    global _sleep_scale
+    _sleep_scale = scale
+
+def write_report(basename='scraper_metrics', quiet=False):
+    """Print the summary table and write <basename>.json and <basename>.prom"""
+    if not quiet:
+        print("\n" + "=" * 70)
+        print("⏱  TIMING & THROUGHPUT")
+        print("=" * 70)
+        print(METRICS.summary_table())
+
+    with open(f"{basename}.json", 'w', encoding='utf-8') as f:
+        json.dump(METRICS.snapshot(), f, indent=2)
+    with open(f"{basename}.prom", 'w', encoding='utf-8') as f:
+        f.write(METRICS.to_prometheus())
+    if not quiet:
+        print(f"✓ Metrics saved: {basename}.json, {basename}.prom")
+    return f"{basename}.json", f"{basename}.prom"
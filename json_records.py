@@ -0,0 +1,74 @@
+"""
+JSON Records - Streaming export and lazy loading of large scraped datasets
+Files stay valid JSON ({"metadata": ..., "data": [...]}), but the metadata sits alone on
+the first line and every record on its own line, so readers can get the metadata without
+parsing the records and iterate records one at a time.
+"""
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+METADATA_PREFIX = '{"metadata": '
+DATA_START = '"data": ['
+DATA_END = ']}'
+
+def dumps(value):
+    """Compact single-line JSON (orjson when installed)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode('utf-8')
+        except TypeError:
+            pass  # e.g. non-string keys; the standard library handles these
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+def loads(text):
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+def write_records(filename, metadata, records):
+    """Write metadata and records as line-delimited JSON, replacing the file atomically"""
+    temp_file = f"{filename}.tmp"
+    count = 0
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        f.write(f"{METADATA_PREFIX}{dumps(metadata)},\n{DATA_START}\n")
+        for record in records:
+            if count:
+                f.write(",\n")
+            f.write(dumps(dict(record)))
+            count += 1
+        f.write(f"\n{DATA_END}\n")
+    os.replace(temp_file, filename)
+    return count
+
+def _is_streamed(first_line):
+    return first_line.startswith(METADATA_PREFIX) and first_line.rstrip().endswith(',')
+
+def read_metadata(filename):
+    """Return a file's metadata, reading only its first line when possible"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        first_line = f.readline()
+        if _is_streamed(first_line):
+            return loads(first_line.rstrip()[len(METADATA_PREFIX):-1])
+        # Older indented exports: the whole document has to be parsed
+        f.seek(0)
+        return json.load(f).get('metadata', {})
+
+def iter_records(filename):
+    """Yield the records of a file one at a time"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        first_line = f.readline()
+        if not _is_streamed(first_line):
+            f.seek(0)
+            yield from json.load(f).get('data', [])
+            return
+        for line in f:
+            line = line.rstrip()
+            if not line or line == DATA_START:
+                continue
+            if line == DATA_END:
+                break
+            yield loads(line[:-1] if line.endswith(',') else line)
@@ -3,82 +3,117 @@ Main script to run the comprehensive Pakistan Hospital/Clinic Scraper
 """
 
 import time
+import argparse
 from google_maps_scraper import GoogleMapsScraper
 from website_scraper import WebsiteScraper
 from social_media_scraper import SocialMediaScraper
 from data_aggregator import DataAggregator
+from checkpoint_store import CheckpointStore
+from enrichment_pipeline import (EnrichmentPipeline, enrich_website, enrich_social,
+                                 enrich_discovered_website, has_website)
 from config import SCRAPER_SETTINGS
+from instrumentation import write_report
+from profiler import run_profiled
 
-def main():
-    print("=" * 60)
-    print("PAKISTAN HOSPITALS & CLINICS DATA SCRAPER")
-    print("=" * 60)
-    print("\nThis scraper will collect data from:")
-    print("  ✓ Google Maps")
-    print("  ✓ Hospital/Clinic Websites")
-    print("  ✓ Facebook Pages")
-    print("  ✓ Instagram Pages")
-    print("  ✓ TikTok Pages")
-    print("\n" + "=" * 60 + "\n")
-    
-    # Initialize scrapers
-    print("Initializing scrapers...")
-    google_scraper = GoogleMapsScraper(headless=SCRAPER_SETTINGS['headless'])
-    website_scraper = WebsiteScraper()
-    social_scraper = SocialMediaScraper(headless=SCRAPER_SETTINGS['headless'])
-    aggregator = DataAggregator()
-    
+def enrich_listing(listing, website_scraper, social_scraper, checkpoint):
+    """Run website and social enrichment for a listing, skipping checkpointed steps"""
+    had_website = has_website(listing)
+    website_data = enrich_website(listing, website_scraper, checkpoint)
+    social_data = enrich_social(listing, social_scraper, checkpoint)
+    # Social discovery may have found the website the listing was missing
+    website_data = enrich_discovered_website(listing, website_data, website_scraper, had_website, checkpoint)
+    return website_data, social_data
+
+def run_serial(google_scraper, website_scraper, social_scraper, aggregator, checkpoint):
+    """Scrape Google Maps to completion, then enrich each listing in turn"""
     # Step 1: Scrape Google Maps
     print("\n" + "=" * 60)
     print("STEP 1: Scraping Google Maps...")
     print("=" * 60)
     google_results = google_scraper.scrape_all()
     print(f"\n✓ Found {len(google_results)} listings from Google Maps")
-    
+
     if not google_results:
-        print("No results from Google Maps. Exiting.")
         return
-    
+
     # Step 2: Scrape websites and social media for each listing
     print("\n" + "=" * 60)
     print("STEP 2: Enriching data from websites and social media...")
     print("=" * 60)
-    
+
     total = len(google_results)
     for idx, listing in enumerate(google_results, 1):
         print(f"\n[{idx}/{total}] Processing: {listing.get('name', 'Unknown')}")
-        
-        # Scrape website
-        website_data = {}
-        if listing.get('website') and listing['website'] != "N/A":
-            website_data = website_scraper.scrape_website(listing['website'])
-            time.sleep(SCRAPER_SETTINGS['delay_between_requests'])
-        
-        # Scrape social media
-        business_name = listing.get('name', '')
-        location = listing.get('address', '')
-        social_data = social_scraper.scrape_all_social_media(
-            business_name, 
-            location, 
-            listing
-        )
-        time.sleep(SCRAPER_SETTINGS['delay_between_requests'])
-        
+    
+        website_data, social_data = enrich_listing(listing, website_scraper, social_scraper, checkpoint)
+    
         # Merge all data
         merged_record = aggregator.merge_data(listing, website_data, social_data)
         aggregator.add_record(merged_record)
-        
+    
         print(f"  ✓ Email: {merged_record.get('email', 'N/A')}")
         print(f"  ✓ Phone: {merged_record.get('phone', 'N/A')}")
         print(f"  ✓ Website: {merged_record.get('website', 'N/A')}")
         print(f"  ✓ Reviews: {merged_record.get('review_count', 'N/A')}")
-        
+    
         # Progress indicator
         if idx % 10 == 0:
             print(f"\n  Progress: {idx}/{total} completed ({idx*100//total}%)")
+
+def run_pipeline(google_scraper, aggregator, checkpoint):
+    """Run Maps, website and social stages concurrently"""
+    print("\n" + "=" * 60)
+    print("STEP 1+2: Scraping Google Maps and enriching listings (pipelined)...")
+    print("=" * 60)
     
-    # Close browser
-    social_scraper.close()
+    pipeline = EnrichmentPipeline(google_scraper, aggregator, checkpoint)
+    pipeline.run()
+    
+    print("\n" + "=" * 60)
+    print("PIPELINE STATISTICS")
+    print("=" * 60)
+    pipeline.print_statistics()
+    return aggregator.all_data
+
+def main(resume=False, pipeline=False):
+    print("=" * 60)
+    print("PAKISTAN HOSPITALS & CLINICS DATA SCRAPER")
+    print("=" * 60)
+    print("\nThis scraper will collect data from:")
+    print("  ✓ Google Maps")
+    print("  ✓ Hospital/Clinic Websites")
+    print("  ✓ Facebook Pages")
+    print("  ✓ Instagram Pages")
+    print("  ✓ TikTok Pages")
+    print("\n" + "=" * 60 + "\n")
+    
+    # Initialize scrapers
+    print("Initializing scrapers...")
+    checkpoint = CheckpointStore(SCRAPER_SETTINGS['checkpoint_file'], resume=resume)
+    if resume:
+        progress = checkpoint.get_statistics()
+        print(f"Resuming: {progress['listings']} listings and "
+              f"{sum(progress['steps'].values())} enrichment steps already saved")
+    google_scraper = GoogleMapsScraper(headless=SCRAPER_SETTINGS['headless'], checkpoint=checkpoint)
+    aggregator = DataAggregator()
+    
+    if pipeline:
+        # The pipeline's workers create their own website and social scrapers
+        run_pipeline(google_scraper, aggregator, checkpoint)
+    else:
+        website_scraper = WebsiteScraper()
+        social_scraper = SocialMediaScraper(headless=SCRAPER_SETTINGS['headless'])
+        try:
+            run_serial(google_scraper, website_scraper, social_scraper, aggregator, checkpoint)
+        finally:
+            # Close browser
+            social_scraper.close()
+            website_scraper.close()
+    checkpoint.close()
+    
+    if not aggregator.all_data:
+        print("No results from Google Maps. Exiting.")
+        return
     
     # Step 3: Export data
     print("\n" + "=" * 60)
@@ -105,6 +140,8 @@ def main():
         for cat, count in stats['categories'].items():
             print(f"  - {cat}: {count}")
     
+    write_report(SCRAPER_SETTINGS['metrics_report'])
+    
     print("\n" + "=" * 60)
     print("✓ SCRAPING COMPLETE!")
     print(f"✓ CSV file: {csv_file}")
@@ -112,10 +149,29 @@ def main():
     print("=" * 60)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pakistan Hospitals & Clinics Data Scraper")
+    parser.add_argument('--resume', action='store_true',
+                        help="Resume from the last checkpoint instead of starting over")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="Run Maps, website and social media stages concurrently")
+    parser.add_argument('--rescore', metavar='FILE',
+                        help="Recompute city and traffic estimates for an exported CSV/Excel file and exit")
+    parser.add_argument('--profile', action='store_true',
+                        help="Profile the run (cProfile, sampled flamegraph stacks, top allocations)")
+    args = parser.parse_args()
+    
+    if args.rescore:
+        DataAggregator().rescore_file(args.rescore)
+        raise SystemExit(0)
+    
     try:
-        main()
+        if args.profile:
+            run_profiled(main, resume=args.resume, pipeline=args.pipeline, prefix='hospitals_profile')
+        else:
+            main(resume=args.resume, pipeline=args.pipeline)
     except KeyboardInterrupt:
         print("\n\nScraping interrupted by user.")
+        print("Progress saved. Run again with --resume to continue.")
     except Exception as e:
         print(f"\n\nError occurred: {e}")
         import traceback
@@ -0,0 +1,158 @@
+"""
+Metric Parser - Normalize view, like and follower counts to numbers
+Handles "1.2M", "15,300", "500K views", "1,2 Mio.", "3.5 lakh", "2 crore", "1e5", etc.
+Fractions are rounded to the nearest integer (halves to even, like round()) for every
+kind of input, and parse_metrics gives the same results as parse_metric.
+"""
+
+import math
+import re
+from functools import lru_cache
+
+# numpy/pandas are only needed by the vectorized parsers; imported on first use
+np = pd = None
+
+def has_pandas():
+    """Import numpy and pandas if not done yet; False if they are not installed"""
+    global np, pd
+    if pd is None:
+        try:
+            import numpy
+            import pandas
+        except ImportError:
+            return False
+        np, pd = numpy, pandas
+    return True
+
+MULTIPLIERS = {
+    'k': 1_000, 'thousand': 1_000, 'tsd': 1_000,
+    'm': 1_000_000, 'mn': 1_000_000, 'million': 1_000_000, 'mio': 1_000_000,
+    'b': 1_000_000_000, 'bn': 1_000_000_000, 'billion': 1_000_000_000, 'mrd': 1_000_000_000,
+    'lakh': 100_000, 'lakhs': 100_000, 'lac': 100_000, 'lacs': 100_000,
+    'crore': 10_000_000, 'crores': 10_000_000, 'cr': 10_000_000,
+}
+
+# A whole value written in scientific notation, as floats are often stringified
+SCIENTIFIC_PATTERN = re.compile(r'\+?\d+(?:\.\d+)?e[+-]?\d+')
+
+METRIC_PATTERN = re.compile(
+    r'(\d[\d,.\s]*)\s*(' + '|'.join(sorted(MULTIPLIERS, key=len, reverse=True)) + r')?\.?(?![a-z])'
+)
+
+def _to_number(digits, has_suffix):
+    """Convert a digit string with locale-specific separators to a float"""
+    digits = re.sub(r'\s+', '', digits).rstrip('.,')
+
+    if ',' in digits and '.' in digits:
+        # Whichever separator comes last is the decimal point: "1,234.5" / "1.234,5"
+        if digits.rfind(',') > digits.rfind('.'):
+            digits = digits.replace('.', '').replace(',', '.')
+        else:
+            digits = digits.replace(',', '')
+    elif ',' in digits:
+        # "1,2 Mio" is a decimal comma; "15,300" and "12,34,567" are grouping
+        head, _, tail = digits.rpartition(',')
+        if has_suffix and digits.count(',') == 1 and len(tail) in (1, 2):
+            digits = f"{head}.{tail}"
+        else:
+            digits = digits.replace(',', '')
+    elif digits.count('.') > 1 or (not has_suffix and re.fullmatch(r'\d{1,3}\.\d{3}', digits)):
+        # "1.234.567" or a bare "1.234" count uses dots for grouping
+        digits = digits.replace('.', '')
+
+    return float(digits)
+
+def _round(value):
+    return int(round(value)) if math.isfinite(value) else None
+
+@lru_cache(maxsize=65536)
+def _parse_text(text):
+    text = text.lower().replace('\u00a0', ' ').replace('\u202f', ' ')
+    if SCIENTIFIC_PATTERN.fullmatch(text):
+        return _round(float(text))
+    match = METRIC_PATTERN.search(text)
+    if not match:
+        return None
+    suffix = match.group(2)
+    try:
+        value = _to_number(match.group(1), bool(suffix))
+    except ValueError:
+        return None
+    return _round(value * MULTIPLIERS.get(suffix, 1))
+
+def parse_metric(value, default=0):
+    """Parse a single count like '1.2M views' into an int (default if unparseable)"""
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        parsed = _round(value)  # None for NaN/inf
+    else:
+        parsed = _parse_text(str(value).strip())
+    return default if parsed is None else parsed
+
+def parse_metrics(values, default=0):
+    """Parse many counts at once
+    Returns a NumPy int64 array when pandas is available, otherwise a list.
+    Each distinct string is parsed only once, so repeated values cost a lookup.
+    """
+    if not has_pandas():
+        return [parse_metric(v, default) for v in values]
+
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values))
+    if pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype='int64')
+    if pd.api.types.is_numeric_dtype(series):
+        result = np.rint(series.to_numpy(dtype='float64', na_value=np.nan, copy=True))  # halves to even
+        result[~np.isfinite(result)] = default
+        return result.astype('int64')
+
+    result = np.full(len(series), np.nan)
+    present = series.notna().to_numpy()
+    text = series[present].astype(str).str.strip()
+
+    # Plain grouped integers ("15300", "15,300", "12,34,567") convert without the regex path;
+    # everything else (including "1e5", "-5", "inf") takes parse_metric's rules
+    grouped = text.str.fullmatch(r'\d+(?:,\d+)*').to_numpy(dtype=bool)
+    cleaned = pd.to_numeric(text[grouped].str.replace(',', '', regex=False), errors='coerce')
+    result[np.flatnonzero(present)[grouped]] = cleaned.to_numpy(dtype='float64', na_value=np.nan)
+
+    pending = np.isnan(result) & present
+    if pending.any():
+        # Factorize the original values so numbers and bools keep their type
+        codes, uniques = pd.factorize(series[pending])
+        parsed = np.array([parse_metric(u, default) for u in uniques], dtype='float64')
+        result[pending] = parsed[codes]
+
+    result[np.isnan(result)] = default
+    return result.astype('int64')
+
+_SUMMARY_ITEM = r'[^:,]+:\s*([^,]+(?:,\d{3}(?![\d.]))*)'
+# One "Platform: count" item, at the start or after the comma ending the previous one
+SUMMARY_ITEM_PATTERN = re.compile(r'(?:^|,\s*)' + _SUMMARY_ITEM)
+
+def parse_follower_summaries(values, default=0):
+    """Vectorized total of parse_follower_summary over a pandas Series"""
+    if not has_pandas():
+        return [sum(parse_follower_summary(v).values()) for v in values]
+
+    text = values.astype(object).where(values.notna(), '').astype(str).reset_index(drop=True)
+    # One entry per item, indexed by the row it came from; all counts are parsed in one batch
+    counts = text.str.findall(SUMMARY_ITEM_PATTERN).explode().dropna()
+    totals = np.zeros(len(values), dtype='int64')
+    np.add.at(totals, counts.index.to_numpy(dtype='int64'), parse_metrics(counts, default))
+    return totals
+
+def parse_follower_summary(text):
+    """Parse 'Facebook: 1200, Instagram: 3.4K' into {'Facebook': 1200, 'Instagram': 3400}"""
+    if not text:
+        return {}
+    followers = {}
+    for part in re.split(r',\s*(?=[A-Za-z][\w ]*:)', str(text)):
+        name, sep, count = part.partition(':')
+        if sep:
+            followers[name.strip()] = parse_metric(count)
+    return followers
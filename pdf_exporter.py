@@ -9,12 +9,48 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from generic_config import SCRAPER_SETTINGS
 import os
 
+# Fields shown under each sampled record, and how much of the data the report samples
+RECORD_FIELDS = ['platform', 'url', 'description', 'views', 'author']
+SAMPLE_FIELDS = ['title', 'name', 'category'] + RECORD_FIELDS
+MAX_REPORT_CATEGORIES = 10
+SAMPLE_RECORDS = 20
+
+def summarize_records(records, max_categories=None, sample_size=SAMPLE_RECORDS):
+    """One pass over the records: per-category counts, platform counts and a small sample"""
+    summary = {}
+    for record in records:
+        category = record.get('category', 'Unknown')
+        entry = summary.get(category)
+        if entry is None:
+            if max_categories is not None and len(summary) >= max_categories:
+                continue
+            entry = summary[category] = {'count': 0, 'by_platform': {}, 'sample': []}
+        entry['count'] += 1
+        platform = record.get('platform', 'unknown')
+        entry['by_platform'][platform] = entry['by_platform'].get(platform, 0) + 1
+        if len(entry['sample']) < sample_size:
+            # Only the fields the report prints, so samples are small and cheap to pickle
+            entry['sample'].append({k: record[k] for k in SAMPLE_FIELDS if k in record})
+    return summary
+
+_worker_exporter = None
+
+def _init_worker():
+    global _worker_exporter
+    _worker_exporter = PDFExporter()
+
+def _render_in_worker(args):
+    return _worker_exporter.render_report(*args)
+
 class PDFExporter:
     def __init__(self):
         self.styles = getSampleStyleSheet()
         self.setup_custom_styles()
+        self._stats_cache = None  # (stats key, table rows) of the last statistics pages
     
     def setup_custom_styles(self):
         """Setup custom styles for PDF"""
@@ -69,9 +105,118 @@ class PDFExporter:
             textColor=colors.HexColor('#7f8c8d'),
             alignment=TA_LEFT
         )
+        
+        # Table styles (shared by every report this exporter renders)
+        self.stats_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ecf0f1')),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
+        ])
+        self.platform_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2ecc71')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
+        ])
+        self.category_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e74c3c')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
+        ])
+    
+    def cover_page(self):
+        """Cover page flowables"""
+        return [
+            Spacer(1, 2*inch),
+            Paragraph("🌍 Universal Data Scraper", self.title_style),
+            Spacer(1, 0.3*inch),
+            Paragraph("Comprehensive Data Report", self.heading_style),
+            Spacer(1, 0.5*inch),
+            Paragraph(f"Generated on: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", self.meta_style),
+            PageBreak(),
+        ]
+    
+    def statistics_rows(self, stats):
+        """Table rows of the statistics pages, reused while the statistics are unchanged"""
+        key = repr(stats)
+        if self._stats_cache and self._stats_cache[0] == key:
+            return self._stats_cache[1]
+        
+        rows = {
+            'stats': [
+                ['Metric', 'Value'],
+                ['Total Records', str(stats.get('total_records', 0))],
+                ['Total Platforms', str(len(stats.get('by_platform', {})))],
+                ['Total Categories', str(len(stats.get('by_category', {})))],
+            ],
+            'platform': None,
+            'category': None,
+        }
+        if stats.get('by_platform'):
+            rows['platform'] = [['Platform', 'Records']] + [
+                [platform.title(), str(count)]
+                for platform, count in sorted(stats['by_platform'].items(), key=lambda x: x[1], reverse=True)
+            ]
+        if stats.get('by_category'):
+            rows['category'] = [['Category', 'Records']] + [
+                [category.replace('_', ' ').title(), str(count)]
+                for category, count in sorted(stats['by_category'].items(), key=lambda x: x[1], reverse=True)[:10]
+            ]
+        
+        self._stats_cache = (key, rows)
+        return rows
+    
+    def statistics_pages(self, stats):
+        """Statistics tables (flowables are built fresh for every document)"""
+        rows = self.statistics_rows(stats)
+        pages = []
+        
+        # Statistics Page
+        pages.append(Paragraph("📊 Statistics Overview", self.heading_style))
+        pages.append(Spacer(1, 0.2*inch))
+        
+        # Stats table
+        stats_table = Table(rows['stats'], colWidths=[3*inch, 3*inch])
+        stats_table.setStyle(self.stats_table_style)
+        pages.append(stats_table)
+        pages.append(Spacer(1, 0.3*inch))
+        
+        # Platform breakdown
+        if rows['platform']:
+            pages.append(Paragraph("Platform Distribution", self.subheading_style))
+            platform_table = Table(rows['platform'], colWidths=[4*inch, 2*inch])
+            platform_table.setStyle(self.platform_table_style)
+            pages.append(platform_table)
+            pages.append(Spacer(1, 0.3*inch))
+        
+        # Category breakdown
+        if rows['category']:
+            pages.append(Paragraph("Category Distribution", self.subheading_style))
+            category_table = Table(rows['category'], colWidths=[4*inch, 2*inch])
+            category_table.setStyle(self.category_table_style)
+            pages.append(category_table)
+        
+        pages.append(PageBreak())
+        return pages
     
     def export_data_to_pdf(self, data, stats, filename='scraped_data_report.pdf'):
         """Export data to a beautifully formatted PDF"""
+        summary = summarize_records(data, max_categories=MAX_REPORT_CATEGORIES)
+        return self.render_report(summary, stats, filename)
+    
+    def render_report(self, summary, stats, filename):
+        """Render a report from a category summary (see summarize_records)"""
         try:
             doc = SimpleDocTemplate(
                 filename,
@@ -82,106 +227,22 @@ class PDFExporter:
                 bottomMargin=0.75*inch
             )
             
-            story = []
-            
-            # Cover Page
-            story.append(Spacer(1, 2*inch))
-            story.append(Paragraph("🌍 Universal Data Scraper", self.title_style))
-            story.append(Spacer(1, 0.3*inch))
-            story.append(Paragraph("Comprehensive Data Report", self.heading_style))
-            story.append(Spacer(1, 0.5*inch))
-            story.append(Paragraph(f"Generated on: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", self.meta_style))
-            story.append(PageBreak())
+            story = self.cover_page() + self.statistics_pages(stats)
             
-            # Statistics Page
-            story.append(Paragraph("📊 Statistics Overview", self.heading_style))
-            story.append(Spacer(1, 0.2*inch))
-            
-            # Stats table
-            stats_data = [
-                ['Metric', 'Value'],
-                ['Total Records', str(stats.get('total_records', 0))],
-                ['Total Platforms', str(len(stats.get('by_platform', {})))],
-                ['Total Categories', str(len(stats.get('by_category', {})))],
-            ]
-            
-            stats_table = Table(stats_data, colWidths=[3*inch, 3*inch])
-            stats_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ecf0f1')),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
-            ]))
-            story.append(stats_table)
-            story.append(Spacer(1, 0.3*inch))
-            
-            # Platform breakdown
-            if stats.get('by_platform'):
-                story.append(Paragraph("Platform Distribution", self.subheading_style))
-                platform_data = [['Platform', 'Records']]
-                for platform, count in sorted(stats['by_platform'].items(), key=lambda x: x[1], reverse=True):
-                    platform_data.append([platform.title(), str(count)])
-                
-                platform_table = Table(platform_data, colWidths=[4*inch, 2*inch])
-                platform_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2ecc71')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 11),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
-                ]))
-                story.append(platform_table)
-                story.append(Spacer(1, 0.3*inch))
-            
-            # Category breakdown
-            if stats.get('by_category'):
-                story.append(Paragraph("Category Distribution", self.subheading_style))
-                category_data = [['Category', 'Records']]
-                for category, count in sorted(stats['by_category'].items(), key=lambda x: x[1], reverse=True)[:10]:
-                    category_data.append([category.replace('_', ' ').title(), str(count)])
-                
-                category_table = Table(category_data, colWidths=[4*inch, 2*inch])
-                category_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e74c3c')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 11),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
-                ]))
-                story.append(category_table)
-            
-            story.append(PageBreak())
-            
-            # Data Records (sample - first 50 to keep PDF manageable)
+            # Data Records (sample - first 20 per category to keep PDF manageable)
             story.append(Paragraph("📋 Data Records", self.heading_style))
             story.append(Spacer(1, 0.2*inch))
             
-            # Group by category
-            from collections import defaultdict
-            by_category = defaultdict(list)
-            for record in data:
-                category = record.get('category', 'Unknown')
-                by_category[category].append(record)
-            
-            for category, records in list(by_category.items())[:10]:  # Limit categories
-                story.append(Paragraph(f"Category: {category.replace('_', ' ').title()}", self.subheading_style))
+            for index, (category, entry) in enumerate(list(summary.items())[:MAX_REPORT_CATEGORIES]):
+                story.append(Paragraph(f"Category: {str(category).replace('_', ' ').title()}", self.subheading_style))
                 story.append(Spacer(1, 0.1*inch))
                 
-                # Show sample records per category (max 20 per category)
-                for i, record in enumerate(records[:20], 1):
+                for i, record in enumerate(entry['sample'], 1):
                     story.append(Paragraph(f"<b>{i}. {record.get('title', record.get('name', 'N/A'))}</b>", self.normal_style))
                     
                     # Add key fields
-                    fields_to_show = ['platform', 'url', 'description', 'views', 'author']
                     field_text = []
-                    for field in fields_to_show:
+                    for field in RECORD_FIELDS:
                         if field in record and record[field]:
                             value = str(record[field])[:100]  # Limit length
                             field_text.append(f"<b>{field.title()}:</b> {value}")
@@ -191,13 +252,13 @@ class PDFExporter:
                     
                     story.append(Spacer(1, 0.15*inch))
                 
-                if len(records) > 20:
-                    story.append(Paragraph(f"... and {len(records) - 20} more records in this category", self.meta_style))
+                if entry['count'] > len(entry['sample']):
+                    story.append(Paragraph(f"... and {entry['count'] - len(entry['sample'])} more records in this category", self.meta_style))
                 
                 story.append(Spacer(1, 0.2*inch))
                 
                 # Page break if needed (every 3 categories)
-                if list(by_category.keys()).index(category) % 3 == 2:
+                if index % 3 == 2:
                     story.append(PageBreak())
             
             # Build PDF
@@ -211,12 +272,26 @@ class PDFExporter:
             traceback.print_exc()
             return None
     
+    def category_filename(self, category_name):
+        safe_name = str(category_name).replace(' ', '_').replace('/', '_')[:50]
+        return f"{safe_name}_report.pdf"
+    
+    def category_task(self, category_name, entry, filename):
+        """Arguments for render_report for one category's document"""
+        stats = {
+            'total_records': entry['count'],
+            'by_platform': entry['by_platform'],
+            'by_category': {category_name: entry['count']}
+        }
+        return ({category_name: entry}, stats, filename)
+    
     def export_category_pdf(self, category_data, category_name, filename=None):
         """Export a specific category to PDF"""
         if not filename:
             safe_name = category_name.replace(' ', '_').replace('/', '_')[:50]
             filename = f"{safe_name}_data.pdf"
         
+        summary = summarize_records(category_data, max_categories=MAX_REPORT_CATEGORIES)
         stats = {
             'total_records': len(category_data),
             'by_platform': {},
@@ -228,5 +303,23 @@ class PDFExporter:
             platform = record.get('platform', 'unknown')
             stats['by_platform'][platform] = stats['by_platform'].get(platform, 0) + 1
         
-        return self.export_data_to_pdf(category_data, stats, filename)
-
+        return self.render_report(summary, stats, filename)
+    
+    def export_category_pdfs(self, data, workers=None):
+        """Export one PDF per category, rendered in parallel worker processes"""
+        summary = summarize_records(data)
+        tasks = [self.category_task(category, entry, self.category_filename(category))
+                 for category, entry in summary.items()]
+        
+        if workers is None:
+            workers = min(SCRAPER_SETTINGS.get('pdf_workers', 1), os.cpu_count() or 1)
+        workers = max(1, min(workers, len(tasks)))
+        
+        if workers == 1:
+            results = [self.render_report(*task) for task in tasks]
+        else:
+            # Each worker builds its styles once and reuses them for every document
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+                results = list(executor.map(_render_in_worker, tasks))
+        
+        return [result for result in results if result]
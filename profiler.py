@@ -0,0 +1,165 @@
+"""
+Profiler - `--profile` mode for scraper runs
+Runs a job under cProfile (every thread) plus a stack-sampling thread and tracemalloc. Writes:
+  <prefix>.prof           cProfile stats (pstats / snakeviz)
+  <prefix>.txt            top functions by cumulative and own time
+  <prefix>.collapsed      sampled stacks in collapsed format (flamegraph.pl, speedscope)
+  <prefix>_allocations.txt  top allocations at each category boundary and at the end
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 15
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+# Before 3.12 cProfile only sees the thread that enabled it; 3.12+ profiles every thread
+PER_THREAD_PROFILES = sys.version_info < (3, 12)
+
+_active = None
+
+def frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class StackSampler(threading.Thread):
+    """Samples every thread's Python stack at a fixed interval"""
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+
+    def run(self):
+        own_id = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, 'thread'))
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+    def write_collapsed(self, filename):
+        with open(filename, 'w', encoding='utf-8') as f:
+            for stack, samples in self.stacks.most_common():
+                f.write(f"{stack} {samples}\n")
+
+class RunProfiler:
+    def __init__(self, prefix='scraper_profile'):
+        self.prefix = prefix
+        self.profile = cProfile.Profile()
+        self.thread_profiles = []  # one per worker thread started while profiling
+        self.lock = threading.Lock()
+        self.sampler = StackSampler()
+        self.allocation_report = []
+        self.last_snapshot = None
+        self.started = None
+
+    def start(self):
+        global _active
+        tracemalloc.start()
+        self.last_snapshot = tracemalloc.take_snapshot()
+        self.started = time.time()
+        self.sampler.start()
+        if PER_THREAD_PROFILES:
+            threading.setprofile(self.profile_thread)
+        self.profile.enable()
+        _active = self
+
+    def profile_thread(self, frame, event, arg):
+        """First profile event of a new thread: give it its own cProfile (replacing this hook)"""
+        profile = cProfile.Profile()
+        with self.lock:
+            self.thread_profiles.append(profile)
+        profile.enable()
+
+    def checkpoint(self, label):
+        """Record what was allocated since the previous boundary"""
+        # Snapshot comparison is slow; keep it out of the CPU profile
+        self.profile.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"== {label} (+{time.time() - self.started:.1f}s) "
+                 f"current {current / 1024 / 1024:.1f} MB, peak {peak / 1024 / 1024:.1f} MB"]
+        for stat in snapshot.compare_to(self.last_snapshot, 'lineno')[:TOP_ALLOCATIONS]:
+            lines.append(f"  {stat}")
+        self.allocation_report.append("\n".join(lines))
+        self.last_snapshot = snapshot
+        self.profile.enable()
+
+    def stop(self):
+        """Stop profiling and write the reports; returns the files written"""
+        global _active
+        self.profile.disable()
+        if PER_THREAD_PROFILES:
+            threading.setprofile(None)
+        self.sampler.stop()
+        _active = None
+
+        final = tracemalloc.take_snapshot()
+        lines = ["== Largest live allocations at exit"]
+        for stat in final.statistics('lineno')[:TOP_ALLOCATIONS * 2]:
+            lines.append(f"  {stat}")
+        self.allocation_report.append("\n".join(lines))
+        tracemalloc.stop()
+
+        files = {
+            'prof': f"{self.prefix}.prof",
+            'text': f"{self.prefix}.txt",
+            'collapsed': f"{self.prefix}.collapsed",
+            'allocations': f"{self.prefix}_allocations.txt",
+        }
+        output = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=output)
+        with self.lock:
+            thread_profiles = list(self.thread_profiles)
+        for profile in thread_profiles:
+            try:
+                stats.add(profile)
+            except TypeError:
+                pass  # the thread made no calls
+        stats.dump_stats(files['prof'])
+        stats.strip_dirs()
+        stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+        stats.sort_stats('tottime').print_stats(TOP_FUNCTIONS)
+        with open(files['text'], 'w', encoding='utf-8') as f:
+            f.write(output.getvalue())
+
+        self.sampler.write_collapsed(files['collapsed'])
+        with open(files['allocations'], 'w', encoding='utf-8') as f:
+            f.write("\n\n".join(self.allocation_report) + "\n")
+        return files
+
+def category_boundary(label):
+    """Snapshot allocations when a category finishes (no-op unless --profile is on)"""
+    if _active is not None:
+        _active.checkpoint(label)
+
+def run_profiled(func, *args, prefix='scraper_profile', **kwargs):
+    """Run func under the profilers and write the reports even if it is interrupted"""
+    profiler = RunProfiler(prefix)
+    print(f"🔬 Profiling enabled (reports: {prefix}.*)")
+    profiler.start()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        files = profiler.stop()
+        print("\n🔬 Profile written:")
+        for filename in files.values():
+            print(f"   - {filename}")
@@ -3,13 +3,13 @@ Quick Start Script - Test the scraper with limited data
 Use this to test the scraper before running the full version
 """
 
-import time
 from selenium.webdriver.common.by import By
 from google_maps_scraper import GoogleMapsScraper
 from website_scraper import WebsiteScraper
 from social_media_scraper import SocialMediaScraper
 from data_aggregator import DataAggregator
 from config import SCRAPER_SETTINGS
+from instrumentation import pause
 
 def quick_test():
     """Quick test with just 1-2 listings"""
@@ -59,6 +59,9 @@ def quick_test():
                 if info:
                     info['category'] = 'dental_clinic'
                     
+                    # Discovery (one cached Google search) may find a website the listing lacks
+                    social_scraper.add_discovered_website(info.get('name', ''), info.get('address', ''), info)
+                    
                     # Scrape website
                     website_data = {}
                     if info.get('website') and info['website'] != "N/A":
@@ -79,7 +82,7 @@ def quick_test():
                     print(f"  ✓ Email: {merged.get('email', 'N/A')}")
                     print(f"  ✓ Phone: {merged.get('phone', 'N/A')}")
                     
-                    time.sleep(3)
+                    pause(3)
         
         except Exception as e:
             print(f"Error during scraping: {e}")
@@ -90,6 +93,7 @@ def quick_test():
     if google_scraper.driver:
         google_scraper.driver.quit()
     social_scraper.close()
+    website_scraper.close()
     
     # Export
     if aggregator.all_data:
@@ -0,0 +1,75 @@
+"""
+Ranking Index - Numeric sort keys kept up to date as records are added
+Answers "top K by views/likes/followers/rating" per category or platform without
+re-parsing, copying or fully sorting the dataset.
+"""
+
+import heapq
+from array import array
+from metric_parser import parse_metric
+
+RANKED_FIELDS = ['views', 'likes', 'followers', 'rating']
+GROUP_FIELDS = ['category', 'platform']
+
+def sort_key(record, field):
+    """Numeric value of a record's field for ranking"""
+    value = record.get(field)
+    if field == 'rating':
+        try:
+            return float(str(value).replace(',', '.'))
+        except (TypeError, ValueError):
+            return 0.0
+    return float(parse_metric(value))
+
+class RankingIndex:
+    def __init__(self, fields=None):
+        self.fields = fields or RANKED_FIELDS
+        self.reset()
+
+    def reset(self, source=None):
+        """Drop the index (optionally binding it to a new record list)"""
+        self.source = source
+        self.count = 0
+        self.keys = {field: array('d') for field in self.fields}
+        self.groups = {field: {} for field in GROUP_FIELDS}
+
+    def invalidate(self):
+        """Rebuild on the next sync (after records were changed in place or replaced)"""
+        self.reset()
+
+    def add(self, record):
+        """Index the next record (its position is the current count)"""
+        position = self.count
+        for field in self.fields:
+            self.keys[field].append(sort_key(record, field))
+        for field in GROUP_FIELDS:
+            self.groups[field].setdefault(record.get(field, 'unknown'), array('l')).append(position)
+        self.count += 1
+
+    def sync(self, records):
+        """Catch up with records appended since the last sync (or a different record list)"""
+        if records is not self.source or self.count > len(records):
+            self.reset(records)
+        for record in records[self.count:]:
+            self.add(record)
+
+    def top_positions(self, field, limit=100, category=None, platform=None):
+        """Positions of the top records for a field, optionally within a category/platform"""
+        if field not in self.keys:
+            raise ValueError(f"Field '{field}' is not indexed (indexed: {', '.join(self.fields)})")
+
+        candidates = None
+        for group_field, value in (('category', category), ('platform', platform)):
+            if value is None:
+                continue
+            positions = self.groups[group_field].get(value, array('l'))
+            if candidates is None:
+                candidates = positions
+            else:
+                allowed = set(positions)
+                candidates = [p for p in candidates if p in allowed]
+        if candidates is None:
+            candidates = range(self.count)
+
+        # O(n log k) partial selection instead of a full sort
+        return heapq.nlargest(limit, candidates, key=self.keys[field].__getitem__)
@@ -0,0 +1,222 @@
+"""
+Record Store - Column-oriented storage for millions of scraped records
+Behaves like a list of dicts, but keeps one list per field instead of one dict per record,
+with low-cardinality fields (platform, category, type, source) stored as integer codes.
+"""
+
+import sys
+from array import array
+from collections.abc import MutableMapping
+
+CATEGORICAL_FIELDS = ['platform', 'category', 'type', 'source']
+
+# Short repeated strings (dates, authors, languages) are interned so rows share one copy
+INTERN_MAX_LENGTH = 32
+
+class _Missing:
+    def __repr__(self):
+        return 'MISSING'
+
+MISSING = _Missing()
+
+class CategoricalColumn:
+    def __init__(self):
+        self.codes = array('i')
+        self.values = []
+        self.lookup = {}
+
+    def encode(self, value):
+        if value is MISSING:
+            return -1
+        try:
+            code = self.lookup.get(value)
+        except TypeError:  # unhashable values cannot be coded
+            raise ValueError(f"Categorical value must be hashable: {value!r}")
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.lookup[value] = code
+        return code
+
+    def append(self, value):
+        self.codes.append(self.encode(value))
+
+    def __getitem__(self, index):
+        code = self.codes[index]
+        return MISSING if code < 0 else self.values[code]
+
+    def __setitem__(self, index, value):
+        self.codes[index] = self.encode(value)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def to_list(self, missing=None):
+        values = self.values
+        return [values[c] if c >= 0 else missing for c in self.codes]
+
+class RecordView(MutableMapping):
+    """Dict-like view of one row; reads and writes go straight to the store's columns"""
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    def __getitem__(self, key):
+        column = self.store.columns.get(key)
+        if column is None:
+            raise KeyError(key)
+        value = column[self.index]
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.store.set_value(self.index, key, value)
+
+    def __delitem__(self, key):
+        self[key]  # raise KeyError if absent
+        self.store.columns[key][self.index] = MISSING
+
+    def __iter__(self):
+        for key, column in self.store.columns.items():
+            if column[self.index] is not MISSING:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def copy(self):
+        return dict(self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+class RecordStore:
+    def __init__(self, records=None, categorical_fields=None):
+        self.categorical_fields = set(categorical_fields or CATEGORICAL_FIELDS)
+        self.columns = {}
+        self.count = 0
+        if records:
+            self.extend(records)
+
+    def _new_column(self, field):
+        """Create a column for a field first seen now, padded for earlier rows"""
+        if field in self.categorical_fields:
+            column = CategoricalColumn()
+            column.codes.extend([-1] * self.count)
+        else:
+            column = [MISSING] * self.count
+        self.columns[field] = column
+        return column
+
+    def _prepare(self, value):
+        if isinstance(value, str) and len(value) <= INTERN_MAX_LENGTH:
+            return sys.intern(value)
+        return value
+
+    def append(self, record):
+        """Add a record (any mapping); a value that cannot be stored leaves the store unchanged"""
+        new_fields = [field for field in record if field not in self.columns]
+        for field in new_fields:
+            self._new_column(field)
+        # Encode every value before touching any column so the columns stay the same length
+        try:
+            row = []
+            for field, column in self.columns.items():
+                value = self._prepare(record.get(field, MISSING))
+                if isinstance(column, CategoricalColumn):
+                    row.append((column.codes, column.encode(value)))
+                else:
+                    row.append((column, value))
+        except Exception:
+            for field in new_fields:
+                del self.columns[field]
+            raise
+        for target, value in row:
+            target.append(value)
+        self.count += 1
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def set_value(self, index, field, value):
+        column = self.columns[field] if field in self.columns else self._new_column(field)
+        column[index] = self._prepare(value)
+
+    def field_names(self):
+        return list(self.columns)
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [RecordView(self, i) for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('record index out of range')
+        return RecordView(self, index)
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield RecordView(self, i)
+
+    def distinct(self, field):
+        """Distinct values of a field in order of first appearance"""
+        column = self.columns.get(field)
+        if column is None:
+            return []
+        if isinstance(column, CategoricalColumn):
+            return [column.values[c] for c in dict.fromkeys(column.codes) if c >= 0]
+        return [v for v in dict.fromkeys(column) if v is not MISSING]
+
+    def iter_rows(self, fields, missing=None):
+        """Yield one tuple per record with the given fields, read lazily from the columns"""
+        columns = [self.columns.get(field) for field in fields]
+        for i in range(self.count):
+            row = []
+            for column in columns:
+                value = MISSING if column is None else column[i]
+                row.append(missing if value is MISSING else value)
+            yield tuple(row)
+
+    def to_dicts(self):
+        """Materialize every record as a plain dict (e.g. for JSON export)"""
+        names = list(self.columns)
+        columns = [c.to_list(MISSING) if isinstance(c, CategoricalColumn) else c
+                   for c in self.columns.values()]
+        return [
+            {name: value for name, value in zip(names, row) if value is not MISSING}
+            for row in zip(*columns)
+        ] if columns else [{} for _ in range(self.count)]
+
+    def to_dataframe(self):
+        """Build a pandas DataFrame straight from the columns"""
+        import pandas as pd
+        data = {}
+        for name, column in self.columns.items():
+            if isinstance(column, CategoricalColumn):
+                data[name] = column.to_list()
+            else:
+                data[name] = [None if v is MISSING else v for v in column]
+        return pd.DataFrame(data, index=range(self.count))
+
+def records_to_dataframe(records):
+    """DataFrame from either a RecordStore or a plain list of dicts"""
+    if isinstance(records, RecordStore):
+        return records.to_dataframe()
+    import pandas as pd
+    return pd.DataFrame(records)
+
+def records_to_dicts(records):
+    """Plain list of dicts from either a RecordStore or a list of dicts"""
+    if isinstance(records, RecordStore):
+        return records.to_dicts()
+    return records
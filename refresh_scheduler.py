@@ -0,0 +1,133 @@
+"""
+Refresh Scheduler - Decide which categories to re-scrape next
+Each category has its own refresh interval that shrinks when its records keep changing
+(e.g. YouTube view counts) and grows when they don't (e.g. Wikipedia articles). Due
+categories come off a priority queue, most overdue first, within a per-cycle budget.
+"""
+
+import heapq
+import json
+import os
+import time
+from generic_config import REFRESH_SETTINGS
+from snapshot_store import record_key, record_hash
+
+# Change fraction above which a category refreshes twice as often, and below which half as often
+HIGH_CHANGE = 0.5
+LOW_CHANGE = 0.1
+
+class RefreshScheduler:
+    def __init__(self, settings=None):
+        self.settings = {**REFRESH_SETTINGS, **(settings or {})}
+        self.state_file = self.settings['state_file']
+        self.entries = {}  # category -> interval, next/last refresh, change rate
+        self.fingerprints = {}  # category -> {record key: content hash} from the last refresh
+        self.queue = []  # (next_refresh, category); stale items are skipped when popped
+        self.tracked = set()  # categories added this run; only these are queued
+        self.load()
+
+    def load(self):
+        """Restore intervals and due times from the last run (queued once a category is added)"""
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                print(f"Could not load refresh schedule: {e}")
+                self.entries = {}
+
+    def save(self):
+        temp_file = f"{self.state_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(temp_file, self.state_file)
+
+    def clamp(self, hours):
+        return min(max(hours, self.settings['min_interval_hours']), self.settings['max_interval_hours'])
+
+    def add_category(self, category, platforms, base_interval_hours=24):
+        """Track a category; new ones are due immediately, known ones keep their schedule"""
+        self.tracked.add(category)
+        if category in self.entries:
+            heapq.heappush(self.queue, (self.entries[category]['next_refresh'], category))
+            return
+        factors = self.settings['platform_factors']
+        factor = min((factors.get(p, 1) for p in platforms), default=1)
+        self.entries[category] = {
+            'interval_hours': self.clamp(base_interval_hours * factor),
+            'next_refresh': time.time(),
+            'last_refresh': None,
+            'change_rate': None,
+        }
+        heapq.heappush(self.queue, (self.entries[category]['next_refresh'], category))
+
+    def is_current(self, item):
+        """Whether a queue item still reflects its category's schedule"""
+        next_refresh, category = item
+        entry = self.entries.get(category)
+        return entry is not None and category in self.tracked and entry['next_refresh'] == next_refresh
+
+    def due_categories(self, budget=None, now=None):
+        """Pop the most overdue categories, at most `budget` of them"""
+        budget = budget if budget is not None else self.settings['cycle_budget']
+        now = now if now is not None else time.time()
+        due = []
+        while self.queue and len(due) < budget:
+            if not self.is_current(self.queue[0]):
+                heapq.heappop(self.queue)  # superseded by a later reschedule
+                continue
+            next_refresh, category = self.queue[0]
+            if next_refresh > now:
+                break
+            heapq.heappop(self.queue)
+            due.append(category)
+        return due
+
+    def seconds_until_due(self, now=None):
+        """Time until the next queued category is due (None if nothing is queued)"""
+        now = now if now is not None else time.time()
+        while self.queue and not self.is_current(self.queue[0]):
+            heapq.heappop(self.queue)
+        return max(0, self.queue[0][0] - now) if self.queue else None
+
+    def change_fraction(self, category, records):
+        """Share of a category's records that are new or changed since its last refresh"""
+        current = {record_key(r): record_hash(r) for r in records}
+        if not current:
+            return None  # nothing scraped: keep the previous fingerprints for next time
+        previous = self.fingerprints.get(category)
+        self.fingerprints[category] = current
+        if previous is None:
+            return None  # nothing to compare against yet
+        changed = sum(1 for key, digest in current.items() if previous.get(key) != digest)
+        return changed / len(current)
+
+    def record_refresh(self, category, records, now=None):
+        """Adapt a category's interval to how much its records changed, then reschedule it"""
+        if category not in self.tracked:
+            return  # not scheduled (e.g. a one-off update)
+        entry = self.entries[category]
+        fraction = self.change_fraction(category, records)
+
+        if fraction is not None:
+            previous_rate = entry['change_rate']
+            entry['change_rate'] = fraction if previous_rate is None else (previous_rate + fraction) / 2
+            if entry['change_rate'] > HIGH_CHANGE:
+                entry['interval_hours'] = self.clamp(entry['interval_hours'] / 2)
+            elif entry['change_rate'] < LOW_CHANGE:
+                entry['interval_hours'] = self.clamp(entry['interval_hours'] * 2)
+
+        self.reschedule(category, now)
+
+    def record_failure(self, category, now=None):
+        """Retry a failed category after its usual interval, leaving its change rate and fingerprints alone"""
+        if category in self.tracked:
+            self.reschedule(category, now)
+
+    def reschedule(self, category, now=None):
+        now = now if now is not None else time.time()
+        entry = self.entries[category]
+        entry['last_refresh'] = now
+        entry['next_refresh'] = now + entry['interval_hours'] * 3600
+        heapq.heappush(self.queue, (entry['next_refresh'], category))
+        self.save()
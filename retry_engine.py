@@ -0,0 +1,169 @@
+"""
+Retry Engine - Shared retries with backoff and per-host circuit breakers
+Wraps requests sessions (RetrySession) and Selenium page loads (load_page) so transient
+failures (timeouts, 429, 5xx, stale elements) are retried instead of losing a whole batch,
+while a host that keeps failing is skipped for a while instead of being hammered.
+"""
+
+import random
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from generic_config import SCRAPER_SETTINGS
+from instrumentation import count, pause, timer
+from user_agents import header_profile
+
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+# Selenium exceptions are matched by name so this module does not need Selenium installed
+RETRYABLE_SELENIUM_ERRORS = {'TimeoutException', 'StaleElementReferenceException'}
+RETRYABLE_DRIVER_MESSAGES = ('net::ERR_', 'timeout', 'timed out', 'disconnected')
+
+class RetryableHTTPError(Exception):
+    def __init__(self, response):
+        self.response = response
+        self.status_code = response.status_code
+        super().__init__(f"HTTP {response.status_code} from {response.url}")
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a host whose circuit breaker is open"""
+
+def is_retryable(error):
+    """Whether an error is transient (worth retrying) rather than fatal"""
+    if isinstance(error, RetryableHTTPError):
+        return True
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code in RETRYABLE_STATUS
+    if isinstance(error, (requests.Timeout, requests.ConnectionError,
+                          requests.exceptions.ChunkedEncodingError, TimeoutError, ConnectionError)):
+        return True
+    name = type(error).__name__
+    if name in RETRYABLE_SELENIUM_ERRORS:
+        return True
+    if name == 'WebDriverException':
+        message = str(error).lower()
+        return any(text.lower() in message for text in RETRYABLE_DRIVER_MESSAGES)
+    return False
+
+def backoff_delay(attempt, base=None, cap=None):
+    """Exponential backoff with full jitter for the given (0-based) retry"""
+    base = SCRAPER_SETTINGS.get('retry_backoff_base', 1) if base is None else base
+    cap = SCRAPER_SETTINGS.get('retry_backoff_max', 30) if cap is None else cap
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+class CircuitBreaker:
+    """Opens after repeated failures; lets one trial call through after a cool-down"""
+    def __init__(self, failure_threshold=None, reset_timeout=None):
+        self.failure_threshold = failure_threshold or SCRAPER_SETTINGS.get('circuit_breaker_threshold', 5)
+        self.reset_timeout = reset_timeout or SCRAPER_SETTINGS.get('circuit_breaker_reset', 120)
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.time() - self.opened_at >= self.reset_timeout:
+                # Half-open: allow a trial call; a failure re-opens the circuit
+                self.opened_at = None
+                self.failures = self.failure_threshold - 1
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.time()
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(host):
+    """The process-wide circuit breaker for a host"""
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker()
+        return _breakers[host]
+
+def retry_call(func, *args, host=None, attempts=None, **kwargs):
+    """Call func, retrying transient errors with backoff; fatal errors are raised at once"""
+    retries = SCRAPER_SETTINGS.get('retry_attempts', 3) if attempts is None else attempts
+    breaker = get_breaker(host) if host else None
+
+    for attempt in range(retries + 1):
+        if breaker and not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {host}; skipping request")
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            count('errors')
+            if not is_retryable(e):
+                raise
+            count('retries')
+            if breaker:
+                breaker.record_failure()
+            if attempt >= retries:
+                raise
+            delay = backoff_delay(attempt)
+            retry_after = getattr(getattr(e, 'response', None), 'headers', {}).get('Retry-After', '')
+            if str(retry_after).isdigit():
+                delay = max(delay, min(int(retry_after), SCRAPER_SETTINGS.get('retry_backoff_max', 30)))
+            # The response being retried is discarded; only the last one is handed back open
+            response = getattr(e, 'response', None)
+            if response is not None and hasattr(response, 'close'):
+                response.close()
+            print(f"  ↻ Retrying in {delay:.1f}s ({attempt + 1}/{retries}): {e}")
+            pause(delay, 'retry_backoff')
+        else:
+            if breaker:
+                breaker.record_success()
+            return result
+
+class RetrySession(requests.Session):
+    """requests.Session whose requests are retried and guarded per host
+    Headers come from the shared user-agent pool, rotated per request or per session.
+    Pass retries=N to a request to override retry_attempts for it (e.g. 0 under a deadline).
+    """
+    def __init__(self, rotation=None):
+        super().__init__()
+        self.rotation = rotation or SCRAPER_SETTINGS.get('user_agent_rotation', 'request')
+        self.headers.update(header_profile())
+
+    def request(self, method, url, *args, **kwargs):
+        host = urlparse(url).netloc
+        attempts = kwargs.pop('retries', None)
+        if self.rotation == 'request':
+            # Per-request headers override the session's; explicit caller headers still win
+            kwargs['headers'] = {**header_profile(), **(kwargs.get('headers') or {})}
+
+        def send():
+            with timer('http_request'):
+                response = super(RetrySession, self).request(method, url, *args, **kwargs)
+            count('pages')
+            if not kwargs.get('stream'):
+                # Streamed bodies are read (and capped) by the caller
+                count('bytes', len(response.content))
+            if response.status_code in RETRYABLE_STATUS:
+                raise RetryableHTTPError(response)
+            return response
+
+        try:
+            return retry_call(send, host=host, attempts=attempts)
+        except RetryableHTTPError as e:
+            # Out of retries: hand back the response so callers' raise_for_status() applies
+            return e.response
+
+def load_page(driver, url):
+    """driver.get with retries and the host's circuit breaker"""
+    with timer('page_load'):
+        result = retry_call(driver.get, url, host=urlparse(url).netloc)
+    count('pages')
+    return result
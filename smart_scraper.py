@@ -4,10 +4,9 @@ Auto-detects what user wants and scrapes everything
 """
 
 import time
-from universal_main import main as universal_main
-from auto_updater import AutoUpdater
-from universal_aggregator import UniversalAggregator
+import argparse
 from generic_config import GLOBAL_CATEGORIES
+from profiler import run_profiled
 
 def smart_scraper_menu():
     """Main menu with all options"""
@@ -76,8 +75,9 @@ def smart_category_scraper():
         
         print(f"\n🚀 Starting scraping...")
         
-        aggregator = UniversalAggregator()
+        from universal_aggregator import UniversalAggregator
         from universal_main import scrape_category
+        aggregator = UniversalAggregator()
         scrape_category(category_key, category_config, aggregator)
         
         # Export
@@ -96,7 +96,6 @@ def smart_category_scraper():
 def export_existing_data():
     """Export already scraped data"""
     import os
-    import json
     
     print("\n" + "="*70)
     print("📁 EXPORT EXISTING DATA")
@@ -119,14 +118,10 @@ def export_existing_data():
         if 1 <= choice <= len(json_files):
             selected_file = json_files[choice - 1]
             
-            # Load data
-            with open(selected_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            if 'data' in data:
-                aggregator = UniversalAggregator()
-                aggregator.all_data = data['data']
-                
+            # Load data (records are read one line at a time)
+            from universal_aggregator import UniversalAggregator
+            aggregator = UniversalAggregator()
+            if aggregator.load_json(selected_file):
                 print("\nExport formats:")
                 print("  1. All formats (CSV, Excel, JSON, PDF)")
                 print("  2. PDF only (Beautiful report)")
@@ -143,14 +138,14 @@ def export_existing_data():
                 
                 print("\n✅ Export complete!")
             else:
-                print("Invalid data format!")
+                print("No records found in file!")
     except Exception as e:
         print(f"Error: {e}")
 
 def view_statistics():
     """View statistics of scraped data"""
     import os
-    import json
+    from json_records import read_metadata
     
     print("\n" + "="*70)
     print("📊 DATA STATISTICS")
@@ -164,11 +159,10 @@ def view_statistics():
     
     for json_file in json_files:
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Only the metadata line is parsed, not the records
+            meta = read_metadata(json_file)
             
-            if 'metadata' in data:
-                meta = data['metadata']
+            if meta:
                 stats = meta.get('statistics', {})
                 
                 print(f"\n📁 File: {json_file}")
@@ -219,6 +213,7 @@ def continuous_mode():
         print(f"   Categories: {len(categories) if categories else 'All'}")
         print(f"\n⚠️  This will keep running. Press Ctrl+C to stop.")
         
+        from auto_updater import AutoUpdater
         updater = AutoUpdater()
         updater.start_continuous_mode(hours, categories)
         
@@ -249,11 +244,13 @@ def main():
             break
         
         elif choice == "1":
+            from universal_main import main as universal_main
             universal_main()
         
         elif choice == "2":
             try:
                 hours = int(input("\nUpdate every how many hours? [24]: ").strip() or "24")
+                from auto_updater import AutoUpdater
                 updater = AutoUpdater()
                 updater.start_continuous_mode(hours)
             except KeyboardInterrupt:
@@ -281,8 +278,16 @@ def main():
         input("\n\nPress Enter to continue...")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Universal Smart Data Scraper")
+    parser.add_argument('--profile', action='store_true',
+                        help="Profile the session (cProfile, sampled flamegraph stacks, top allocations)")
+    args = parser.parse_args()
+    
     try:
-        main()
+        if args.profile:
+            run_profiled(main, prefix='smart_profile')
+        else:
+            main()
     except KeyboardInterrupt:
         print("\n\n👋 Goodbye!")
     except Exception as e:
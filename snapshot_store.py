@@ -0,0 +1,178 @@
+"""
+Snapshot Store - Delta-only history of the auto-updated dataset
+Each snapshot writes just the records added or changed since the previous one, listed in
+a manifest; compaction merges the deltas into a new base snapshot on demand.
+Usage: python snapshot_store.py [info|compact] [--dir snapshots]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime
+from json_records import dumps, loads
+
+MANIFEST_FILE = 'manifest.json'
+
+def record_key(record):
+    """Identity of a record across snapshots (URL, else platform + title)"""
+    url = record.get('url')
+    if url and url != 'N/A':
+        return url
+    return f"{record.get('platform', '')}|{record.get('title', record.get('name', ''))}"
+
+# Fields that change on every scrape without the record itself changing
+VOLATILE_FIELDS = {'scraped_date'}
+
+def record_hash(record):
+    """Short content hash used to detect changed records"""
+    content = json.dumps({k: v for k, v in record.items() if k not in VOLATILE_FIELDS},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=8).digest()
+
+class SnapshotStore:
+    def __init__(self, directory='snapshots'):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.manifest = self.load_manifest()
+        self.hashes = None  # record key -> content hash as of the latest snapshot
+
+    def path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def load_manifest(self):
+        manifest_path = self.path(MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {'base': None, 'deltas': [], 'total_records': 0}
+
+    def save_manifest(self):
+        """Write the manifest atomically; it is the only source of truth for which files count"""
+        temp_file = self.path(f"{MANIFEST_FILE}.tmp")
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        os.replace(temp_file, self.path(MANIFEST_FILE))
+
+    def snapshot_files(self):
+        files = [self.manifest['base']['file']] if self.manifest['base'] else []
+        return files + [delta['file'] for delta in self.manifest['deltas']]
+
+    def iter_file(self, filename):
+        with open(self.path(filename), 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield loads(line)
+
+    def write_file(self, filename, records):
+        temp_file = self.path(f"{filename}.tmp")
+        count = 0
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(dumps(dict(record)) + "\n")
+                count += 1
+        os.replace(temp_file, self.path(filename))
+        return count
+
+    def load_hashes(self):
+        """Rebuild the per-record hashes from the files already on disk (once per process)"""
+        self.hashes = {}
+        for filename in self.snapshot_files():
+            for record in self.iter_file(filename):
+                self.hashes[record_key(record)] = record_hash(record)
+
+    def write_delta(self, records):
+        """Snapshot only the records added or changed since the previous snapshot"""
+        if self.hashes is None:
+            self.load_hashes()
+
+        # Re-scraped records are appended again, so the last version of each key wins
+        latest = {}
+        for record in records:
+            latest[record_key(record)] = record
+
+        delta = []
+        added = 0
+        for key, record in latest.items():
+            digest = record_hash(record)
+            previous = self.hashes.get(key)
+            if previous == digest:
+                continue
+            if previous is None:
+                added += 1
+            self.hashes[key] = digest
+            delta.append(record)
+
+        if not delta:
+            print("✓ Snapshot unchanged (no new or changed records)")
+            return None
+
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = f"delta_{timestamp}_{len(self.manifest['deltas']) + 1:04d}.jsonl"
+        self.write_file(filename, delta)
+
+        self.manifest['deltas'].append({
+            'file': filename,
+            'created': datetime.now().isoformat(),
+            'records': len(delta),
+            'added': added,
+            'changed': len(delta) - added,
+        })
+        self.manifest['total_records'] = len(self.hashes)
+        self.save_manifest()
+
+        print(f"✓ Snapshot {filename}: {added} added, {len(delta) - added} changed")
+        return self.path(filename)
+
+    def iter_records(self):
+        """Current version of every record: the base overlaid with each delta in order"""
+        merged = {}
+        for filename in self.snapshot_files():
+            for record in self.iter_file(filename):
+                merged[record_key(record)] = record
+        return iter(merged.values())
+
+    def compact(self):
+        """Merge the base and all deltas into a new base snapshot"""
+        if not self.manifest['deltas']:
+            print("Nothing to compact")
+            return None
+
+        old_files = self.snapshot_files()
+        filename = f"base_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        count = self.write_file(filename, self.iter_records())
+
+        self.manifest = {
+            'base': {'file': filename, 'created': datetime.now().isoformat(), 'records': count},
+            'deltas': [],
+            'total_records': count,
+        }
+        self.save_manifest()
+
+        # Old files are removed only once the manifest no longer references them
+        for old_file in old_files:
+            if old_file != filename and os.path.exists(self.path(old_file)):
+                os.remove(self.path(old_file))
+
+        print(f"✓ Compacted {len(old_files)} snapshot files into {filename} ({count} records)")
+        return self.path(filename)
+
+    def print_info(self):
+        base = self.manifest['base']
+        print(f"\nSnapshots in {self.directory}/")
+        print(f"  Base: {base['file']} ({base['records']} records)" if base else "  Base: none")
+        print(f"  Deltas: {len(self.manifest['deltas'])}")
+        for delta in self.manifest['deltas'][-10:]:
+            print(f"    - {delta['file']}: {delta['added']} added, {delta['changed']} changed")
+        print(f"  Total records: {self.manifest['total_records']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or compact delta snapshots")
+    parser.add_argument('command', nargs='?', default='info', choices=['info', 'compact'])
+    parser.add_argument('--dir', default='snapshots', help="Snapshot directory")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.dir)
+    if args.command == 'compact':
+        store.compact()
+    store.print_info()
@@ -4,7 +4,8 @@ Social Media Scraper for Facebook, Instagram, and TikTok
 
 import re
 import time
-import requests
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -12,36 +13,160 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import undetected_chromedriver as uc
-from fake_useragent import UserAgent
-from config import SCRAPER_SETTINGS
+from user_agents import apply_browser_profile
+from discovery_cache import get_discovery_cache
+from metric_parser import parse_metric
+from retry_engine import load_page
+from http_client import shared_session
+from instrumentation import pause
+from config import SCRAPER_SETTINGS, SOCIAL_SETTINGS
+
+SOCIAL_PLATFORMS = ['facebook', 'instagram', 'tiktok']
+
+# Search result domains that are never a business's own website (subdomains included)
+NON_WEBSITE_DOMAINS = {'youtube.com', 'twitter.com', 'x.com', 'linkedin.com', 'wikipedia.org', 'pinterest.com'}
+# Directories, listing and review sites that rank above the business's own site
+DIRECTORY_DOMAINS = {
+    'yelp.com', 'tripadvisor.com', 'foursquare.com', 'yellowpages.com', 'yellowpages.com.pk',
+    'justdial.com', 'cybo.com', 'hotfrog.com', 'brownbook.net', 'businesslist.pk', 'pakbiz.com',
+    'findglocal.com', 'wikimapia.org', 'mapquest.com', 'waze.com', 'glassdoor.com', 'indeed.com',
+    'rozee.pk', 'olx.com.pk', 'zameen.com', 'marham.pk', 'oladoc.com', 'sehat.com.pk',
+    'healthwire.pk', 'medicalstores.pk', 'nearby.pk', 'dnb.com', 'opencorporates.com',
+}
+# Name words too common to tie a domain to a business
+GENERIC_NAME_WORDS = {'the', 'and', 'hospital', 'clinic', 'medical', 'center', 'centre', 'school',
+                      'college', 'restaurant', 'hotel', 'store', 'shop', 'services', 'pvt', 'ltd'}
+
+def matches_domain(domain, domains):
+    """Whether a host is one of the domains or a subdomain of one"""
+    return any(domain == d or domain.endswith('.' + d) for d in domains)
+
+def name_words(business_name):
+    """Distinctive words of a business name, for matching it against domains"""
+    words = re.findall(r'[a-z0-9]+', str(business_name).lower())
+    return [w for w in words if len(w) >= 4 and w not in GENERIC_NAME_WORDS]
 
 class SocialMediaScraper:
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, concurrent=None):
         self.headless = headless
         self.driver = None
-        self.ua = UserAgent()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': self.ua.random,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        })
+        self.concurrent = SOCIAL_SETTINGS['concurrent'] if concurrent is None else concurrent
+        # Concurrent mode: one pooled scraper (and browser) per platform, reused across businesses
+        self.platform_scrapers = {}
+        self.platform_executors = {}  # platform -> its single lookup thread
+        self.closed = False
+        self.discovery_cache = get_discovery_cache(SOCIAL_SETTINGS['discovery_cache_file'])
+        self.session = shared_session()  # pooled keep-alive connections, rotating browser headers
+        self.error_count = 0
+    
+    def record_error(self, message):
+        """Report an error that is handled here, counting it so a failed lookup is not mistaken for an empty one"""
+        self.error_count += 1
+        print(message)
     
     def init_driver(self):
         """Initialize Chrome driver"""
+        if self.closed:
+            # Retired after a timeout: the abandoned lookup must not start a new browser
+            self.record_error("Scraper closed; not starting a browser")
+            return False
         try:
             options = uc.ChromeOptions()
             if self.headless:
                 options.add_argument('--headless')
             options.add_argument('--no-sandbox')
             options.add_argument('--disable-dev-shm-usage')
-            options.add_argument(f'user-agent={self.ua.random}')
+            apply_browser_profile(options)
             
             self.driver = uc.Chrome(options=options, version_main=None)
             return True
         except Exception as e:
-            print(f"Error initializing driver: {e}")
+            self.record_error(f"Error initializing driver: {e}")
             return False
     
+    def classify_link(self, href):
+        """Classify a search result link as facebook, instagram, tiktok or website"""
+        if not href or not href.startswith('http'):
+            return None
+        
+        href_lower = href.lower()
+        domain = urlparse(href_lower).netloc.split(':')[0]
+        if domain.startswith('www.'):
+            domain = domain[4:]
+        
+        if domain.endswith('facebook.com'):
+            return 'facebook' if '/groups/' not in href_lower else None
+        if domain.endswith('instagram.com'):
+            return 'instagram' if '/p/' not in href_lower and '/reel/' not in href_lower else None
+        if domain.endswith('tiktok.com'):
+            return 'tiktok' if '/video/' not in href_lower else None
+        if 'google.' in domain or matches_domain(domain, NON_WEBSITE_DOMAINS | DIRECTORY_DOMAINS):
+            return None
+        return 'website'
+    
+    def discover_profiles(self, business_name, location=""):
+        """Find Facebook, Instagram, TikTok and website URLs with a single Google search
+        Results are cached by normalized business name + city so reruns skip the search
+        """
+        cached = self.discovery_cache.get(business_name, location)
+        if cached is not None:
+            return cached
+        if self.discovery_cache.has_failed(business_name, location):
+            # Still a failure for this lookup, so its step is retried on --resume
+            self.record_error(f"Skipping discovery for {business_name}: its search already failed")
+            return {}
+        
+        if not self.driver:
+            if not self.init_driver():
+                self.discovery_cache.put_failure(business_name, location)
+                return {}
+        
+        try:
+            query = f"{business_name} {location} facebook OR instagram OR tiktok"
+            search_url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
+            load_page(self.driver, search_url)
+            pause(3)
+            
+            discovery = {}
+            websites = []
+            for link in self.driver.find_elements(By.CSS_SELECTOR, "a[href^='http']"):
+                href = link.get_attribute('href')
+                kind = self.classify_link(href)
+                if kind == 'website':
+                    websites.append(href)
+                elif kind and f'{kind}_url' not in discovery:
+                    discovery[f'{kind}_url'] = href
+            
+            # Prefer a domain carrying the business's name over the first other result
+            words = name_words(business_name)
+            named = [href for href in websites if any(w in urlparse(href).netloc.lower() for w in words)]
+            if named or websites:
+                discovery['website'] = (named or websites)[0]
+            
+            self.discovery_cache.put(business_name, location, discovery)
+            return discovery
+        except Exception as e:
+            self.record_error(f"Error discovering social profiles: {e}")
+            self.discovery_cache.put_failure(business_name, location)
+            return {}
+    
+    def add_discovered_website(self, business_name, location, data, search=True):
+        """Fill in the business website found by discovery if the listing has none
+        With search=False only an earlier (cached) discovery is used. Returns the website added.
+        """
+        if not SOCIAL_SETTINGS['combined_discovery'] or data.get('website') not in (None, '', 'N/A'):
+            return None
+        if search:
+            discovery = self.discover_profiles(business_name, location)
+        else:
+            discovery = self.discovery_cache.get(business_name, location) or {}
+        website = discovery.get('website')
+        # Re-checked so entries cached before a directory was listed are not used
+        if website and self.classify_link(website) == 'website':
+            data['website'] = website
+            return website
+        return None
+    
     def find_facebook_page(self, business_name, location=""):
         """Search and find Facebook page for a business"""
         if not self.driver:
@@ -51,8 +176,8 @@ class SocialMediaScraper:
         try:
             query = f"{business_name} {location} facebook"
             search_url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
-            self.driver.get(search_url)
-            time.sleep(3)
+            load_page(self.driver, search_url)
+            pause(3)
             
             # Look for Facebook links in search results
             facebook_links = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='facebook.com']")
@@ -64,7 +189,7 @@ class SocialMediaScraper:
             
             return {}
         except Exception as e:
-            print(f"Error finding Facebook page: {e}")
+            self.record_error(f"Error finding Facebook page: {e}")
             return {}
     
     def scrape_facebook_page(self, facebook_url):
@@ -78,8 +203,8 @@ class SocialMediaScraper:
         
         try:
             print(f"Scraping Facebook: {facebook_url}")
-            self.driver.get(facebook_url)
-            time.sleep(5)
+            load_page(self.driver, facebook_url)
+            pause(5)
             
             data = {'facebook_url': facebook_url}
             
@@ -90,14 +215,14 @@ class SocialMediaScraper:
                 
                 # Pattern for followers: "X followers" or "X people like this"
                 follower_patterns = [
-                    r'([\d,]+)\s*(?:followers|people\s+like)',
-                    r'([\d,]+)\s*(?:likes)',
+                    r'([\d.,]+\s*[KMB]?)\s*(?:followers|people\s+like)',
+                    r'([\d.,]+\s*[KMB]?)\s*(?:likes)',
                 ]
                 
                 for pattern in follower_patterns:
                     match = re.search(pattern, page_text, re.IGNORECASE)
                     if match:
-                        data['facebook_followers'] = match.group(1).replace(',', '')
+                        data['facebook_followers'] = parse_metric(match.group(1))
                         break
                 
                 # Extract email from page
@@ -124,7 +249,7 @@ class SocialMediaScraper:
             return data
             
         except Exception as e:
-            print(f"Error scraping Facebook page: {e}")
+            self.record_error(f"Error scraping Facebook page: {e}")
             return {}
     
     def find_instagram_page(self, business_name, location=""):
@@ -136,8 +261,8 @@ class SocialMediaScraper:
         try:
             query = f"{business_name} {location} instagram"
             search_url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
-            self.driver.get(search_url)
-            time.sleep(3)
+            load_page(self.driver, search_url)
+            pause(3)
             
             # Look for Instagram links
             instagram_links = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='instagram.com']")
@@ -149,7 +274,7 @@ class SocialMediaScraper:
             
             return {}
         except Exception as e:
-            print(f"Error finding Instagram page: {e}")
+            self.record_error(f"Error finding Instagram page: {e}")
             return {}
     
     def scrape_instagram_page(self, instagram_url):
@@ -163,8 +288,8 @@ class SocialMediaScraper:
         
         try:
             print(f"Scraping Instagram: {instagram_url}")
-            self.driver.get(instagram_url)
-            time.sleep(5)
+            load_page(self.driver, instagram_url)
+            pause(5)
             
             data = {'instagram_url': instagram_url}
             
@@ -175,13 +300,13 @@ class SocialMediaScraper:
                 # Instagram follower patterns
                 follower_patterns = [
                     r'"edge_followed_by":{"count":(\d+)}',
-                    r'(\d+(?:,\d+)?)\s*followers',
+                    r'([\d.,]+\s*[KMB]?)\s*followers',
                 ]
                 
                 for pattern in follower_patterns:
                     match = re.search(pattern, page_source, re.IGNORECASE)
                     if match:
-                        data['instagram_followers'] = match.group(1).replace(',', '')
+                        data['instagram_followers'] = parse_metric(match.group(1))
                         break
                 
                 # Extract email from bio
@@ -196,7 +321,7 @@ class SocialMediaScraper:
             return data
             
         except Exception as e:
-            print(f"Error scraping Instagram page: {e}")
+            self.record_error(f"Error scraping Instagram page: {e}")
             return {}
     
     def find_tiktok_page(self, business_name, location=""):
@@ -208,8 +333,8 @@ class SocialMediaScraper:
         try:
             query = f"{business_name} {location} tiktok"
             search_url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
-            self.driver.get(search_url)
-            time.sleep(3)
+            load_page(self.driver, search_url)
+            pause(3)
             
             # Look for TikTok links
             tiktok_links = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='tiktok.com']")
@@ -221,7 +346,7 @@ class SocialMediaScraper:
             
             return {}
         except Exception as e:
-            print(f"Error finding TikTok page: {e}")
+            self.record_error(f"Error finding TikTok page: {e}")
             return {}
     
     def scrape_tiktok_page(self, tiktok_url):
@@ -235,8 +360,8 @@ class SocialMediaScraper:
         
         try:
             print(f"Scraping TikTok: {tiktok_url}")
-            self.driver.get(tiktok_url)
-            time.sleep(5)
+            load_page(self.driver, tiktok_url)
+            pause(5)
             
             data = {'tiktok_url': tiktok_url}
             
@@ -246,13 +371,13 @@ class SocialMediaScraper:
                 # TikTok follower patterns
                 follower_patterns = [
                     r'"followerCount":(\d+)',
-                    r'(\d+(?:,\d+)?)\s*followers',
+                    r'([\d.,]+\s*[KMB]?)\s*followers',
                 ]
                 
                 for pattern in follower_patterns:
                     match = re.search(pattern, page_source, re.IGNORECASE)
                     if match:
-                        data['tiktok_followers'] = match.group(1).replace(',', '')
+                        data['tiktok_followers'] = parse_metric(match.group(1))
                         break
                 
             except Exception as e:
@@ -261,9 +386,107 @@ class SocialMediaScraper:
             return data
             
         except Exception as e:
-            print(f"Error scraping TikTok page: {e}")
+            self.record_error(f"Error scraping TikTok page: {e}")
             return {}
     
+    def scrape_platform(self, platform, business_name, location="", existing_data=None):
+        """Find and scrape a single social media platform for a business (None if the lookup failed)"""
+        if existing_data is None:
+            existing_data = {}
+        errors = self.error_count
+        
+        finders = {
+            'facebook': self.find_facebook_page,
+            'instagram': self.find_instagram_page,
+            'tiktok': self.find_tiktok_page,
+        }
+        scrapers = {
+            'facebook': self.scrape_facebook_page,
+            'instagram': self.scrape_instagram_page,
+            'tiktok': self.scrape_tiktok_page,
+        }
+        url_key = f'{platform}_url'
+        
+        data = {}
+        if not existing_data.get(url_key):
+            if SOCIAL_SETTINGS['combined_discovery']:
+                discovered = self.discover_profiles(business_name, location).get(url_key)
+                if discovered:
+                    data[url_key] = discovered
+            else:
+                data.update(finders[platform](business_name, location))
+        
+        url = data.get(url_key) or existing_data.get(url_key)
+        if url:
+            data[url_key] = url
+            data.update(scrapers[platform](url))
+            pause(2)
+        
+        if self.error_count > errors:
+            return None
+        return data
+    
+    def get_platform_scraper(self, platform):
+        """Get the pooled scraper that owns the browser for a platform"""
+        if platform not in self.platform_scrapers:
+            self.platform_scrapers[platform] = SocialMediaScraper(headless=self.headless, concurrent=False)
+        return self.platform_scrapers[platform]
+    
+    def platform_executor(self, platform):
+        """One thread per platform, so lookups stuck past their timeout cannot pile up threads"""
+        if platform not in self.platform_executors:
+            self.platform_executors[platform] = ThreadPoolExecutor(max_workers=1,
+                                                                   thread_name_prefix=f'social-{platform}')
+        return self.platform_executors[platform]
+    
+    def retire_platform_scraper(self, platform, future):
+        """Drop a platform's scraper after a timeout, quitting its browser now so the stuck call fails"""
+        future.cancel()  # still queued behind an earlier stuck lookup
+        scraper = self.platform_scrapers.pop(platform, None)
+        if scraper:
+            scraper.close()
+    
+    def scrape_platforms(self, platforms, business_name, location="", existing_data=None):
+        """Find and scrape several platforms at once, each on its own browser with its own timeout
+        Returns a dict of platform -> scraped data; platforms that time out or fail map to None
+        """
+        if existing_data is None:
+            existing_data = {}
+        
+        # Discover every profile with one search up front instead of one search per platform
+        if SOCIAL_SETTINGS['combined_discovery']:
+            existing_data = dict(existing_data)
+            for key, url in self.discover_profiles(business_name, location).items():
+                if key != 'website' and not existing_data.get(key):
+                    existing_data[key] = url
+        
+        # A thread per platform: a platform stuck past its timeout cannot delay the others
+        futures = {}
+        for platform in platforms:
+            scraper = self.get_platform_scraper(platform)
+            futures[platform] = self.platform_executor(platform).submit(
+                scraper.scrape_platform, platform, business_name, location, dict(existing_data)
+            )
+        
+        results = {}
+        started = time.time()
+        timeouts = SOCIAL_SETTINGS['platform_timeouts']
+        for platform, future in futures.items():
+            remaining = max(0, timeouts.get(platform, SCRAPER_SETTINGS['timeout']) - (time.time() - started))
+            wait([future], timeout=remaining)
+            if not future.done():
+                print(f"  ⏱ {platform.title()} lookup timed out for {business_name}")
+                self.retire_platform_scraper(platform, future)
+                results[platform] = None
+                continue
+            try:
+                results[platform] = future.result()
+            except Exception as e:
+                print(f"Error scraping {platform.title()}: {e}")
+                results[platform] = None
+        
+        return results
+    
     def scrape_all_social_media(self, business_name, location="", existing_data=None):
         """Scrape all social media platforms for a business"""
         if existing_data is None:
@@ -272,41 +495,33 @@ class SocialMediaScraper:
         # Find social media pages
         print(f"\nSearching social media for: {business_name}")
         
-        # Facebook
-        if 'facebook_url' not in existing_data or not existing_data.get('facebook_url'):
-            fb_data = self.find_facebook_page(business_name, location)
-            existing_data.update(fb_data)
+        self.add_discovered_website(business_name, location, existing_data)
         
-        if existing_data.get('facebook_url'):
-            fb_details = self.scrape_facebook_page(existing_data['facebook_url'])
-            existing_data.update(fb_details)
-            time.sleep(2)
+        if self.concurrent:
+            results = self.scrape_platforms(SOCIAL_PLATFORMS, business_name, location, existing_data)
+            for platform in SOCIAL_PLATFORMS:
+                existing_data.update(results[platform] or {})
+            return existing_data
         
-        # Instagram
-        if 'instagram_url' not in existing_data or not existing_data.get('instagram_url'):
-            ig_data = self.find_instagram_page(business_name, location)
-            existing_data.update(ig_data)
-        
-        if existing_data.get('instagram_url'):
-            ig_details = self.scrape_instagram_page(existing_data['instagram_url'])
-            existing_data.update(ig_details)
-            time.sleep(2)
-        
-        # TikTok
-        if 'tiktok_url' not in existing_data or not existing_data.get('tiktok_url'):
-            tt_data = self.find_tiktok_page(business_name, location)
-            existing_data.update(tt_data)
-        
-        if existing_data.get('tiktok_url'):
-            tt_details = self.scrape_tiktok_page(existing_data['tiktok_url'])
-            existing_data.update(tt_details)
-            time.sleep(2)
+        for platform in SOCIAL_PLATFORMS:
+            existing_data.update(self.scrape_platform(platform, business_name, location, existing_data) or {})
         
         return existing_data
     
     def close(self):
         """Close the browser driver"""
+        self.closed = True
         if self.driver:
-            self.driver.quit()
-            self.driver = None
+            driver, self.driver = self.driver, None
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"Error closing browser: {e}")
+        
+        for scraper in self.platform_scrapers.values():
+            scraper.close()
+        self.platform_scrapers = {}
+        for executor in self.platform_executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.platform_executors = {}
 
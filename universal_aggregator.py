@@ -2,23 +2,32 @@
 Universal Data Aggregator - Combines data from all sources
 """
 
-import pandas as pd
-import json
 import re
 from datetime import datetime
 from generic_config import UNIVERSAL_DATA_FIELDS, SCRAPER_SETTINGS
-from pdf_exporter import PDFExporter
+from metric_parser import parse_metric
+from ranking_index import RankingIndex
+from record_store import RecordStore, records_to_dataframe
+from json_records import write_records, iter_records
+from instrumentation import count, timer
 
 class UniversalAggregator:
-    def __init__(self):
-        self.all_data = []
-        self.stats = {
-            'total_records': 0,
-            'by_platform': {},
-            'by_category': {},
-            'by_type': {}
-        }
-        self.pdf_exporter = PDFExporter()
+    def __init__(self, compact=None):
+        if compact is None:
+            compact = SCRAPER_SETTINGS.get('compact_records', False)
+        # Column-oriented storage keeps memory flat for millions of records
+        self.all_data = RecordStore() if compact else []
+        self.reset_stats()
+        self._pdf_exporter = None
+        self.ranking = RankingIndex()
+    
+    @property
+    def pdf_exporter(self):
+        """PDF exporter, created on first use (reportlab is slow to import)"""
+        if self._pdf_exporter is None:
+            from pdf_exporter import PDFExporter
+            self._pdf_exporter = PDFExporter()
+        return self._pdf_exporter
     
     def add_record(self, record):
         """Add a record to the collection"""
@@ -28,13 +37,47 @@ class UniversalAggregator:
                 record['scraped_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
             self.all_data.append(record)
+            count('records')
             self.update_stats(record)
+            self.ranking.sync(self.all_data)
     
     def add_records(self, records):
         """Add multiple records"""
         for record in records:
             self.add_record(record)
     
+    def reset_stats(self):
+        """Clear the statistics"""
+        self.stats = {
+            'total_records': 0,
+            'by_platform': {},
+            'by_category': {},
+            'by_type': {}
+        }
+    
+    def replace_records(self, records):
+        """Replace all records, recomputing the statistics and the ranking index"""
+        self.all_data = records
+        self.reset_stats()
+        for record in self.all_data:
+            self.update_stats(record)
+        self.stats['total_records'] = len(self.all_data)
+        self.ranking.invalidate()
+    
+    def update_record(self, index, changes):
+        """Change fields of a stored record in place, keeping statistics and ranking current"""
+        record = self.all_data[index]
+        for field, group in (('platform', 'by_platform'), ('category', 'by_category'), ('type', 'by_type')):
+            if field in changes:
+                counts = self.stats[group]
+                old = record.get(field, 'unknown')
+                counts[old] = counts.get(old, 0) - 1
+                if counts[old] <= 0:
+                    del counts[old]
+                counts[changes[field]] = counts.get(changes[field], 0) + 1
+        record.update(changes)
+        self.ranking.invalidate()
+    
     def update_stats(self, record):
         """Update statistics"""
         self.stats['total_records'] = len(self.all_data)
@@ -48,13 +91,14 @@ class UniversalAggregator:
         type_val = record.get('type', 'unknown')
         self.stats['by_type'][type_val] = self.stats['by_type'].get(type_val, 0) + 1
     
+    @timer('export.csv')
     def export_to_csv(self, filename='universal_scraped_data.csv'):
         """Export data to CSV"""
         if not self.all_data:
             print("No data to export!")
             return None
         
-        df = pd.DataFrame(self.all_data)
+        df = records_to_dataframe(self.all_data)
         
         # Reorder columns to prioritize universal fields
         existing_universal = [col for col in UNIVERSAL_DATA_FIELDS if col in df.columns]
@@ -66,13 +110,25 @@ class UniversalAggregator:
         print(f"Total records: {len(df)}")
         return filename
     
-    def export_to_excel(self, filename='universal_scraped_data.xlsx'):
+    @timer('export.excel')
+    def export_to_excel(self, filename='universal_scraped_data.xlsx', streaming=None):
         """Export data to Excel with multiple sheets by category"""
         if not self.all_data:
             print("No data to export!")
             return None
         
-        df = pd.DataFrame(self.all_data)
+        if streaming is None:
+            streaming = SCRAPER_SETTINGS.get('streaming_excel', True)
+        if streaming:
+            # Write-only workbook filled in one pass; memory does not grow with row count
+            from excel_exporter import stream_records_to_excel
+            stream_records_to_excel(self.all_data, filename, UNIVERSAL_DATA_FIELDS)
+            print(f"\n✓ Data exported to {filename}")
+            print(f"Total records: {len(self.all_data)}")
+            return filename
+        
+        import pandas as pd
+        df = records_to_dataframe(self.all_data)
         
         # Reorder columns
         existing_universal = [col for col in UNIVERSAL_DATA_FIELDS if col in df.columns]
@@ -103,26 +159,30 @@ class UniversalAggregator:
         print(f"Total records: {len(df)}")
         return filename
     
+    @timer('export.json')
     def export_to_json(self, filename='universal_scraped_data.json'):
         """Export data to JSON"""
         if not self.all_data:
             print("No data to export!")
             return None
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump({
-                'metadata': {
-                    'total_records': len(self.all_data),
-                    'scraped_date': datetime.now().isoformat(),
-                    'statistics': self.stats
-                },
-                'data': self.all_data
-            }, f, ensure_ascii=False, indent=2)
+        # Metadata on the first line, then one record per line (see json_records)
+        write_records(filename, {
+            'total_records': len(self.all_data),
+            'scraped_date': datetime.now().isoformat(),
+            'statistics': self.stats
+        }, self.all_data)
         
         print(f"\n✓ Data exported to {filename}")
         print(f"Total records: {len(self.all_data)}")
         return filename
     
+    def load_json(self, filename):
+        """Replace the records with those of an exported JSON file, read lazily"""
+        records = iter_records(filename)
+        self.replace_records(RecordStore(records) if isinstance(self.all_data, RecordStore) else list(records))
+        return len(self.all_data)
+    
     def get_statistics(self):
         """Get scraping statistics"""
         return {
@@ -130,7 +190,8 @@ class UniversalAggregator:
             'by_platform': self.stats['by_platform'],
             'by_category': self.stats['by_category'],
             'by_type': self.stats['by_type'],
-            'fields_present': list(set([field for record in self.all_data for field in record.keys()]))
+            'fields_present': self.all_data.field_names() if isinstance(self.all_data, RecordStore)
+                              else list(set([field for record in self.all_data for field in record.keys()]))
         }
     
     def filter_by_category(self, category):
@@ -145,39 +206,25 @@ class UniversalAggregator:
         """Filter records by type"""
         return [r for r in self.all_data if r.get('type') == type_val]
     
-    def get_top_records(self, sort_by='views', limit=100):
-        """Get top records sorted by a field"""
+    def get_top_records(self, sort_by='views', limit=100, category=None, platform=None):
+        """Get top records sorted by a field, optionally within a category/platform"""
         if not self.all_data:
             return []
         
-        # Convert views to numbers for sorting
-        sortable_data = []
-        for record in self.all_data:
-            record_copy = record.copy()
-            views = record.get('views', 0)
-            if isinstance(views, str):
-                # Try to parse "1.2M" format
-                try:
-                    if 'm' in views.lower():
-                        record_copy['_sort_views'] = float(views.lower().replace('m', '')) * 1000000
-                    elif 'k' in views.lower():
-                        record_copy['_sort_views'] = float(views.lower().replace('k', '')) * 1000
-                    else:
-                        record_copy['_sort_views'] = float(views.replace(',', ''))
-                except:
-                    record_copy['_sort_views'] = 0
-            else:
-                record_copy['_sort_views'] = views or 0
-            sortable_data.append(record_copy)
-        
-        sorted_data = sorted(sortable_data, key=lambda x: x.get('_sort_views', 0), reverse=True)
-        
-        # Remove temporary sort field
-        for record in sorted_data:
-            record.pop('_sort_views', None)
-        
-        return sorted_data[:limit]
+        if sort_by in self.ranking.fields:
+            self.ranking.sync(self.all_data)
+            positions = self.ranking.top_positions(sort_by, limit, category=category, platform=platform)
+            return [self.all_data[i] for i in positions]
+        
+        # Fields without an index fall back to a full sort
+        records = self.all_data
+        if category is not None:
+            records = [r for r in records if r.get('category') == category]
+        if platform is not None:
+            records = [r for r in records if r.get('platform') == platform]
+        return sorted(records, key=lambda r: parse_metric(r.get(sort_by)), reverse=True)[:limit]
     
+    @timer('export.pdf')
     def export_to_pdf(self, filename='scraped_data_report.pdf', category_specific=False):
         """Export data to PDF with beautiful formatting"""
         if not self.all_data:
@@ -187,20 +234,8 @@ class UniversalAggregator:
         stats = self.get_statistics()
         
         if category_specific:
-            # Export each category as separate PDF
-            from collections import defaultdict
-            by_category = defaultdict(list)
-            for record in self.all_data:
-                category = record.get('category', 'Unknown')
-                by_category[category].append(record)
-            
-            pdf_files = []
-            for category, records in by_category.items():
-                safe_name = str(category).replace(' ', '_').replace('/', '_')[:50]
-                pdf_file = f"{safe_name}_report.pdf"
-                result = self.pdf_exporter.export_category_pdf(records, category, pdf_file)
-                if result:
-                    pdf_files.append(result)
+            # Export each category as separate PDF (rendered in parallel)
+            pdf_files = self.pdf_exporter.export_category_pdfs(self.all_data)
             
             print(f"\n✓ Exported {len(pdf_files)} category-specific PDF files")
             return pdf_files
@@ -208,29 +243,34 @@ class UniversalAggregator:
             # Export all data to one PDF
             return self.pdf_exporter.export_data_to_pdf(self.all_data, stats, filename)
     
-    def export_all_formats(self, base_filename='scraped_data'):
+    def export_all_formats(self, base_filename='scraped_data', formats=None):
         """Export to all formats: CSV, Excel, JSON, and PDF"""
+        formats = formats or ['csv', 'excel', 'json', 'pdf']
         files = {}
         
         # CSV
-        csv_file = self.export_to_csv(f'{base_filename}.csv')
-        if csv_file:
-            files['csv'] = csv_file
+        if 'csv' in formats:
+            csv_file = self.export_to_csv(f'{base_filename}.csv')
+            if csv_file:
+                files['csv'] = csv_file
         
         # Excel
-        excel_file = self.export_to_excel(f'{base_filename}.xlsx')
-        if excel_file:
-            files['excel'] = excel_file
+        if 'excel' in formats:
+            excel_file = self.export_to_excel(f'{base_filename}.xlsx')
+            if excel_file:
+                files['excel'] = excel_file
         
         # JSON
-        json_file = self.export_to_json(f'{base_filename}.json')
-        if json_file:
-            files['json'] = json_file
+        if 'json' in formats:
+            json_file = self.export_to_json(f'{base_filename}.json')
+            if json_file:
+                files['json'] = json_file
         
         # PDF
-        pdf_file = self.export_to_pdf(f'{base_filename}_report.pdf')
-        if pdf_file:
-            files['pdf'] = pdf_file
+        if 'pdf' in formats:
+            pdf_file = self.export_to_pdf(f'{base_filename}_report.pdf')
+            if pdf_file:
+                files['pdf'] = pdf_file
         
         return files
 
@@ -4,10 +4,11 @@ Scrape data for ANYTHING in the world!
 """
 
 import time
-from youtube_scraper import YouTubeScraper
-from wikipedia_scraper import WikipediaScraper
-from google_search_scraper import GoogleSearchScraper
+import argparse
 from universal_aggregator import UniversalAggregator
+from work_queue import run_jobs
+from instrumentation import pause, write_report
+from profiler import category_boundary, run_profiled
 from generic_config import GLOBAL_CATEGORIES, AVAILABLE_PLATFORMS, SCRAPER_SETTINGS
 
 def scrape_category(category_key, category_config, aggregator):
@@ -42,15 +43,18 @@ def scrape_category(category_key, category_config, aggregator):
             records = []
             
             if platform == 'youtube':
+                from youtube_scraper import YouTubeScraper
                 scraper = YouTubeScraper(headless=SCRAPER_SETTINGS['headless'])
                 records = scraper.search_videos(query, max_results=platform_max)
                 scraper.close()
             
             elif platform == 'wikipedia':
+                from wikipedia_scraper import WikipediaScraper
                 scraper = WikipediaScraper()
                 records = scraper.search_articles(query, max_results=platform_max)
             
             elif platform == 'google':
+                from google_search_scraper import GoogleSearchScraper
                 scraper = GoogleSearchScraper(headless=SCRAPER_SETTINGS['headless'])
                 records = scraper.search(query, search_type='all', max_results=platform_max)
                 scraper.close()
@@ -74,13 +78,14 @@ def scrape_category(category_key, category_config, aggregator):
             total_found += len(records)
             print(f"    ✓ Found {len(records)} records from {platform}")
             
-            time.sleep(SCRAPER_SETTINGS['delay_between_requests'])
+            pause(SCRAPER_SETTINGS['delay_between_requests'])
             
         except Exception as e:
             print(f"    ✗ Error scraping {platform}: {e}")
             continue
     
     print(f"\n  ✓ Total records found for {category_key}: {total_found}")
+    category_boundary(category_key)
     return total_found
 
 def main():
@@ -139,26 +144,36 @@ def main():
     
     print(f"\n✅ Will scrape {len(categories_to_scrape)} category/categories")
     print("Starting in 3 seconds...")
-    time.sleep(3)
+    pause(3, 'countdown')
     
     # Scrape each category
     start_time = time.time()
     total_records = 0
     
-    for i, category_key in enumerate(categories_to_scrape, 1):
-        print(f"\n\n[{i}/{len(categories_to_scrape)}] Processing category...")
-        
-        category_config = GLOBAL_CATEGORIES[category_key]
-        records_found = scrape_category(category_key, category_config, aggregator)
-        total_records += records_found
-        
-        # Progress update
-        elapsed = time.time() - start_time
-        avg_time = elapsed / i
-        remaining = avg_time * (len(categories_to_scrape) - i)
-        print(f"\n⏱  Progress: {i}/{len(categories_to_scrape)} | "
-              f"Time elapsed: {elapsed/60:.1f} min | "
-              f"Est. remaining: {remaining/60:.1f} min")
+    if SCRAPER_SETTINGS.get('worker_processes', 1) > 1:
+        # (category, platform) jobs spread over worker processes, each with its own browser
+        results = run_jobs(categories_to_scrape)
+        for category_key, records in results.items():
+            for record in records:
+                aggregator.add_record(record)
+            total_records += len(records)
+            print(f"  ✓ Total records found for {category_key}: {len(records)}")
+    
+    else:
+        for i, category_key in enumerate(categories_to_scrape, 1):
+            print(f"\n\n[{i}/{len(categories_to_scrape)}] Processing category...")
+            
+            category_config = GLOBAL_CATEGORIES[category_key]
+            records_found = scrape_category(category_key, category_config, aggregator)
+            total_records += records_found
+            
+            # Progress update
+            elapsed = time.time() - start_time
+            avg_time = elapsed / i
+            remaining = avg_time * (len(categories_to_scrape) - i)
+            print(f"\n⏱  Progress: {i}/{len(categories_to_scrape)} | "
+                  f"Time elapsed: {elapsed/60:.1f} min | "
+                  f"Est. remaining: {remaining/60:.1f} min")
     
     # Export data
     print("\n" + "="*70)
@@ -233,6 +248,7 @@ def main():
     total_time = time.time() - start_time
     print(f"\n⏱  Total Time: {total_time/60:.2f} minutes")
     print(f"⚡ Average: {stats['total_records']/(total_time/60):.1f} records/minute")
+    write_report(SCRAPER_SETTINGS['metrics_report'])
     
     print("\n" + "="*70)
     print("✅ SCRAPING COMPLETE!")
@@ -267,8 +283,16 @@ def main():
         print(f"Could not start auto-update: {e}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Universal Global Data Scraper")
+    parser.add_argument('--profile', action='store_true',
+                        help="Profile the run (cProfile, sampled flamegraph stacks, top allocations)")
+    args = parser.parse_args()
+    
     try:
-        main()
+        if args.profile:
+            run_profiled(main, prefix='universal_profile')
+        else:
+            main()
     except KeyboardInterrupt:
         print("\n\n⚠️  Scraping interrupted by user.")
         print("Data scraped so far has been saved.")
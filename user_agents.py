@@ -0,0 +1,112 @@
+"""
+User Agents - Bundled user-agent pool with consistent header profiles
+Every scraper draws from the same pool: requests sessions get a fresh profile per request
+(or per session), Chrome drivers get one per browser. Each profile keeps the User-Agent,
+Accept, Accept-Language and sec-ch-ua headers consistent with the browser it claims to be.
+Bump USER_AGENT_POOL_VERSION when refreshing the list.
+"""
+
+import random
+import threading
+
+USER_AGENT_POOL_VERSION = "2024.10"
+
+# Headers a profile controls; ones a browser does not send are None so requests drops them
+PROFILE_HEADERS = ('User-Agent', 'Accept', 'Accept-Language', 'sec-ch-ua', 'sec-ch-ua-mobile', 'sec-ch-ua-platform')
+
+CHROMIUM_ACCEPT = ('text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,'
+                   'image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7')
+FIREFOX_ACCEPT = 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8'
+SAFARI_ACCEPT = 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
+
+PLATFORMS = {
+    'Windows': 'Windows NT 10.0; Win64; x64',
+    'macOS': 'Macintosh; Intel Mac OS X 10_15_7',
+    'Linux': 'X11; Linux x86_64',
+}
+
+def chromium_profile(version, platform, brand='Google Chrome', language='en-US,en;q=0.9'):
+    user_agent = (f"Mozilla/5.0 ({PLATFORMS[platform]}) AppleWebKit/537.36 (KHTML, like Gecko) "
+                  f"Chrome/{version}.0.0.0 Safari/537.36")
+    if brand == 'Microsoft Edge':
+        user_agent += f" Edg/{version}.0.0.0"
+    return {
+        'browser': 'chromium',
+        'User-Agent': user_agent,
+        'Accept': CHROMIUM_ACCEPT,
+        'Accept-Language': language,
+        'sec-ch-ua': f'"{brand}";v="{version}", "Chromium";v="{version}", "Not_A Brand";v="24"',
+        'sec-ch-ua-mobile': '?0',
+        'sec-ch-ua-platform': f'"{platform}"',
+    }
+
+def firefox_profile(version, platform, language='en-US,en;q=0.5'):
+    return {
+        'browser': 'firefox',
+        'User-Agent': f"Mozilla/5.0 ({PLATFORMS[platform]}; rv:{version}.0) Gecko/20100101 Firefox/{version}.0",
+        'Accept': FIREFOX_ACCEPT,
+        'Accept-Language': language,
+    }
+
+def safari_profile(version, language='en-US,en;q=0.9'):
+    return {
+        'browser': 'safari',
+        'User-Agent': (f"Mozilla/5.0 ({PLATFORMS['macOS']}) AppleWebKit/605.1.15 (KHTML, like Gecko) "
+                       f"Version/{version} Safari/605.1.15"),
+        'Accept': SAFARI_ACCEPT,
+        'Accept-Language': language,
+    }
+
+PROFILES = [
+    chromium_profile(130, 'Windows'),
+    chromium_profile(129, 'Windows'),
+    chromium_profile(129, 'Windows', language='en-GB,en-US;q=0.9,en;q=0.8'),
+    chromium_profile(130, 'macOS'),
+    chromium_profile(128, 'macOS'),
+    chromium_profile(129, 'Linux'),
+    chromium_profile(130, 'Windows', brand='Microsoft Edge'),
+    chromium_profile(129, 'Windows', brand='Microsoft Edge'),
+    firefox_profile(131, 'Windows'),
+    firefox_profile(130, 'Windows'),
+    firefox_profile(131, 'macOS'),
+    firefox_profile(131, 'Linux'),
+    safari_profile('17.6'),
+    safari_profile('18.0'),
+]
+
+class UserAgentRotator:
+    """Hands out profiles in shuffled rounds, so no profile repeats until all were used"""
+    def __init__(self, profiles=None, seed=None):
+        self.profiles = profiles or PROFILES
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.queues = {}
+
+    def next_profile(self, browser=None):
+        """The next profile, optionally only of one browser family (e.g. 'chromium' for Chrome)"""
+        with self.lock:
+            queue = self.queues.get(browser)
+            if not queue:
+                queue = [p for p in self.profiles if browser is None or p['browser'] == browser]
+                self.random.shuffle(queue)
+                self.queues[browser] = queue
+            return queue.pop()
+
+_rotator = UserAgentRotator()
+
+def header_profile():
+    """Request headers for the next profile (absent browser headers are None)"""
+    profile = _rotator.next_profile()
+    return {name: profile.get(name) for name in PROFILE_HEADERS}
+
+def random_user_agent():
+    """The User-Agent of the next profile"""
+    return _rotator.next_profile()['User-Agent']
+
+def apply_browser_profile(options):
+    """Give a Chrome driver a Chrome user-agent and matching language (one profile per browser)"""
+    # Chrome's own client hints would contradict a Firefox or Safari user-agent
+    profile = _rotator.next_profile('chromium')
+    options.add_argument(f"user-agent={profile['User-Agent']}")
+    options.add_argument(f"--lang={profile['Accept-Language'].split(',')[0]}")
+    return profile
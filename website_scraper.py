@@ -1,69 +1,181 @@
 """
 Website Scraper to extract detailed information from clinic/hospital websites
+Besides the homepage, a few same-site pages that look like contact/about pages are read
+(within a page and time budget, honouring robots.txt) and their details merged in.
 """
 
-import requests
 from bs4 import BeautifulSoup
+import codecs
+import itertools
 import re
+import threading
 import time
-from urllib.parse import urljoin, urlparse
-from fake_useragent import UserAgent
-from config import SCRAPER_SETTINGS
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urldefrag, urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+import requests
+from config import SCRAPER_SETTINGS, WEBSITE_SETTINGS
+from http_client import html_encoding, iter_capped, shared_session, sniff_html
+from instrumentation import count, pause, timer
+from retry_engine import CircuitOpenError
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+IGNORED_EMAIL_DOMAINS = ['example.com', 'test.com', 'domain.com', 'email.com']
+# Pakistan phone number patterns
+PHONE_PATTERNS = [re.compile(p) for p in (
+    r'\+92\s?[0-9]{2,3}\s?[0-9]{7}',  # +92 format
+    r'0[0-9]{2,3}\s?[0-9]{7}',  # 03XX format
+    r'\([0-9]{2,3}\)\s?[0-9]{7}',  # (021) format
+    r'[0-9]{4}[\s-]?[0-9]{7}',  # 0214-XXXXXXX
+)]
+# Patterns like "Established 1990", "Since 1990", etc.
+YEAR_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'established\s+(?:in\s+)?(\d{4})',
+    r'since\s+(\d{4})',
+    r'founded\s+(?:in\s+)?(\d{4})',
+    r'(\d{4})\s*-\s*established',
+)]
+MAX_CONTACTS = 3  # emails/phones kept per website
+MAX_SERVICES = 15
+READ_CHUNK = 16 * 1024
+# Matches are only taken this far from the end of the text read so far, so none is cut in half
+# by a chunk boundary (contacts and years are much shorter than this)
+MATCH_MARGIN = 256
+
+def valid_year(year):
+    return 1900 <= year <= 2024  # Reasonable year range
+
+class ContactScanner:
+    """Finds emails, phones and the established year in page text as it streams in"""
+    def __init__(self):
+        self.text = ''
+        self.scanned = 0
+        self.emails = []
+        self.phones = []
+        self.year = None
+        self.stopped_early = False  # text ends where the contact fields were all found
+
+    def feed(self, text, final=False):
+        """Add decoded text and scan it; final=True also scans the last MATCH_MARGIN characters"""
+        self.text += text
+        stop = len(self.text) if final else len(self.text) - MATCH_MARGIN
+        if stop <= self.scanned:
+            return
+
+        for email in self.new_matches(EMAIL_PATTERN, stop):
+            if email not in self.emails and not any(x in email.lower() for x in IGNORED_EMAIL_DOMAINS):
+                self.emails.append(email)
+        for pattern in PHONE_PATTERNS:
+            for phone in self.new_matches(pattern, stop):
+                if phone not in self.phones:
+                    self.phones.append(phone)
+        for pattern in YEAR_PATTERNS:
+            if self.year is not None:
+                break
+            for year in self.new_matches(pattern, stop, group=1):
+                if valid_year(int(year)):
+                    self.year = int(year)
+                    break
+        self.scanned = stop
+
+    def new_matches(self, pattern, stop, group=0):
+        """Matches ending between the previous stop and this one"""
+        # Start a margin back so a match that straddled the previous stop is seen whole
+        for match in pattern.finditer(self.text, max(0, self.scanned - MATCH_MARGIN)):
+            if match.end() > stop:
+                break
+            if match.end() > self.scanned:
+                yield match.group(group)
+
+    @property
+    def complete(self):
+        return len(self.emails) >= MAX_CONTACTS and len(self.phones) >= MAX_CONTACTS and self.year is not None
+
+# Links to these are never worth reading for contact details
+SKIPPED_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.zip', '.rar',
+                      '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.mp3', '.mp4', '.avi')
+ROBOTS_AGENT = '*'  # Requests rotate browser user-agents, so the generic rules apply
+ROBOTS_MAX_BYTES = 512 * 1024
+ROBOTS_TIMEOUT = 10
+
+def site_key(url):
+    """Host without a leading www., so example.com and www.example.com count as one site"""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+class RobotsCache:
+    """Parsed robots.txt rules per site, fetched once per process"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.parsers = {}
+
+    def rules(self, url, session):
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        with self.lock:
+            parser = self.parsers.get(origin)
+        if parser is None:
+            parser = self.fetch(origin, session)
+            with self.lock:
+                parser = self.parsers.setdefault(origin, parser)
+        return parser
+
+    def fetch(self, origin, session):
+        parser = RobotFileParser(origin + '/robots.txt')
+        try:
+            # One attempt: retries would eat the crawl budget
+            response = session.get(parser.url, stream=True, retries=0,
+                                   timeout=min(ROBOTS_TIMEOUT, SCRAPER_SETTINGS['timeout']))
+            if response.status_code in (401, 403) or response.status_code >= 500:
+                # Forbidden (as RobotFileParser.read treats it) or unreachable: assume all is disallowed
+                response.close()
+                parser.disallow_all = True
+            elif response.status_code >= 400:
+                response.close()
+                parser.allow_all = True  # No robots.txt
+            else:
+                body = b''.join(iter_capped(response, ROBOTS_MAX_BYTES))
+                parser.parse(body.decode('utf-8', 'replace').splitlines())
+        except (requests.RequestException, CircuitOpenError):
+            parser.disallow_all = True
+        return parser
+
+    def allowed(self, url, session):
+        return self.rules(url, session).can_fetch(ROBOTS_AGENT, url)
+
+    def crawl_delay(self, url, session):
+        return self.rules(url, session).crawl_delay(ROBOTS_AGENT)
+
+ROBOTS = RobotsCache()
 
 class WebsiteScraper:
     def __init__(self):
-        self.ua = UserAgent()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': self.ua.random,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        })
+        self.session = shared_session()  # pooled keep-alive connections, rotating browser headers
+        self.executor = None  # Started on first use for reading contact pages
+        self.error_count = 0  # Sites that could not be scraped (their result is empty)
     
     def extract_emails(self, html_content):
         """Extract email addresses from HTML content"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, html_content)
+        emails = EMAIL_PATTERN.findall(html_content)
         # Filter out common non-business emails
-        filtered_emails = [e for e in emails if not any(
-            x in e.lower() for x in ['example.com', 'test.com', 'domain.com', 'email.com']
-        )]
+        filtered_emails = [e for e in emails if not any(x in e.lower() for x in IGNORED_EMAIL_DOMAINS)]
         return list(set(filtered_emails))
     
     def extract_phones(self, html_content):
         """Extract phone numbers from HTML content"""
-        # Pakistan phone number patterns
-        patterns = [
-            r'\+92\s?[0-9]{2,3}\s?[0-9]{7}',  # +92 format
-            r'0[0-9]{2,3}\s?[0-9]{7}',  # 03XX format
-            r'\([0-9]{2,3}\)\s?[0-9]{7}',  # (021) format
-            r'[0-9]{4}[\s-]?[0-9]{7}',  # 0214-XXXXXXX
-        ]
-        
         phones = []
-        for pattern in patterns:
-            matches = re.findall(pattern, html_content)
-            phones.extend(matches)
+        for pattern in PHONE_PATTERNS:
+            phones.extend(pattern.findall(html_content))
         
         return list(set(phones))
     
     def extract_established_year(self, html_content):
         """Try to extract establishment year"""
-        # Look for patterns like "Established 1990", "Since 1990", etc.
-        patterns = [
-            r'established\s+(?:in\s+)?(\d{4})',
-            r'since\s+(\d{4})',
-            r'founded\s+(?:in\s+)?(\d{4})',
-            r'(\d{4})\s*-\s*established',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, html_content, re.IGNORECASE)
+        for pattern in YEAR_PATTERNS:
+            match = pattern.search(html_content)
             if match:
                 year = int(match.group(1))
-                if 1900 <= year <= 2024:  # Reasonable year range
+                if valid_year(year):
                     return year
         
         return None
@@ -101,10 +213,186 @@ class WebsiteScraper:
                     if text and len(text) < 100:
                         services.append(text)
         
-        return list(set(services))[:15]  # Return max 15 unique services
+        return list(set(services))[:MAX_SERVICES]  # Return max 15 unique services
     
+    def read_page(self, url, response, max_seconds=None, stop_when_found=False):
+        """Stream an HTML page through a ContactScanner, stopping at the size/time caps
+        or, with stop_when_found, as soon as every contact field is found. None if not HTML.
+        """
+        max_seconds = min(max_seconds or WEBSITE_SETTINGS['max_read_seconds'], WEBSITE_SETTINGS['max_read_seconds'])
+        chunks = iter_capped(response, WEBSITE_SETTINGS['max_body_bytes'], max_seconds, READ_CHUNK)
+        try:
+            head = next(chunks, b'')
+            content_type = response.headers.get('Content-Type')
+            if not sniff_html(content_type, head):
+                count('skipped_non_html')
+                print(f"  ⚠ Skipping {url}: not an HTML page ({content_type or 'unknown type'})")
+                return None
+
+            decoder = codecs.getincrementaldecoder(html_encoding(response, head))(errors='replace')
+            scanner = ContactScanner()
+            for chunk in itertools.chain([head], chunks):
+                scanner.feed(decoder.decode(chunk))
+                if stop_when_found and scanner.complete:
+                    count('early_stops')
+                    scanner.stopped_early = True
+                    break
+            scanner.feed(decoder.decode(b'', final=True), final=True)
+        finally:
+            chunks.close()
+
+        count('bytes', len(scanner.text))
+        if response.truncated:
+            count('truncated_bodies')
+            print(f"  ⚠ Stopped reading {url} at the size/time limit")
+        return scanner
+
+    def fetch_page(self, url, deadline=None, stop_when_found=False):
+        """Download and parse a page: (final url, scanner, soup), or None if it is not HTML"""
+        timeout = SCRAPER_SETTINGS['timeout']
+        max_seconds = retries = None
+        if deadline is not None:
+            max_seconds = deadline - time.time()
+            if max_seconds <= 0:
+                return None
+            # Retrying could outlive the deadline
+            timeout, retries = min(timeout, max_seconds), 0
+
+        response = self.session.get(url, stream=True, timeout=timeout, retries=retries)
+        try:
+            response.raise_for_status()
+            with timer('download'):
+                scanner = self.read_page(url, response, max_seconds, stop_when_found)
+        finally:
+            response.close()
+        if scanner is None:
+            return None
+
+        with timer('parse'):
+            soup = BeautifulSoup(scanner.text, 'html.parser')
+        return response.url, scanner, soup
+
+    @timer('extract')
+    def page_details(self, scanner, soup):
+        """Everything one page yields; merge_details() combines pages"""
+        details = {
+            'emails': scanner.emails,
+            'phones': scanner.phones,
+            # Tags can split "Established <b>1990</b>" in the raw HTML
+            'year': scanner.year or self.extract_established_year(soup.get_text()),
+            'description': None,
+            'services': [],
+        }
+        # A page read only up to its contact details would give a truncated description/services
+        if not scanner.stopped_early:
+            details['description'] = self.extract_description(soup)
+            details['services'] = self.extract_services(soup)
+        return details
+
+    @timer('extract')
+    def contact_links(self, page_url, soup):
+        """Same-site links most likely to hold contact details, best first"""
+        keywords = WEBSITE_SETTINGS['crawl_keywords']
+        site = site_key(page_url)
+        home = urldefrag(page_url)[0].rstrip('/')
+        scores = {}
+        for link in soup.find_all('a', href=True):
+            url = urldefrag(urljoin(page_url, link['href']))[0]
+            parsed = urlparse(url)
+            if (parsed.scheme not in ('http', 'https') or site_key(url) != site
+                    or url.rstrip('/') == home or parsed.path.lower().endswith(SKIPPED_EXTENSIONS)):
+                continue
+            words = f"{link.get_text(' ', strip=True)} {re.sub(r'[-_/.]+', ' ', parsed.path)}".lower()
+            score = sum(weight for keyword, weight in keywords.items() if keyword in words)
+            if score > scores.get(url, 0):
+                scores[url] = score
+        # Stable sort: among equal scores, links earlier on the page come first
+        return sorted(scores, key=scores.get, reverse=True)[:WEBSITE_SETTINGS['crawl_pages']]
+
+    def read_contact_page(self, url, deadline):
+        """page_details() of one extra page, or None if it could not be read in time"""
+        try:
+            page = self.fetch_page(url, deadline, WEBSITE_SETTINGS['stop_when_found'])
+        except Exception as e:
+            count('crawl_errors')
+            print(f"  ✗ Could not read {url}: {e}")
+            return None
+        if page is None:
+            return None
+        count('crawled_pages')
+        return self.page_details(page[1], page[2])
+
+    def crawl_contact_pages(self, links):
+        """Read contact pages concurrently within the per-site time budget"""
+        deadline = time.time() + WEBSITE_SETTINGS['crawl_seconds']
+        delay = None
+        if WEBSITE_SETTINGS['respect_robots']:
+            allowed = [link for link in links if ROBOTS.allowed(link, self.session)]
+            if len(allowed) < len(links):
+                count('robots_blocked', len(links) - len(allowed))
+            links = allowed
+            delay = links and ROBOTS.crawl_delay(links[0], self.session)
+        if not links:
+            return []
+
+        if delay:
+            # The site asked for a pause between requests, so read its pages one at a time
+            pages = []
+            for link in links:
+                if time.time() + delay >= deadline:
+                    break
+                pause(delay, 'crawl_delay')
+                pages.append(self.read_contact_page(link, deadline))
+            return [page for page in pages if page]
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=WEBSITE_SETTINGS['crawl_workers'],
+                                               thread_name_prefix='crawl')
+        futures = [self.executor.submit(self.read_contact_page, link, deadline) for link in links]
+        wait(futures, timeout=max(0, deadline - time.time()))
+        pages = []
+        for link, future in zip(links, futures):
+            if not future.done():
+                future.cancel()
+                print(f"  ⏱ Crawl budget used up before {link} was read")
+            elif future.result():
+                pages.append(future.result())
+        return pages
+
+    def merge_details(self, url, pages):
+        """Combine page_details() of the homepage and contact pages (homepage first)"""
+        emails, phones, services = [], [], []
+        for page in pages:
+            emails += [e for e in page['emails'] if e not in emails]
+            phones += [p for p in page['phones'] if p not in phones]
+            services += [s for s in page['services'] if s not in services]
+        return {
+            'website': url,
+            'email': ', '.join(emails[:MAX_CONTACTS]),
+            'phone_from_website': ', '.join(phones[:MAX_CONTACTS]),
+            'established_year': next((page['year'] for page in pages if page['year']), None),
+            'description': next((page['description'] for page in pages if page['description']), None),
+            'services': ', '.join(services[:MAX_SERVICES]),
+        }
+
+    def close(self):
+        """Stop the contact page threads"""
+        if self.executor:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def empty_result(self, url):
+        return {
+            'website': url,
+            'email': None,
+            'phone_from_website': None,
+            'established_year': None,
+            'description': None,
+            'services': None,
+        }
+
     def scrape_website(self, url):
-        """Scrape a single website for detailed information"""
+        """Scrape a website (homepage plus likely contact pages) for detailed information"""
         if not url or url == "N/A":
             return {}
         
@@ -114,33 +402,24 @@ class WebsiteScraper:
                 url = 'https://' + url
             
             print(f"Scraping website: {url}")
-            response = self.session.get(url, timeout=SCRAPER_SETTINGS['timeout'])
-            response.raise_for_status()
+            page = self.fetch_page(url)
+            if page is None:
+                return self.empty_result(url)
+            page_url, scanner, soup = page
+            pages = [self.page_details(scanner, soup)]
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            html_text = soup.get_text()
+            # Contact/about pages, unless the homepage already had everything
+            if WEBSITE_SETTINGS['crawl_pages'] and not scanner.complete:
+                links = self.contact_links(page_url, soup)
+                if links:
+                    with timer('crawl'):
+                        pages += self.crawl_contact_pages(links)
             
-            # Extract all information
-            data = {
-                'website': url,
-                'email': ', '.join(self.extract_emails(response.text)[:3]),  # Max 3 emails
-                'phone_from_website': ', '.join(self.extract_phones(response.text)[:3]),
-                'established_year': self.extract_established_year(html_text),
-                'description': self.extract_description(soup),
-                'services': ', '.join(self.extract_services(soup)),
-            }
-            
-            time.sleep(SCRAPER_SETTINGS['delay_between_requests'])
+            data = self.merge_details(url, pages)
+            pause(SCRAPER_SETTINGS['delay_between_requests'])
             return data
             
         except Exception as e:
+            self.error_count += 1
             print(f"Error scraping website {url}: {e}")
-            return {
-                'website': url,
-                'email': None,
-                'phone_from_website': None,
-                'established_year': None,
-                'description': None,
-                'services': None,
-            }
-
+            return self.empty_result(url)
@@ -2,23 +2,19 @@
 Wikipedia Scraper - Scrape articles, knowledge, history, facts
 """
 
-import requests
 from bs4 import BeautifulSoup
 import re
 import time
-from fake_useragent import UserAgent
 from generic_config import SCRAPER_SETTINGS, CONTENT_FILTER
+from http_client import fetch, shared_session
+from instrumentation import pause, timer
 
 class WikipediaScraper:
     def __init__(self):
-        self.ua = UserAgent()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': self.ua.random,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        })
+        self.session = shared_session()  # pooled keep-alive connections, rotating browser headers
         self.base_url = "https://en.wikipedia.org"
     
+    @timer('filter')
     def should_block_content(self, title, content):
         """Check if content should be blocked"""
         if not CONTENT_FILTER.get("enabled"):
@@ -38,10 +34,11 @@ class WikipediaScraper:
         """Search Wikipedia for articles"""
         try:
             search_url = f"{self.base_url}/w/index.php?search={query.replace(' ', '+')}"
-            response = self.session.get(search_url, timeout=SCRAPER_SETTINGS['timeout'])
+            response = fetch(search_url, self.session, timeout=SCRAPER_SETTINGS['timeout'])
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            with timer('parse'):
+                soup = BeautifulSoup(response.content, 'html.parser')
             articles = []
             
             # Find search results
@@ -58,7 +55,7 @@ class WikipediaScraper:
                 except Exception as e:
                     continue
                 
-                time.sleep(SCRAPER_SETTINGS['delay_between_requests'])
+                pause(SCRAPER_SETTINGS['delay_between_requests'])
             
             return articles
             
@@ -66,6 +63,7 @@ class WikipediaScraper:
             print(f"Error searching Wikipedia: {e}")
             return []
     
+    @timer('extract')
     def extract_search_result(self, result_element):
         """Extract information from search result"""
         try:
@@ -96,10 +94,11 @@ class WikipediaScraper:
     def get_article_content(self, article_url):
         """Get full content of a Wikipedia article"""
         try:
-            response = self.session.get(article_url, timeout=SCRAPER_SETTINGS['timeout'])
+            response = fetch(article_url, self.session, timeout=SCRAPER_SETTINGS['timeout'])
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            with timer('parse'):
+                soup = BeautifulSoup(response.content, 'html.parser')
             
             data = {
                 'platform': 'wikipedia',
@@ -173,10 +172,11 @@ class WikipediaScraper:
         """Get all pages in a Wikipedia category"""
         try:
             category_url = f"{self.base_url}/wiki/Category:{category_name.replace(' ', '_')}"
-            response = self.session.get(category_url, timeout=SCRAPER_SETTINGS['timeout'])
+            response = fetch(category_url, self.session, timeout=SCRAPER_SETTINGS['timeout'])
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            with timer('parse'):
+                soup = BeautifulSoup(response.content, 'html.parser')
             articles = []
             
             # Find category pages
@@ -190,7 +190,7 @@ class WikipediaScraper:
                         article_data = self.get_article_content(article_url)
                         if article_data:
                             articles.append(article_data)
-                        time.sleep(SCRAPER_SETTINGS['delay_between_requests'])
+                        pause(SCRAPER_SETTINGS['delay_between_requests'])
                     except Exception as e:
                         continue
             
@@ -0,0 +1,368 @@
+"""
+Work Queue - Scrape (category, platform) jobs across several worker processes
+Jobs live in a SQLite queue with leases and retries; workers claim jobs, each keeping its
+own browsers, and write records to a shared result store. Any queue/store with the same
+methods (e.g. backed by a server database for several machines) can be swapped in.
+"""
+
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from generic_config import AVAILABLE_PLATFORMS, GLOBAL_CATEGORIES, SCRAPER_SETTINGS
+from instrumentation import pause, write_report
+
+# Platforms the workers know how to scrape
+SUPPORTED_PLATFORMS = ['youtube', 'wikipedia', 'google']
+
+class WorkQueue:
+    def __init__(self, filename='work_queue.db', lease_seconds=None, max_attempts=None):
+        self.filename = filename
+        self.lease_seconds = lease_seconds or SCRAPER_SETTINGS.get('job_lease_seconds', 600)
+        self.max_attempts = max_attempts or SCRAPER_SETTINGS.get('job_max_attempts', 3)
+        self.lock = threading.Lock()
+
+        # Several processes share the file; wait for locks instead of failing
+        self.conn = sqlite3.connect(filename, timeout=60, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                category TEXT,
+                platform TEXT,
+                payload TEXT,
+                status TEXT DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                available_at REAL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires REAL,
+                last_error TEXT,
+                completed_at TEXT
+            );
+            CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, available_at);
+        """)
+
+    def enqueue(self, category, platform, payload=None):
+        """Add a job; returns its id"""
+        with self.lock:
+            cursor = self.conn.execute(
+                'INSERT INTO jobs (category, platform, payload) VALUES (?, ?, ?)',
+                (category, platform, json.dumps(payload or {}))
+            )
+        return cursor.lastrowid
+
+    def claim(self, worker_id):
+        """Lease the next available job (pending, or leased by a worker that stopped renewing)
+
+        Every claim counts as an attempt; an expired lease on its last attempt is dead-lettered.
+        """
+        now = time.time()
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                while True:
+                    row = self.conn.execute("""
+                        SELECT id, category, platform, payload, attempts, status FROM jobs
+                        WHERE (status = 'pending' AND available_at <= ?)
+                           OR (status = 'leased' AND lease_expires < ?)
+                        ORDER BY id LIMIT 1
+                    """, (now, now)).fetchone()
+                    if row and row[5] == 'leased' and row[4] >= self.max_attempts:
+                        self.conn.execute(
+                            "UPDATE jobs SET status = 'failed', last_error = ?, lease_owner = NULL WHERE id = ?",
+                            (f"lease expired on attempt {row[4]}", row[0])
+                        )
+                        continue
+                    break
+                if row:
+                    self.conn.execute(
+                        "UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?, lease_expires = ? WHERE id = ?",
+                        (worker_id, now + self.lease_seconds, row[0])
+                    )
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+
+        if not row:
+            return None
+        return {'id': row[0], 'category': row[1], 'platform': row[2],
+                'payload': json.loads(row[3]), 'attempts': row[4] + 1}
+
+    def renew(self, job_id, worker_id):
+        """Extend a lease still held by this worker; False if it was lost"""
+        with self.lock:
+            cursor = self.conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+                (time.time() + self.lease_seconds, job_id, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id, worker_id):
+        """Mark a leased job done (ignored if the lease was lost to another worker)"""
+        with self.lock:
+            cursor = self.conn.execute(
+                "UPDATE jobs SET status = 'done', completed_at = ? WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+                (datetime.now().isoformat(), job_id, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id, worker_id, error):
+        """Record a failed attempt; the job is retried with backoff until max_attempts claims"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT attempts FROM jobs WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+                (job_id, worker_id)
+            ).fetchone()
+            if not row:
+                return False
+            attempts = row[0]  # counted when the job was claimed
+            status = 'pending' if attempts < self.max_attempts else 'failed'
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, attempts = ?, available_at = ?, last_error = ?, lease_owner = NULL WHERE id = ?",
+                (status, attempts, time.time() + 2 ** attempts, str(error)[:500], job_id)
+            )
+        return True
+
+    def has_unfinished(self):
+        """Whether any job is still pending or leased"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'leased')"
+            ).fetchone()
+        return row[0] > 0
+
+    def get_statistics(self):
+        with self.lock:
+            rows = self.conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall()
+        return dict(rows)
+
+    def close(self):
+        self.conn.close()
+
+class ResultStore:
+    """Shared store for job results (SQLite file)"""
+    def __init__(self, filename='work_results.db'):
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(filename, timeout=60, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                job_id INTEGER,
+                position INTEGER,
+                data TEXT,
+                PRIMARY KEY (job_id, position)
+            )
+        """)
+
+    def save(self, job_id, records):
+        """Store a job's records (replacing any from an earlier, abandoned attempt)"""
+        rows = [(job_id, i, json.dumps(record, ensure_ascii=False, default=str)) for i, record in enumerate(records)]
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                self.conn.execute('DELETE FROM results WHERE job_id = ?', (job_id,))
+                self.conn.executemany('INSERT INTO results (job_id, position, data) VALUES (?, ?, ?)', rows)
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+
+    def get(self, job_id):
+        with self.lock:
+            rows = self.conn.execute(
+                'SELECT data FROM results WHERE job_id = ? ORDER BY position', (job_id,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def close(self):
+        self.conn.close()
+
+class MemoryResultStore:
+    """In-process stand-in for ResultStore, for inline runs and testing"""
+    def __init__(self):
+        self.results = {}
+
+    def save(self, job_id, records):
+        self.results[job_id] = list(records)
+
+    def get(self, job_id):
+        return self.results.get(job_id, [])
+
+    def close(self):
+        pass
+
+class PlatformScrapers:
+    """One scraper per platform, created on first use and reused for every job"""
+    def __init__(self, headless=None):
+        self.headless = SCRAPER_SETTINGS['headless'] if headless is None else headless
+        self.scrapers = {}
+
+    def get(self, platform):
+        if platform not in self.scrapers:
+            if platform == 'youtube':
+                from youtube_scraper import YouTubeScraper
+                self.scrapers[platform] = YouTubeScraper(headless=self.headless)
+            elif platform == 'wikipedia':
+                from wikipedia_scraper import WikipediaScraper
+                self.scrapers[platform] = WikipediaScraper()
+            elif platform == 'google':
+                from google_search_scraper import GoogleSearchScraper
+                self.scrapers[platform] = GoogleSearchScraper(headless=self.headless)
+            else:
+                raise ValueError(f"No scraper for platform '{platform}'")
+        return self.scrapers[platform]
+
+    def scrape(self, platform, query, max_results):
+        scraper = self.get(platform)
+        if platform == 'youtube':
+            return scraper.search_videos(query, max_results=max_results)
+        if platform == 'wikipedia':
+            return scraper.search_articles(query, max_results=max_results)
+        return scraper.search(query, search_type='all', max_results=max_results)
+
+    def close(self):
+        for scraper in self.scrapers.values():
+            if hasattr(scraper, 'close'):
+                try:
+                    scraper.close()
+                except Exception:
+                    pass
+        self.scrapers = {}
+
+class LeaseRenewer:
+    """Renew a job's lease from a background thread while the worker is busy with it"""
+    def __init__(self, queue, job_id, worker_id):
+        self.queue = queue
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def run(self):
+        # Renew well before expiry so one slow renewal doesn't lose the lease
+        interval = max(1, self.queue.lease_seconds / 3)
+        while not self.stopped.wait(interval):
+            if not self.queue.renew(self.job_id, self.worker_id):
+                break  # lease lost; complete()/fail() will be ignored
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.run, name=f"lease-{self.job_id}", daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.thread.join()
+        return False
+
+def plan_jobs(categories):
+    """(category, platform, payload) for every enabled, supported platform of each category"""
+    max_results = SCRAPER_SETTINGS.get('max_results_per_category', 100)
+    jobs = []
+    for category_key in categories:
+        config = GLOBAL_CATEGORIES[category_key]
+        platforms = config['platforms']
+        for platform in platforms:
+            if platform not in SUPPORTED_PLATFORMS or not AVAILABLE_PLATFORMS.get(platform, {}).get('enabled', True):
+                continue
+            platform_max = min(
+                max_results // len(platforms),
+                AVAILABLE_PLATFORMS.get(platform, {}).get('max_results', 50)
+            )
+            jobs.append((category_key, platform, {
+                'query': config['query'],
+                'type': config.get('type', 'general'),
+                'max_results': platform_max,
+            }))
+    return jobs
+
+def process_jobs(queue, store, worker_id, scrapers=None, poll_interval=1):
+    """Claim and run jobs until none are left; returns the number completed"""
+    scrapers = scrapers or PlatformScrapers()
+    completed = 0
+    try:
+        while True:
+            job = queue.claim(worker_id)
+            if job is None:
+                if not queue.has_unfinished():
+                    break
+                pause(poll_interval, 'queue_wait')  # others hold leases or retries are backing off
+                continue
+
+            payload = job['payload']
+            try:
+                with LeaseRenewer(queue, job['id'], worker_id):
+                    records = scrapers.scrape(job['platform'], payload['query'], payload['max_results'])
+                for record in records:
+                    record['category'] = job['category']
+                    record['type'] = payload['type']
+                store.save(job['id'], records)
+                if queue.complete(job['id'], worker_id):
+                    completed += 1
+                    print(f"  [{worker_id}] ✓ {job['category']} / {job['platform']}: {len(records)} records")
+            except Exception as e:
+                print(f"  [{worker_id}] ✗ {job['category']} / {job['platform']}: {e}")
+                queue.fail(job['id'], worker_id, e)
+
+            pause(SCRAPER_SETTINGS['delay_between_requests'])
+    finally:
+        scrapers.close()
+    return completed
+
+def worker_main(queue_file, results_file, worker_id):
+    """Entry point of a worker process (opens its own connections and browsers)"""
+    queue = WorkQueue(queue_file)
+    store = ResultStore(results_file)
+    try:
+        process_jobs(queue, store, worker_id)
+    finally:
+        queue.close()
+        store.close()
+        # Each process has its own counters; keep them next to the parent's report
+        write_report(f"{SCRAPER_SETTINGS['metrics_report']}_{worker_id}", quiet=True)
+
+def run_jobs(categories, workers=None, queue_file=None, results_file=None):
+    """Scrape categories with a pool of worker processes; returns {category: records}"""
+    workers = workers or SCRAPER_SETTINGS.get('worker_processes', 1)
+    queue_file = queue_file or SCRAPER_SETTINGS.get('work_queue_file', 'work_queue.db')
+    results_file = results_file or f"{os.path.splitext(queue_file)[0]}_results.db"
+
+    # Each run starts from an empty queue
+    for filename in (queue_file, results_file):
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(filename + suffix):
+                os.remove(filename + suffix)
+
+    queue = WorkQueue(queue_file)
+    job_ids = {}
+    for category_key, platform, payload in plan_jobs(categories):
+        job_ids[queue.enqueue(category_key, platform, payload)] = category_key
+    print(f"\n📋 Queued {len(job_ids)} jobs for {workers} worker process(es)")
+
+    processes = [
+        multiprocessing.Process(target=worker_main, args=(queue_file, results_file, f"worker-{i + 1}"))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    stats = queue.get_statistics()
+    print(f"✓ Jobs done: {stats.get('done', 0)}, failed: {stats.get('failed', 0)}")
+    queue.close()
+
+    # Collect results in job order so output matches a serial run
+    store = ResultStore(results_file)
+    results = {category_key: [] for category_key in categories}
+    for job_id in sorted(job_ids):
+        results[job_ids[job_id]].extend(store.get(job_id))
+    store.close()
+    return results
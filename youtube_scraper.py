@@ -11,15 +11,17 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import undetected_chromedriver as uc
-from fake_useragent import UserAgent
+from user_agents import apply_browser_profile
 from config import SCRAPER_SETTINGS as BASE_SETTINGS
 from generic_config import SCRAPER_SETTINGS, CONTENT_FILTER
+from metric_parser import parse_metric
+from retry_engine import load_page
+from instrumentation import pause, timer
 
 class YouTubeScraper:
     def __init__(self, headless=True):
         self.headless = headless
         self.driver = None
-        self.ua = UserAgent()
         self.data = []
         
     def init_driver(self):
@@ -30,7 +32,7 @@ class YouTubeScraper:
                 options.add_argument('--headless')
             options.add_argument('--no-sandbox')
             options.add_argument('--disable-dev-shm-usage')
-            options.add_argument(f'user-agent={self.ua.random}')
+            apply_browser_profile(options)
             options.add_argument('--disable-blink-features=AutomationControlled')
             
             self.driver = uc.Chrome(options=options, version_main=None)
@@ -40,6 +42,7 @@ class YouTubeScraper:
             print(f"Error initializing driver: {e}")
             return False
     
+    @timer('filter')
     def should_block_content(self, title, description):
         """Check if content should be blocked based on filters"""
         if not CONTENT_FILTER.get("enabled"):
@@ -64,22 +67,7 @@ class YouTubeScraper:
     
     def parse_views(self, views_text):
         """Parse view count from text like '1.2M views' or '500K views'"""
-        if not views_text:
-            return 0
-        
-        views_text = views_text.lower().replace('views', '').strip()
-        
-        try:
-            if 'm' in views_text:
-                return int(float(views_text.replace('m', '')) * 1000000)
-            elif 'k' in views_text:
-                return int(float(views_text.replace('k', '')) * 1000)
-            elif 'b' in views_text:
-                return int(float(views_text.replace('b', '')) * 1000000000)
-            else:
-                return int(views_text.replace(',', ''))
-        except:
-            return 0
+        return parse_metric(views_text)
     
     def parse_duration(self, duration_text):
         """Parse duration from text like '10:30' or '5:23:45'"""
@@ -105,13 +93,13 @@ class YouTubeScraper:
         
         try:
             search_url = f"https://www.youtube.com/results?search_query={query.replace(' ', '+')}"
-            self.driver.get(search_url)
-            time.sleep(3)
+            load_page(self.driver, search_url)
+            pause(3)
             
             # Scroll to load more results
             for _ in range(3):
                 self.driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight);")
-                time.sleep(2)
+                pause(2)
             
             videos = []
             video_elements = self.driver.find_elements(By.CSS_SELECTOR, "ytd-video-renderer, ytd-grid-video-renderer")
@@ -133,6 +121,7 @@ class YouTubeScraper:
             print(f"Error searching YouTube: {e}")
             return []
     
+    @timer('extract')
     def extract_video_info(self, element):
         """Extract video information from element"""
         try:
@@ -191,16 +180,16 @@ class YouTubeScraper:
             # Try to get more details by visiting the video page
             if data.get('url'):
                 try:
-                    self.driver.get(data['url'])
-                    time.sleep(2)
+                    load_page(self.driver, data['url'])
+                    pause(2)
                     
                     # Get likes (if visible)
                     try:
                         like_button = self.driver.find_element(By.CSS_SELECTOR, "ytd-toggle-button-renderer button")
                         like_text = like_button.get_attribute('aria-label')
-                        likes_match = re.search(r'([\d,]+)', like_text)
-                        if likes_match:
-                            data['likes'] = likes_match.group(1).replace(',', '')
+                        likes = parse_metric(like_text, default=None)
+                        if likes is not None:
+                            data['likes'] = likes
                     except:
                         pass
                     
@@ -221,7 +210,7 @@ class YouTubeScraper:
                     
                     # Go back to search results
                     self.driver.back()
-                    time.sleep(2)
+                    pause(2)
                     
                 except Exception as e:
                     pass
@@ -242,8 +231,8 @@ class YouTubeScraper:
         
         try:
             search_url = f"https://www.youtube.com/results?search_query={query.replace(' ', '+')}&sp=EgIQAg%253D%253D"
-            self.driver.get(search_url)
-            time.sleep(3)
+            load_page(self.driver, search_url)
+            pause(3)
             
             channels = []
             channel_elements = self.driver.find_elements(By.CSS_SELECTOR, "ytd-channel-renderer")
@@ -267,9 +256,9 @@ class YouTubeScraper:
                     # Extract subscriber count
                     try:
                         sub_elem = element.find_element(By.CSS_SELECTOR, "#subscribers")
-                        data['followers'] = sub_elem.text
+                        data['followers'] = parse_metric(sub_elem.text)
                     except:
-                        data['followers'] = "0"
+                        data['followers'] = 0
                     
                     # Extract description
                     try: